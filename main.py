@@ -64,28 +64,20 @@ import random
 from adafruit_midi import MIDI
 from adafruit_midi.note_on import NoteOn
 from adafruit_midi.note_off import NoteOff
-from adafruit_midi.pitch_bend import PitchBend
-from adafruit_midi.control_change import ControlChange
-from adafruit_midi.program_change import ProgramChange
-from adafruit_midi.channel_pressure import ChannelPressure
-from adafruit_midi.polyphonic_key_pressure import PolyphonicKeyPressure
-from adafruit_midi.system_exclusive import SystemExclusive
-from adafruit_midi.timing_clock import TimingClock
-from adafruit_midi.start import Start
-from adafruit_midi.stop import Stop
-from adafruit_midi.midi_continue import Continue
-from adafruit_midi.active_sensing import ActiveSensing
-from adafruit_midi.mtc_quarter_frame import MtcQuarterFrame
-from adafruit_midi.midi_message import MIDIUnknownEvent, MIDIBadEvent
 
 # Import our modules
-from prisme.ui.display import Display
+from prisme.ui.display import Display, FrameGovernor
 from prisme.ui.buttons import ButtonHandler
+from prisme.ui.demo import DemoPlayer
 from prisme.core.clock import ClockHandler
 from prisme.ui.menu import SettingsMenu
 from prisme.utils.config import Settings
 from prisme.drivers.cv_gate import CVOutput
+from prisme.drivers.i2c_bus import BusArbiter
+from prisme.utils.calibration import CVCalibration
 from prisme.drivers.midi_custom_cc import CustomCCHandler
+from prisme.core.input_router import InputRouter
+from prisme.core import midi_parser
 
 print("\n" + "="*60)
 print(f"ARP - Hardware Arpeggiator v{__version__}")
@@ -116,12 +108,18 @@ print("[2/5] Initializing MIDI...")
 # MIDI FeatherWing on UART (TX=D1, RX=D0)
 uart = busio.UART(board.TX, board.RX, baudrate=31250, timeout=0.001)
 midi = MIDI(midi_in=uart, midi_out=uart, in_channel=0, out_channel=0)
+# Batched input: one readinto() per loop, parsed without message objects.
+# Always the UART, and every note comes back as an event (arpeggiator or
+# polyphonic pass-through), whatever the routing mode
+input_router = InputRouter(settings, uart_port=uart,
+                           source=Settings.INPUT_SOURCE_MIDI_IN, thru_notes=False)
 print("      ✓ MIDI ready (31250 baud)")
 
 print("[3/5] Initializing Display...")
 # OLED FeatherWing on I2C (rotation set from settings)
 i2c = board.I2C()
-display = Display(i2c, settings)
+display = Display(i2c, settings, manual_refresh=True)
+display.enable_glyph_cache()  # Menu rows from pre-rendered bitmaps
 display.show_startup(version=__version__)
 print("      ✓ Display ready (SH1107 128x64)")
 
@@ -143,8 +141,21 @@ clock.set_internal_bpm(settings.internal_bpm)  # Use settings BPM
 print(f"      ✓ Clock ready (Internal: {settings.internal_bpm} BPM, External: USB)")
 
 print("[6/7] Initializing CV Output...")
-# CV Output via MCP4728 DAC on I2C
-cv_output = CVOutput(i2c, settings)
+# CV Output via MCP4728 DAC on I2C (pitch corrected by NVM calibration if present)
+# DAC writes are batched per loop iteration into one Fast Write (cv_output.process())
+cv_calibration = CVCalibration()
+cv_calibration.load()
+cv_output = CVOutput(i2c, settings, cv_calibration, batch_writes=True)
+
+# Shared I2C bus: OLED refreshes go out one text row at a time, with clock
+# processing and pending DAC writes let through between rows
+i2c_bus = BusArbiter()
+i2c_bus.set_service(clock.process_clock_messages)
+cv_output.set_arbiter(i2c_bus)
+display.set_arbiter(i2c_bus)
+
+# Display frame rate follows the step rate
+display.set_governor(FrameGovernor(clock))
 print("      ✓ CV Output ready (MCP4728 on I2C)")
 
 print("[7/7] Initializing Custom CC Handler...")
@@ -181,6 +192,18 @@ current_playing_note = None
 
 # Pre-allocate demo chord (C major: C, E, G) - avoid allocations in button handler
 DEMO_CHORD = [(60, 100), (64, 100), (67, 100)]
+DEMO_STEPS = 4
+
+# Button B demo, played from the main loop (MIDI, clock and CV keep running)
+demo = DemoPlayer()
+
+def demo_note_on(note):
+    """Start a demo note on MIDI OUT"""
+    midi.send(NoteOn(note, 100))
+
+def demo_note_off(note):
+    """End a demo note on MIDI OUT"""
+    midi.send(NoteOff(note, 0))
 
 def generate_arp_sequence(notes):
     """Generate arpeggiated sequence from note buffer based on current pattern"""
@@ -250,8 +273,7 @@ clock.set_clock_source(settings.clock_source)  # Use settings clock source
 if settings.clock_source == Settings.CLOCK_INTERNAL:
     clock.start()
 
-# Update display with initial state
-time.sleep(1)  # Let startup message show
+# Update display with initial state (once the startup screen has been shown)
 clock_src_label = settings.get_clock_source_short()
 display.update_display(clock.get_bpm(), settings.get_pattern_name(), clock.is_running(), clock_src_label)
 
@@ -260,12 +282,26 @@ display.update_display(clock.get_bpm(), settings.get_pattern_name(), clock.is_ru
 # =============================================================================
 
 loop_count = 0
-last_display_update = time.monotonic()
-display_update_interval = 0.1  # Update display every 100ms
 gc_counter = 0
-gc_interval = 100  # Run garbage collection every 100 loops (~100ms)
+gc_interval = 20  # Run garbage collection every 20 loops (~100ms when idle)
 button_cooldown_end = 0.0  # Cooldown timer to prevent demo after settings exit
 
+# Longest idle sleep: MIDI IN (64-byte UART buffer, ~20 ms at 31250 baud),
+# buttons, display and demo are polled at least this often
+MAX_IDLE_NS = 5000000
+
+def sleep_until_due():
+    """Sleep until the clock's next tick or gate-off (at most MAX_IDLE_NS)"""
+    if uart.in_waiting:
+        return  # MIDI bytes already waiting
+    now = time.monotonic_ns()
+    wake = now + MAX_IDLE_NS
+    due = clock.get_next_event_ns()
+    if due is not None and due < wake:
+        wake = due
+    if wake > now:
+        time.sleep((wake - now) / 1000000000)
+
 while True:
     loop_count += 1
     current_time = time.monotonic()
@@ -273,30 +309,33 @@ while True:
     # -------------------------------------------------------------------------
     # MIDI Input Processing (Session 19 - Translation Hub)
     # -------------------------------------------------------------------------
-    msg = midi.receive()
-    if msg is not None:
+    # Drain every pending byte in one read. Everything but notes (CC, pitch
+    # bend, aftertouch, clock, SysEx...) is forwarded to MIDI OUT as raw byte
+    # spans; notes, transport and Custom CC sources come back as events
+    for event in input_router.thru_events(uart):
         # Session 19: Dual routing based on arpeggiator state
         # - Arp ON: Monophonic buffering for arpeggiation (original behavior)
         # - Arp OFF: Polyphonic MIDI pass-through + Monophonic CV with priority
+        kind = event.type
 
-        if isinstance(msg, NoteOn) and msg.velocity > 0:
+        if event.is_note_on():
             if settings.enabled:
                 # ARPEGGIATOR ON: Buffer note for arpeggiation (monophonic path)
-                if not any(n == msg.note for n, v in note_buffer):
-                    note_buffer.append((msg.note, msg.velocity))
+                if not any(n == event.note for n, v in note_buffer):
+                    note_buffer.append((event.note, event.velocity))
                     arp_sequence = generate_arp_sequence(note_buffer)
                     current_step = 0  # Reset step on new note
-                    print(f"[ARP] Note ON: {msg.note} (velocity {msg.velocity}) - Buffer: {[n for n,v in note_buffer]}")
+                    print(f"[ARP] Note ON: {event.note} (velocity {event.velocity}) - Buffer: {[n for n,v in note_buffer]}")
             else:
                 # ARPEGGIATOR OFF: Polyphonic pass-through + CV priority routing
-                midi.send(msg)  # MIDI OUT: polyphonic (pass through all notes)
-                cv_output.add_note(msg.note, msg.velocity)  # CV: monophonic with priority
-                print(f"[POLY] Note ON: {msg.note} (velocity {msg.velocity}) - Priority: {settings.get_note_priority_name()}")
+                midi.send(NoteOn(event.note, event.velocity))  # MIDI OUT: polyphonic (pass through all notes)
+                cv_output.add_note(event.note, event.velocity)  # CV: monophonic with priority
+                print(f"[POLY] Note ON: {event.note} (velocity {event.velocity}) - Priority: {settings.get_note_priority_name()}")
 
-        elif isinstance(msg, NoteOff) or (isinstance(msg, NoteOn) and msg.velocity == 0):
+        elif event.is_note_off():
             if settings.enabled:
                 # ARPEGGIATOR ON: Remove note from buffer
-                note_buffer = [(n, v) for n, v in note_buffer if n != msg.note]
+                note_buffer = [(n, v) for n, v in note_buffer if n != event.note]
                 arp_sequence = generate_arp_sequence(note_buffer)
 
                 # Reset step to prevent index errors when sequence shrinks
@@ -309,67 +348,23 @@ while True:
                         midi.send(NoteOff(current_playing_note, 0))
                         current_playing_note = None
 
-                print(f"[ARP] Note OFF: {msg.note} - Buffer: {[n for n,v in note_buffer]}")
+                print(f"[ARP] Note OFF: {event.note} - Buffer: {[n for n,v in note_buffer]}")
             else:
                 # ARPEGGIATOR OFF: Polyphonic pass-through + CV priority routing
-                note_off_msg = NoteOff(msg.note, 0) if isinstance(msg, NoteOn) else msg
-                midi.send(note_off_msg)  # MIDI OUT: polyphonic
-                cv_output.remove_note(msg.note)  # CV: update priority note
-                print(f"[POLY] Note OFF: {msg.note}")
+                midi.send(NoteOff(event.note, 0))  # MIDI OUT: polyphonic
+                cv_output.remove_note(event.note)  # CV: update priority note
+                print(f"[POLY] Note OFF: {event.note}")
+
+        elif kind == midi_parser.START:
+            print(f"Pass-through: MIDI Start")
+        elif kind == midi_parser.STOP:
+            print(f"Pass-through: MIDI Stop")
+        elif kind == midi_parser.CONTINUE:
+            print(f"Pass-through: MIDI Continue")
 
         else:
-            # Process for Custom CC output FIRST (before pass-through)
-            custom_cc.process_messages([msg])
-
-            # Pass through all other MIDI messages with zero latency
-            # This includes: Pitch Bend, Mod Wheel, CC, Aftertouch, Program Change, etc.
-            # Only Note On/Off are filtered (used for arpeggiator, not echoed back)
-
-            # Handle real-time MIDI messages (now properly recognized by library)
-            if isinstance(msg, (TimingClock, Start, Stop, Continue, ActiveSensing, MtcQuarterFrame)):
-                # Real-time messages: Clock, Start, Stop, Continue, Active Sensing, MTC
-                try:
-                    midi.send(msg)
-                    # Log only important transport messages (not chatty clock/sensing)
-                    if isinstance(msg, Start):
-                        print(f"Pass-through: MIDI Start")
-                    elif isinstance(msg, Stop):
-                        print(f"Pass-through: MIDI Stop")
-                    elif isinstance(msg, Continue):
-                        print(f"Pass-through: MIDI Continue")
-                    elif isinstance(msg, MtcQuarterFrame):
-                        print(f"Pass-through: MTC Quarter Frame")
-                    # TimingClock and ActiveSensing are too frequent - don't log
-                except Exception as e:
-                    print(f"⚠️  Failed real-time pass: {type(msg).__name__}: {e}")
-
-            elif isinstance(msg, (MIDIUnknownEvent, MIDIBadEvent)):
-                # Unknown or unparseable MIDI events - fall back to raw byte pass-through
-                try:
-                    if isinstance(msg, MIDIUnknownEvent):
-                        uart.write(bytes([msg.status]))
-                        print(f"Pass-through (raw): Unknown MIDI 0x{msg.status:02X}")
-                    else:  # MIDIBadEvent
-                        uart.write(msg.data)
-                        print(f"Pass-through (raw): Bad MIDI event ({len(msg.data)} bytes)")
-                except Exception as e:
-                    print(f"⚠️  Failed raw pass-through: {e}")
-            else:
-                # Normal MIDI messages - send via library
-                try:
-                    midi.send(msg)
-                    # Verbose debug (can be removed later)
-                    if isinstance(msg, PitchBend):
-                        print(f"Pass-through: PitchBend {msg.pitch_bend}")
-                    elif isinstance(msg, ControlChange):
-                        print(f"Pass-through: CC#{msg.control} = {msg.value}")
-                    elif isinstance(msg, ProgramChange):
-                        print(f"Pass-through: Program Change {msg.patch}")
-                    else:
-                        print(f"Pass-through: {type(msg).__name__}")
-                except (TypeError, AttributeError) as e:
-                    # Some MIDI messages can be received but not sent by adafruit_midi library
-                    print(f"⚠️  Failed to send {type(msg).__name__}: {e}")
+            # Custom CC source (already passed through)
+            custom_cc.process_event(event)
 
     # -------------------------------------------------------------------------
     # Clock Processing
@@ -377,6 +372,9 @@ while True:
     # Process clock - will call on_clock_step() callback when it's time to play next note
     clock.process_clock_messages()
 
+    # Send this iteration's CV changes (pitch + gate + custom CC) in one I2C write
+    cv_output.process()
+
     # -------------------------------------------------------------------------
     # Button Input & Menu Handling
     # -------------------------------------------------------------------------
@@ -469,31 +467,19 @@ while True:
 
     # Button B: Demo arpeggio (only on main screen, not in menu, and after cooldown)
     if button_b and not menu.menu_active and current_time >= button_cooldown_end:
-        # Demo: Play C major chord arpeggio
+        # Demo: Play C major chord arpeggio (4 steps of the current pattern)
         print("Button B: Playing C major arpeggio demo")
-        note_buffer = list(DEMO_CHORD)  # Use pre-allocated demo chord
-        arp_sequence = generate_arp_sequence(note_buffer)
-        current_step = 0
+        demo_sequence = generate_arp_sequence(DEMO_CHORD)
+        demo_notes = [demo_sequence[i % len(demo_sequence)] for i in range(DEMO_STEPS)]
+        demo.play(demo_notes, demo_note_on, demo_note_off, current_time)
 
-        # Play for 4 beats then stop
-        for i in range(4):
-            if current_step < len(arp_sequence):
-                note = arp_sequence[current_step]
-                midi.send(NoteOn(note, 100))
-                time.sleep(0.12)
-                midi.send(NoteOff(note, 0))
-                time.sleep(0.005)
-                current_step = (current_step + 1) % len(arp_sequence)
-
-        # Clear buffer after demo
-        note_buffer = []
-        arp_sequence = []
-        current_step = 0
+    # Advance the demo without holding up MIDI input, clock or CV
+    demo.process(current_time)
 
     # -------------------------------------------------------------------------
     # Periodic Display Updates
     # -------------------------------------------------------------------------
-    if not menu.menu_active and (current_time - last_display_update >= display_update_interval):
+    if not menu.menu_active and display.frame_due():
         clock_src_label = settings.get_clock_source_short()
         bpm = clock.get_bpm()  # Get current BPM (internal or detected external)
         is_running = clock.is_running()
@@ -501,7 +487,12 @@ while True:
         # Update display
         display.update_display(bpm, settings.get_pattern_name(), is_running, clock_src_label)
 
-        last_display_update = current_time
+    # Send staged display changes (menu or periodic) in bus-friendly chunks
+    display.refresh()
+
+    # Write changed settings to NVM once they stop changing (pattern presses
+    # only mark them dirty)
+    settings.flush_if_idle(current_time)
 
     # -------------------------------------------------------------------------
     # Periodic Garbage Collection
@@ -518,5 +509,5 @@ while True:
                 print(f"[DEBUG] GC freed {mem_freed} bytes ({mem_after} bytes free)")
         gc_counter = 0
 
-    # Small delay to prevent CPU spinning
-    time.sleep(0.001)
+    # Idle until the clock needs service instead of spinning
+    sleep_until_due()
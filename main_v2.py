@@ -41,34 +41,25 @@ import digitalio
 import usb_midi
 import gc
 from adafruit_midi import MIDI
-from adafruit_midi.note_on import NoteOn
-from adafruit_midi.note_off import NoteOff
-from adafruit_midi.pitch_bend import PitchBend
-from adafruit_midi.control_change import ControlChange
-from adafruit_midi.program_change import ProgramChange
-from adafruit_midi.channel_pressure import ChannelPressure
-from adafruit_midi.polyphonic_key_pressure import PolyphonicKeyPressure
-from adafruit_midi.system_exclusive import SystemExclusive
-from adafruit_midi.timing_clock import TimingClock
-from adafruit_midi.start import Start
-from adafruit_midi.stop import Stop
-from adafruit_midi.midi_continue import Continue
-from adafruit_midi.active_sensing import ActiveSensing
-from adafruit_midi.mtc_quarter_frame import MtcQuarterFrame
-from adafruit_midi.midi_message import MIDIUnknownEvent, MIDIBadEvent
 
 # Import our modules
-from prisme.ui.display import Display
+from prisme.ui.display import Display, FrameGovernor
 from prisme.ui.buttons import ButtonHandler
+from prisme.ui.demo import DemoPlayer
 from prisme.core.clock import ClockHandler
 from prisme.ui.menu import SettingsMenu
 from prisme.utils.config import Settings
 from prisme.drivers.cv_gate import CVOutput
+from prisme.drivers.i2c_bus import BusArbiter
+from prisme.utils.calibration import CVCalibration
+from prisme.utils.presets import PresetBank
 from prisme.drivers.midi_custom_cc import CustomCCHandler
 from prisme.drivers.midi_output import MidiIO
 from prisme.core.arpeggiator import Arpeggiator
+from prisme.core.scheduler import GateScheduler
 from prisme.core.translation import TranslationPipeline
 from prisme.core.input_router import InputRouter
+from prisme.core import midi_parser
 
 print("\n" + "="*60)
 print(f"prisme - MIDI/CV Translation Hub v{__version__}")
@@ -82,6 +73,12 @@ print("="*60)
 # Enable memory monitoring for debugging
 DEBUG_MEMORY = False
 
+# Run clock, MIDI, CV, buttons, display and GC as prioritised asyncio tasks
+# (prisme/core/runtime.py, needs the asyncio and adafruit_ticks libraries:
+# circup install asyncio). False, or either library missing = the original
+# fixed-order polling loop.
+USE_ASYNC_RUNTIME = True
+
 if DEBUG_MEMORY:
     print(f"[DEBUG] Startup memory: {gc.mem_free()} bytes free")
 
@@ -104,6 +101,7 @@ print("[3/8] Initializing Display...")
 # OLED FeatherWing on I2C
 i2c = board.I2C()
 display = Display(i2c)
+display.enable_glyph_cache()  # Menu rows from pre-rendered bitmaps
 display.show_startup(version=__version__)
 print("      ✓ Display ready (SH1107 128x64)")
 
@@ -133,8 +131,18 @@ print(f"      ✓ Clock ready (Internal: {settings.internal_bpm} BPM)")
 print(f"      ✓ Swing: {settings.swing_percent}%, Multiply: {settings.clock_multiply}x, Divide: 1/{settings.clock_divide}")
 
 print("[7/8] Initializing CV Output...")
-# CV Output via MCP4728 DAC on I2C
-cv_output = CVOutput(i2c, settings)
+# CV Output via MCP4728 DAC on I2C (pitch corrected by NVM calibration if present)
+# DAC writes are batched per loop iteration into one Fast Write (cv_output.process())
+cv_calibration = CVCalibration()
+cv_calibration.load()
+cv_output = CVOutput(i2c, settings, cv_calibration, batch_writes=True)
+
+# Shared I2C bus: OLED refreshes go out one text row at a time, with clock
+# processing and pending DAC writes let through between rows
+i2c_bus = BusArbiter()
+i2c_bus.set_service(clock.process_clock_messages)
+cv_output.set_arbiter(i2c_bus)
+display.set_arbiter(i2c_bus)
 print("      ✓ CV Output ready (MCP4728 on I2C)")
 
 print("[8/8] Initializing Custom CC Handler...")
@@ -156,8 +164,12 @@ midi_io = MidiIO(uart, uart)
 print("      ✓ MIDI I/O ready")
 
 print("[Hub 2/4] Initializing Arpeggiator...")
-# Class-based arpeggiator
-arpeggiator = Arpeggiator(settings, midi_io, cv_output)
+# Class-based arpeggiator (raw preallocated MIDI writes on the step path)
+# Note-offs are scheduled on the clock at settings.gate_length of each step
+gate_scheduler = GateScheduler()
+clock.set_scheduler(gate_scheduler)
+arpeggiator = Arpeggiator(settings, midi_io, cv_output, zero_alloc=True,
+                          scheduler=gate_scheduler)
 print("      ✓ Arpeggiator ready")
 
 print("[Hub 3/4] Initializing Translation Pipeline...")
@@ -167,8 +179,12 @@ print(f"      ✓ Pipeline ready ({pipeline.get_layer_count()} layers)")
 print(f"      ✓ Layer order: {' → '.join(pipeline.get_layer_names())}")
 
 print("[Hub 4/4] Initializing Input Router...")
-# Input router for source selection
-input_router = InputRouter(settings, midi_uart, midi_usb)
+# Input router for source selection (raw ports for batched input)
+input_router = InputRouter(settings, midi_uart, midi_usb,
+                           uart_port=uart, usb_port=usb_midi.ports[0])
+
+# Display frame rate follows the step rate and MIDI input load
+display.set_governor(FrameGovernor(clock, input_router))
 print(f"      ✓ Input router ready (Source: {input_router.get_current_source_name()})")
 
 print("-"*60)
@@ -177,14 +193,21 @@ print(f"Input Source: {input_router.get_current_source_name()}")
 print(f"Layer Order: {' → '.join(pipeline.get_layer_names())}")
 print("-"*60)
 
+# Performance presets (/presets.bin), recalled by MIDI Program Change
+presets = PresetBank()
+
 # Configure clock handler
 def on_clock_step():
-    """Clock callback - triggers arpeggiator step"""
+    """Clock callback - applies a requested preset, then triggers arpeggiator step"""
+    if presets.apply_pending(settings):
+        print(f"Preset {presets.current}: {settings.get_pattern_name()}")
     arpeggiator.step()
 
 clock.set_step_callback(on_clock_step)
 clock.set_clock_division(settings.clock_division)
 clock.set_clock_source(settings.clock_source)
+# Follow external clock with the PLL (evenly spaced ticks, multiply/divide apply)
+clock.set_sync_mode(ClockHandler.SYNC_PLL)
 
 # Start clock if internal
 if settings.clock_source == Settings.CLOCK_INTERNAL:
@@ -205,8 +228,7 @@ if DEBUG_MEMORY:
     print(f"[DEBUG] Post-init memory: {gc.mem_free()} bytes free")
 print("-"*60 + "\n")
 
-# Update display with initial state
-time.sleep(1)
+# Update display with initial state (once the startup screen has been shown)
 display.update_translation_display(settings)
 
 # =============================================================================
@@ -214,98 +236,103 @@ display.update_translation_display(settings)
 # =============================================================================
 
 loop_count = 0
-last_display_update = time.monotonic()
-display_update_interval = 0.1
 gc_counter = 0
-gc_interval = 100
+gc_interval = 20  # Loops between GC / settings writes (~100ms when idle)
 button_cooldown_end = 0.0
 
+# Longest idle sleep: MIDI IN (64-byte UART buffer, ~20 ms at 31250 baud),
+# buttons, display and demo are polled at least this often
+MAX_IDLE_NS = 5000000
+
+def sleep_until_due():
+    """Sleep until the clock's next tick or gate-off (at most MAX_IDLE_NS)"""
+    if uart.in_waiting:
+        return  # MIDI bytes already waiting
+    now = time.monotonic_ns()
+    wake = now + MAX_IDLE_NS
+    due = clock.get_next_event_ns()
+    if due is not None and due < wake:
+        wake = due
+    if wake > now:
+        time.sleep((wake - now) / 1000000000)
+
 # Pre-allocate demo chord (C major: C, E, G)
 DEMO_CHORD = [(60, 100), (64, 100), (67, 100)]
-
-while True:
-    loop_count += 1
-    current_time = time.monotonic()
-
-    # -------------------------------------------------------------------------
-    # MIDI Input Processing (Translation Hub Architecture)
-    # -------------------------------------------------------------------------
-    msg = input_router.get_midi_message()
-    if msg is not None:
-        if isinstance(msg, NoteOn) and msg.velocity > 0:
+DEMO_NOTES = [note for note, velocity in DEMO_CHORD]
+DEMO_ARP_TIME = 2.0  # Seconds the arpeggiator plays the demo chord
+
+# Button B demo, played from the main loop (MIDI, clock and CV keep running)
+demo = DemoPlayer()
+
+def demo_note_on(note):
+    """Start a demo note on the output channel (THRU mode)"""
+    midi_io.send_note_on(note, 100, settings.midi_channel)
+
+def demo_note_off(note):
+    """End a demo note (THRU mode)"""
+    midi_io.send_note_off(note, settings.midi_channel)
+
+def end_arp_demo():
+    """Take the demo chord back out of the arpeggiator (keeps played notes)"""
+    for note in DEMO_NOTES:
+        arpeggiator.remove_note(note)
+
+# -----------------------------------------------------------------------------
+# MIDI Input Processing (Translation Hub Architecture)
+# -----------------------------------------------------------------------------
+def poll_midi():
+    """Read MIDI input: forward pass-through spans, handle notes and Custom CC"""
+    # Drain every pending byte in one read. Everything not intercepted
+    # (clock, CC, pitch bend, SysEx...) is forwarded to MIDI OUT as raw
+    # byte spans; only notes, transport and Custom CC sources come back
+    # as events (see InputRouter.update_thru_table)
+    for event in input_router.thru_events(uart):
+        kind = event.type
+        if kind == midi_parser.NOTE_ON and event.data2 > 0:
             # Note On received
             if settings.routing_mode == Settings.ROUTING_THRU:
-                # THRU mode: Pass through directly
-                midi_io.send_note_on(msg.note, msg.velocity, settings.midi_channel)
+                # THRU mode: Re-send on the output channel
+                midi_io.write_note_on(event.data1, event.data2, settings.midi_channel)
             else:
                 # TRANSLATION mode: Process through pipeline
-                pipeline.process_note_on(msg.note, msg.velocity)
+                pipeline.process_note_on(event.data1, event.data2)
 
-            print(f"Note ON: {msg.note} (velocity {msg.velocity})")
+            print(f"Note ON: {event.data1} (velocity {event.data2})")
 
-        elif isinstance(msg, NoteOff) or (isinstance(msg, NoteOn) and msg.velocity == 0):
-            # Note Off received
+        elif kind == midi_parser.NOTE_OFF or kind == midi_parser.NOTE_ON:
+            # Note Off received (or Note On with velocity 0)
             if settings.routing_mode == Settings.ROUTING_THRU:
-                # THRU mode: Pass through directly
-                midi_io.send_note_off(msg.note, settings.midi_channel)
+                # THRU mode: Re-send on the output channel
+                midi_io.write_note_off(event.data1, settings.midi_channel)
             else:
                 # TRANSLATION mode: Process through pipeline
-                pipeline.process_note_off(msg.note)
+                pipeline.process_note_off(event.data1)
+
+            print(f"Note OFF: {event.data1}")
 
-            print(f"Note OFF: {msg.note}")
+        elif kind == midi_parser.PROGRAM_CHANGE:
+            # Preset recall: read now, switched on the next step (passed through too)
+            presets.request(event.data1)
+
+        elif kind == midi_parser.START:
+            print(f"Pass-through: MIDI Start")
+        elif kind == midi_parser.STOP:
+            print(f"Pass-through: MIDI Stop")
+        elif kind == midi_parser.CONTINUE:
+            print(f"Pass-through: MIDI Continue")
 
         else:
-            # Process for Custom CC output FIRST
-            custom_cc.process_messages([msg])
-
-            # Pass through all other MIDI messages (zero latency)
-            # This includes: Pitch Bend, Mod Wheel, CC, Aftertouch, etc.
-
-            if isinstance(msg, (TimingClock, Start, Stop, Continue, ActiveSensing, MtcQuarterFrame)):
-                # Real-time messages
-                try:
-                    midi_uart.send(msg)
-                    if isinstance(msg, Start):
-                        print(f"Pass-through: MIDI Start")
-                    elif isinstance(msg, Stop):
-                        print(f"Pass-through: MIDI Stop")
-                    elif isinstance(msg, Continue):
-                        print(f"Pass-through: MIDI Continue")
-                except Exception as e:
-                    print(f"⚠️  Failed real-time pass: {type(msg).__name__}: {e}")
-
-            elif isinstance(msg, (MIDIUnknownEvent, MIDIBadEvent)):
-                # Unknown/bad events - raw byte pass-through
-                try:
-                    if isinstance(msg, MIDIUnknownEvent):
-                        uart.write(bytes([msg.status]))
-                        print(f"Pass-through (raw): Unknown MIDI 0x{msg.status:02X}")
-                    else:
-                        uart.write(msg.data)
-                        print(f"Pass-through (raw): Bad MIDI event ({len(msg.data)} bytes)")
-                except Exception as e:
-                    print(f"⚠️  Failed raw pass-through: {e}")
-            else:
-                # Normal MIDI messages
-                try:
-                    midi_uart.send(msg)
-                    if isinstance(msg, PitchBend):
-                        print(f"Pass-through: PitchBend {msg.pitch_bend}")
-                    elif isinstance(msg, ControlChange):
-                        print(f"Pass-through: CC#{msg.control} = {msg.value}")
-                    elif isinstance(msg, ProgramChange):
-                        print(f"Pass-through: Program Change {msg.patch}")
-                except (TypeError, AttributeError) as e:
-                    print(f"⚠️  Failed to send {type(msg).__name__}: {e}")
-
-    # -------------------------------------------------------------------------
-    # Clock Processing
-    # -------------------------------------------------------------------------
-    clock.process_clock_messages()
+            # Custom CC source (already passed through)
+            custom_cc.process_event(event)
+
+# -----------------------------------------------------------------------------
+# Button Input & Menu Handling
+# -----------------------------------------------------------------------------
+def poll_buttons():
+    """Scan buttons: menu navigation, pattern changes and the Button B demo"""
+    global button_cooldown_end
+    current_time = time.monotonic()
 
-    # -------------------------------------------------------------------------
-    # Button Input & Menu Handling
-    # -------------------------------------------------------------------------
     button_a, button_b, button_c, button_ac_combo, a_long, b_long, ac_long = buttons.check_buttons()
 
     if menu.menu_active:
@@ -370,61 +397,123 @@ while True:
         elif button_a:
             settings.pattern = (settings.pattern - 1) % 16
             print(f"Pattern: {settings.get_pattern_name()}")
+            settings.save()  # Bumps revision: display redraws
             display.update_translation_display(settings)
-            settings.save()
 
         if button_c:
             settings.next_pattern()
             print(f"Pattern: {settings.get_pattern_name()}")
+            settings.save()  # Bumps revision: display redraws
             display.update_translation_display(settings)
-            settings.save()
 
     # Button B: Demo arpeggio
     if button_b and not menu.menu_active and current_time >= button_cooldown_end:
         print("Button B: Playing C major arpeggio demo")
 
         if settings.routing_mode == Settings.ROUTING_TRANSLATION:
-            # Use arpeggiator in TRANSLATION mode
+            # Use arpeggiator in TRANSLATION mode: play for 4 beats then remove
             for note, velocity in DEMO_CHORD:
                 arpeggiator.add_note(note, velocity)
-
-            # Play for 4 beats then clear
-            demo_start = time.monotonic()
-            while time.monotonic() - demo_start < 2.0:
-                clock.process_clock_messages()
-                time.sleep(0.001)
-
-            # Clear demo notes
-            arpeggiator.clear_notes()
+            demo.hold(DEMO_ARP_TIME, end_arp_demo, current_time)
         else:
             # THRU mode: Play chord directly
-            for note, velocity in DEMO_CHORD:
-                midi_io.send_note_on(note, velocity, settings.midi_channel)
-                time.sleep(0.12)
-                midi_io.send_note_off(note, settings.midi_channel)
-                time.sleep(0.005)
-
-    # -------------------------------------------------------------------------
-    # Periodic Display Updates
-    # -------------------------------------------------------------------------
-    if not menu.menu_active and (current_time - last_display_update >= display_update_interval):
+            demo.play(DEMO_NOTES, demo_note_on, demo_note_off, current_time)
+
+    # Advance the demo without holding up MIDI input, clock or CV
+    demo.process(current_time)
+
+# -----------------------------------------------------------------------------
+# Periodic Display Updates
+# -----------------------------------------------------------------------------
+def render_display():
+    """Redraw the main screen at the governor's frame rate and send staged changes"""
+    if not menu.menu_active and display.frame_due():
         display.update_translation_display(settings)
-        last_display_update = current_time
 
-    # -------------------------------------------------------------------------
-    # Periodic Garbage Collection
-    # -------------------------------------------------------------------------
+    # Send staged display changes (menu or periodic) in bus-friendly chunks
+    display.refresh()
+
+# -----------------------------------------------------------------------------
+# Periodic Garbage Collection
+# -----------------------------------------------------------------------------
+def collect_garbage():
+    """Run gc.collect() (with before/after memory in DEBUG_MEMORY mode)"""
+    if DEBUG_MEMORY:
+        mem_before = gc.mem_free()
+    gc.collect()
+    if DEBUG_MEMORY:
+        mem_after = gc.mem_free()
+        mem_freed = mem_after - mem_before
+        if mem_freed > 0:
+            print(f"[DEBUG] GC freed {mem_freed} bytes ({mem_after} bytes free)")
+
+# -----------------------------------------------------------------------------
+# Deferred Settings Save
+# -----------------------------------------------------------------------------
+def save_settings():
+    """Write changed settings to NVM once they stop changing (save() only marks them)"""
+    settings.flush_if_idle(time.monotonic())
+
+# -----------------------------------------------------------------------------
+# Preset Read-Ahead
+# -----------------------------------------------------------------------------
+def prefetch_preset():
+    """Read the next preset into RAM ahead of its Program Change"""
+    presets.prefetch()
+
+if USE_ASYNC_RUNTIME:
+    try:
+        import asyncio
+        from prisme.core.runtime import (
+            Runtime, PRIORITY_CLOCK, PRIORITY_INPUT, PRIORITY_OUTPUT,
+            PRIORITY_UI, PRIORITY_BACKGROUND
+        )
+    except ImportError as e:
+        # asyncio / adafruit_ticks not in CIRCUITPY/lib: use the polling loop
+        print(f"Async runtime unavailable ({e}), using polling loop")
+        USE_ASYNC_RUNTIME = False
+
+if USE_ASYNC_RUNTIME:
+    # Separate tasks: clock, MIDI and CV run every pass and go first; buttons,
+    # display, GC and settings writes only start when their budget fits before
+    # the next step
+    runtime = Runtime(deadline=clock.get_next_step_ns)
+    runtime.add_task("clock", clock.process_clock_messages, PRIORITY_CLOCK)
+    runtime.add_task("midi", poll_midi, PRIORITY_INPUT)
+    # This pass's CV changes (pitch + gate + custom CC) in one I2C write
+    runtime.add_task("cv", cv_output.process, PRIORITY_OUTPUT)
+    runtime.add_task("buttons", poll_buttons, PRIORITY_UI,
+                     period_ns=5000000, budget_ns=2000000)  # 5 ms scan
+    runtime.add_task("display", render_display, PRIORITY_UI,
+                     budget_ns=20000000)  # One OLED row
+    runtime.add_task("gc", collect_garbage, PRIORITY_BACKGROUND,
+                     period_ns=100000000, budget_ns=10000000)  # Every 100 ms
+    runtime.add_task("settings", save_settings, PRIORITY_BACKGROUND,
+                     period_ns=100000000, budget_ns=10000000)  # NVM slot write
+    runtime.add_task("presets", prefetch_preset, PRIORITY_BACKGROUND,
+                     period_ns=100000000, budget_ns=5000000)  # One record read
+    asyncio.run(runtime.run())
+
+while True:
+    loop_count += 1
+
+    poll_midi()
+
+    # Clock Processing
+    clock.process_clock_messages()
+
+    # Send this iteration's CV changes (pitch + gate + custom CC) in one I2C write
+    cv_output.process()
+
+    poll_buttons()
+    render_display()
+
     gc_counter += 1
     if gc_counter >= gc_interval:
-        if DEBUG_MEMORY:
-            mem_before = gc.mem_free()
-        gc.collect()
-        if DEBUG_MEMORY:
-            mem_after = gc.mem_free()
-            mem_freed = mem_after - mem_before
-            if mem_freed > 0:
-                print(f"[DEBUG] GC freed {mem_freed} bytes ({mem_after} bytes free)")
+        collect_garbage()
+        save_settings()
+        prefetch_preset()
         gc_counter = 0
 
-    # Small delay to prevent CPU spinning
-    time.sleep(0.001)
+    # Idle until the clock needs service instead of spinning
+    sleep_until_due()
@@ -6,12 +6,14 @@ Core logic for generating arpeggiated note sequences
 import random
 from adafruit_midi.note_on import NoteOn
 from adafruit_midi.note_off import NoteOff
+from .sequence import SequenceEngine
+from .scheduler import SUBTICKS_PER_TICK
 
 
 class Arpeggiator:
     """Main arpeggiator engine"""
 
-    def __init__(self, settings, midi_io, cv_output=None):
+    def __init__(self, settings, midi_io, cv_output=None, zero_alloc=False, scheduler=None):
         """
         Initialize the arpeggiator
 
@@ -19,25 +21,73 @@ class Arpeggiator:
             settings: Global settings object
             midi_io: MidiIO object for sending notes
             cv_output: CVOutput object for CV/trigger output (optional)
+            zero_alloc: Send notes through MidiIO's preallocated raw
+                buffers (write_note_on/off) instead of message objects
+            scheduler: GateScheduler for gate-length note-offs (optional;
+                without it every note is held until the next step)
         """
         self.settings = settings
         self.midi_io = midi_io
         self.cv_output = cv_output
 
-        # Note buffer - stores currently held notes
-        self.note_buffer = []  # List of (note, velocity) tuples
-        self.note_order = []  # Order notes were received (for as-played mode)
+        # Note senders bound once (no attribute lookups per step)
+        if zero_alloc:
+            self._note_on = midi_io.write_note_on
+            self._note_off = midi_io.write_note_off
+        else:
+            self._note_on = midi_io.send_note_on
+            self._note_off = midi_io.send_note_off
+
+        # Held notes and generated step sequence (preallocated, updated in place)
+        self.sequence = SequenceEngine()
 
         # Arpeggiator state
         self.current_step = 0
         self.current_note = None  # Currently playing note
-        self.step_sequence = []  # Generated sequence of notes to play
 
         # Strum mode state
         self.strum_index = 0  # Current position in strum pattern
         self.strum_active = False  # True when strumming (for one-shot mode)
         self.strum_tick_counter = 0  # Clock tick counter for strum speed
 
+        self._random_bits = 1  # Bits per random step draw (see _generate_sequence)
+
+        # Gate length: note-offs scheduled gate_length into the step
+        self.scheduler = scheduler
+        self._gate_tag = 0  # Serial of the sounding note (ignores stale note-offs)
+        if scheduler is not None:
+            self._gate_owner = scheduler.register(self._gate_off)
+
+        # Settings snapshot read by step() (refreshed on settings.revision change)
+        self._snapshot_settings()
+
+    def _snapshot_settings(self):
+        """Copy the settings step() needs into plain attributes"""
+        settings = self.settings
+        self._revision = settings.revision
+        self._enabled = settings.enabled
+        self._is_strum = settings.pattern == settings.ARP_STRUM
+        self._is_random = settings.pattern == settings.ARP_RANDOM
+        self._channel = settings.midi_channel
+        self._velocity_passthrough = settings.velocity_passthrough
+        self._fixed_velocity = settings.fixed_velocity
+        self._strum_repeat = settings.strum_repeat
+        self._strum_division = settings.get_strum_speed_division()
+
+        # Gate length in sub-ticks (strum steps span strum_division steps)
+        step_ticks = settings.clock_division
+        if self._is_strum:
+            step_ticks *= self._strum_division
+        self._gate_delay = max(1, int(settings.gate_length * step_ticks * SUBTICKS_PER_TICK))
+
+    def sync_settings(self):
+        """Pick up settings changes and regenerate the sequence
+
+        Call after changing settings without save() (which bumps
+        settings.revision and is picked up by step() automatically).
+        """
+        self._generate_sequence()
+
     def add_note(self, note, velocity):
         """
         Add a note to the arpeggiator buffer
@@ -50,15 +100,12 @@ class Arpeggiator:
         quantized_note = self.settings.quantize_to_scale(note)
 
         # Add to buffer if not already present
-        if not any(n[0] == quantized_note for n in self.note_buffer):
-            self.note_buffer.append((quantized_note, velocity))
-            self.note_order.append(quantized_note)
-
+        if self.sequence.insert(quantized_note, velocity):
             # Regenerate sequence
             self._generate_sequence()
 
             # If this is the first note, reset step counter
-            if len(self.note_buffer) == 1:
+            if self.sequence.count == 1:
                 self.current_step = 0
                 # For strum one-shot mode, trigger new strum
                 if self.settings.pattern == self.settings.ARP_STRUM:
@@ -75,36 +122,48 @@ class Arpeggiator:
         # Quantize note to match what was added
         quantized_note = self.settings.quantize_to_scale(note)
 
-        # Remove from buffer
-        self.note_buffer = [(n, v) for n, v in self.note_buffer if n != quantized_note]
-
-        # Remove from order tracking
-        if quantized_note in self.note_order:
-            self.note_order.remove(quantized_note)
+        # Remove from buffer (and order tracking)
+        self.sequence.remove(quantized_note)
 
         # If we were playing this note, send note off
         if self.current_note == quantized_note:
-            self.midi_io.send_note_off(quantized_note, self.settings.midi_channel)
+            self._note_off(quantized_note, self._channel)
             self.current_note = None
 
         # Regenerate sequence
         self._generate_sequence()
 
         # Reset step if buffer is empty
-        if not self.note_buffer:
+        if not self.sequence.count:
             self.current_step = 0
-            self.step_sequence = []
+
+    @property
+    def note_buffer(self):
+        """Held notes as a list of (note, velocity) tuples, sorted by pitch
+
+        Builds a new list - for display/debugging, not the step path.
+        """
+        sequence = self.sequence
+        return [(sequence.notes[i], sequence.velocities[i]) for i in range(sequence.count)]
+
+    @property
+    def step_sequence(self):
+        """Generated sequence as a list of (note, velocity) tuples
+
+        Builds a new list - for display/debugging, not the step path.
+        """
+        sequence = self.sequence
+        return [(sequence.expanded_notes[i], sequence.expanded_velocities[i])
+                for i in sequence.steps[:sequence.length]]
 
     def clear_notes(self):
         """Clear all notes from the buffer"""
         # Send note off for currently playing note
         if self.current_note is not None:
-            self.midi_io.send_note_off(self.current_note, self.settings.midi_channel)
+            self._note_off(self.current_note, self._channel)
             self.current_note = None
 
-        self.note_buffer = []
-        self.note_order = []
-        self.step_sequence = []
+        self.sequence.clear()
         self.current_step = 0
 
         # Reset strum state
@@ -113,288 +172,130 @@ class Arpeggiator:
         self.strum_tick_counter = 0
 
     def _generate_sequence(self):
-        """Generate the note sequence based on current pattern and settings"""
-        if not self.note_buffer:
-            self.step_sequence = []
-            return
-
-        # Sort notes by pitch
-        sorted_notes = sorted(self.note_buffer, key=lambda x: x[0])
-
-        # Expand notes across octaves if needed
-        expanded_notes = []
-        for octave in range(self.settings.octave_range):
-            for note, velocity in sorted_notes:
-                transposed_note = note + (octave * 12)
-                if transposed_note <= 127:  # Stay within MIDI range
-                    expanded_notes.append((transposed_note, velocity))
-
-        # Generate sequence based on pattern
-        if self.settings.pattern == self.settings.ARP_UP:
-            self.step_sequence = expanded_notes
-
-        elif self.settings.pattern == self.settings.ARP_DOWN:
-            self.step_sequence = list(reversed(expanded_notes))
-
-        elif self.settings.pattern == self.settings.ARP_UP_DOWN:
-            # Up then down, don't repeat top/bottom notes
-            if len(expanded_notes) > 1:
-                self.step_sequence = expanded_notes + list(reversed(expanded_notes[1:-1]))
-            else:
-                self.step_sequence = expanded_notes
-
-        elif self.settings.pattern == self.settings.ARP_DOWN_UP:
-            # Down then up, don't repeat top/bottom notes
-            if len(expanded_notes) > 1:
-                reversed_notes = list(reversed(expanded_notes))
-                self.step_sequence = reversed_notes + expanded_notes[1:-1]
-            else:
-                self.step_sequence = list(reversed(expanded_notes))
-
-        elif self.settings.pattern == self.settings.ARP_UP_DOWN_INC:
-            # Up then down, repeat top note (inclusive)
-            if len(expanded_notes) > 1:
-                self.step_sequence = expanded_notes + list(reversed(expanded_notes[1:]))
-            else:
-                self.step_sequence = expanded_notes
-
-        elif self.settings.pattern == self.settings.ARP_DOWN_UP_INC:
-            # Down then up, repeat bottom note (inclusive)
-            if len(expanded_notes) > 1:
-                reversed_notes = list(reversed(expanded_notes))
-                self.step_sequence = reversed_notes + expanded_notes[1:]
-            else:
-                self.step_sequence = list(reversed(expanded_notes))
-
-        elif self.settings.pattern == self.settings.ARP_UP_2X:
-            # Each note twice going up
-            self.step_sequence = []
-            for note in expanded_notes:
-                self.step_sequence.append(note)
-                self.step_sequence.append(note)
-
-        elif self.settings.pattern == self.settings.ARP_DOWN_2X:
-            # Each note twice going down
-            self.step_sequence = []
-            for note in reversed(expanded_notes):
-                self.step_sequence.append(note)
-                self.step_sequence.append(note)
-
-        elif self.settings.pattern == self.settings.ARP_CONVERGE:
-            # Alternate between lowest and highest, moving inward
-            self.step_sequence = []
-            if len(expanded_notes) > 0:
-                left = 0
-                right = len(expanded_notes) - 1
-                while left <= right:
-                    self.step_sequence.append(expanded_notes[left])
-                    if left < right:
-                        self.step_sequence.append(expanded_notes[right])
-                    left += 1
-                    right -= 1
-
-        elif self.settings.pattern == self.settings.ARP_DIVERGE:
-            # Alternate from middle out
-            self.step_sequence = []
-            if len(expanded_notes) > 0:
-                middle = len(expanded_notes) // 2
-                self.step_sequence.append(expanded_notes[middle])
-                for i in range(1, max(middle + 1, len(expanded_notes) - middle)):
-                    if middle - i >= 0:
-                        self.step_sequence.append(expanded_notes[middle - i])
-                    if middle + i < len(expanded_notes):
-                        self.step_sequence.append(expanded_notes[middle + i])
-
-        elif self.settings.pattern == self.settings.ARP_PINKY_UP:
-            # Pinky pattern: 1-2-3-highest, repeat
-            self.step_sequence = []
-            if len(expanded_notes) >= 4:
-                highest = expanded_notes[-1]
-                for i in range(len(expanded_notes) - 1):
-                    self.step_sequence.append(expanded_notes[i])
-                    if (i + 1) % 3 == 0:  # Every 3 notes
-                        self.step_sequence.append(highest)
-            else:
-                self.step_sequence = expanded_notes
-
-        elif self.settings.pattern == self.settings.ARP_THUMB_UP:
-            # Thumb pattern: lowest-2-3-4, repeat
-            self.step_sequence = []
-            if len(expanded_notes) >= 4:
-                lowest = expanded_notes[0]
-                for i in range(1, len(expanded_notes)):
-                    if i % 3 == 1:  # Every 3 notes
-                        self.step_sequence.append(lowest)
-                    self.step_sequence.append(expanded_notes[i])
-            else:
-                self.step_sequence = expanded_notes
-
-        elif self.settings.pattern == self.settings.ARP_OCTAVE_UP:
-            # Play root note then jump octaves up
-            self.step_sequence = []
-            if sorted_notes:
-                root_note = sorted_notes[0][0]
-                root_velocity = sorted_notes[0][1]
-                # Add root in each octave
-                for octave in range(self.settings.octave_range):
-                    transposed = root_note + (octave * 12)
-                    if transposed <= 127:
-                        self.step_sequence.append((transposed, root_velocity))
-
-        elif self.settings.pattern == self.settings.ARP_CHORD_REPEAT:
-            # Play all notes as chord (multiple times), then arpeggio
-            # For hardware limitation, we'll play notes rapidly in succession to simulate chord
-            self.step_sequence = []
-            # Add all notes quickly (simulated chord)
-            for _ in range(2):  # Repeat chord twice
-                self.step_sequence.extend(expanded_notes)
-            # Then arpeggio up
-            self.step_sequence.extend(expanded_notes)
-
-        elif self.settings.pattern == self.settings.ARP_RANDOM:
-            # Random order (will randomize on each step)
-            self.step_sequence = expanded_notes
-
-        elif self.settings.pattern == self.settings.ARP_AS_PLAYED:
-            # Use the order notes were received
-            as_played = []
-            for note_num in self.note_order:
-                # Find the note in buffer
-                for note, velocity in self.note_buffer:
-                    if note == note_num:
-                        # Add across octaves
-                        for octave in range(self.settings.octave_range):
-                            transposed_note = note + (octave * 12)
-                            if transposed_note <= 127:
-                                as_played.append((transposed_note, velocity))
-                        break
-            self.step_sequence = as_played
-
-        elif self.settings.pattern == self.settings.ARP_STRUM:
-            # Strum pattern - like guitar strumming
-            # Expand notes across strum_octaves (not main octave_range)
-            strum_notes = []
-            for octave in range(self.settings.strum_octaves):
-                for note, velocity in sorted_notes:
-                    transposed_note = note + (octave * 12)
-                    if transposed_note <= 127:  # Stay within MIDI range
-                        strum_notes.append((transposed_note, velocity))
-
-            # Apply strum direction
-            if self.settings.strum_direction == self.settings.STRUM_DOWN:
-                # Strum from high to low
-                self.step_sequence = list(reversed(strum_notes))
-            elif self.settings.strum_direction == self.settings.STRUM_UP_DOWN:
-                # Strum up then down (don't repeat top/bottom notes)
-                if len(strum_notes) > 1:
-                    self.step_sequence = strum_notes + list(reversed(strum_notes[1:-1]))
-                else:
-                    self.step_sequence = strum_notes
-            else:
-                # STRUM_UP (default) - low to high
-                self.step_sequence = strum_notes
+        """Regenerate the step sequence in place from the held notes"""
+        self._snapshot_settings()
+        self.sequence.build(
+            self.settings.pattern,
+            self.settings.octave_range,
+            self.settings.strum_octaves,
+            self.settings.strum_direction
+        )
 
         # Wrap step position if needed
-        if self.step_sequence and self.current_step >= len(self.step_sequence):
+        if self.sequence.length and self.current_step >= self.sequence.length:
             self.current_step = 0
 
+        # Bits needed to draw a random step index
+        bits = 1
+        while (1 << bits) < self.sequence.length:
+            bits += 1
+        self._random_bits = bits
+
     def step(self):
         """
         Advance the arpeggiator by one step
         Called by the clock handler on each timing division
         """
+        # Settings changed (saved) since the last snapshot
+        if self.settings.revision != self._revision:
+            self.sync_settings()
+
         # Do nothing if arp is disabled or no notes to play
-        if not self.settings.enabled or not self.step_sequence:
+        sequence = self.sequence
+        if not self._enabled or not sequence.length:
             return
 
         # Handle Strum mode separately (uses strum_speed instead of clock_division)
-        if self.settings.pattern == self.settings.ARP_STRUM:
+        if self._is_strum:
             # Increment strum tick counter
             self.strum_tick_counter += 1
 
-            # Get strum speed division (how many ticks per strum note)
-            strum_division = self.settings.get_strum_speed_division()
-
             # Only step when we've reached the strum division
-            if self.strum_tick_counter < strum_division:
+            if self.strum_tick_counter < self._strum_division:
                 return  # Not time to strum yet
 
             # Reset tick counter
             self.strum_tick_counter = 0
 
             # Check one-shot mode
-            if not self.settings.strum_repeat:
+            if not self._strum_repeat:
                 # One-shot mode: strum once then stop
                 if not self.strum_active:
                     return  # Strum already completed
 
                 # Check if we've reached the end of the strum
-                if self.strum_index >= len(self.step_sequence):
+                if self.strum_index >= sequence.length:
                     self.strum_active = False
                     self.strum_index = 0
                     return
 
-            # Turn off previous note if still playing
-            if self.current_note is not None:
-                self.midi_io.send_note_off(self.current_note, self.settings.midi_channel)
-                if self.cv_output:
-                    self.cv_output.note_off()
-
-            # Get next note in strum sequence
-            note, velocity = self.step_sequence[self.strum_index]
-
-            # Use fixed or original velocity
-            if not self.settings.velocity_passthrough:
-                velocity = self.settings.fixed_velocity
-
-            # Play the note
-            self.midi_io.send_note_on(note, velocity, self.settings.midi_channel)
-            self.current_note = note
-
-            # Send CV output
-            if self.cv_output:
-                self.cv_output.note_on(note)
-
-            # Advance strum index
-            self.strum_index += 1
-
-            # Loop or stop for one-shot
-            if self.strum_index >= len(self.step_sequence):
-                if self.settings.strum_repeat:
-                    self.strum_index = 0  # Loop
-                # else: one-shot will stop on next call
-
-            return
+            position = self.strum_index
+        else:
+            # For random mode, pick a random note each time
+            if self._is_random:
+                # Rejection sampling on raw bits (what randint does
+                # internally, minus its temporary objects)
+                position = random.getrandbits(self._random_bits)
+                while position >= sequence.length:
+                    position = random.getrandbits(self._random_bits)
+            else:
+                position = self.current_step
 
-        # Regular arp patterns (non-strum)
         # Turn off previous note if still playing
         if self.current_note is not None:
-            self.midi_io.send_note_off(self.current_note, self.settings.midi_channel)
+            self._note_off(self.current_note, self._channel)
             # Send CV note off (for gate mode)
             if self.cv_output:
                 self.cv_output.note_off()
 
-        # For random mode, pick a random note each time
-        if self.settings.pattern == self.settings.ARP_RANDOM:
-            note, velocity = random.choice(self.step_sequence)
-        else:
-            # Get next note in sequence
-            note, velocity = self.step_sequence[self.current_step]
+        # Get next note in sequence
+        index = sequence.steps[position]
+        note = sequence.expanded_notes[index]
 
         # Use fixed or original velocity
-        if not self.settings.velocity_passthrough:
-            velocity = self.settings.fixed_velocity
+        if self._velocity_passthrough:
+            velocity = sequence.expanded_velocities[index]
+        else:
+            velocity = self._fixed_velocity
 
         # Play the note via MIDI
-        self.midi_io.send_note_on(note, velocity, self.settings.midi_channel)
+        self._note_on(note, velocity, self._channel)
         self.current_note = note
 
+        # Schedule the note-off at the gate length
+        if self.scheduler is not None:
+            self._gate_tag = (self._gate_tag + 1) & 0xFF
+            self.scheduler.schedule(self._gate_delay, self._gate_owner, note, self._gate_tag)
+
         # Send CV output
         if self.cv_output:
             self.cv_output.note_on(note)
 
-        # Advance step counter
-        self.current_step = (self.current_step + 1) % len(self.step_sequence)
+        if self._is_strum:
+            # Advance strum index; loop, or one-shot stops on next call
+            self.strum_index += 1
+            if self.strum_index >= sequence.length and self._strum_repeat:
+                self.strum_index = 0
+        else:
+            # Advance step counter
+            self.current_step = (self.current_step + 1) % sequence.length
+
+    def _gate_off(self, note, tag):
+        """
+        Scheduler callback: end the note when its gate length is up
+
+        Args:
+            note: MIDI note number the note-off was scheduled for
+            tag: Gate serial the note was played with
+        """
+        # Ignore if the note was already released or replaced
+        if self.current_note != note or tag != self._gate_tag:
+            return
+
+        self._note_off(note, self._channel)
+        if self.cv_output:
+            self.cv_output.note_off()
+        self.current_note = None
 
     def process_midi_message(self, msg):
         """
@@ -423,7 +324,7 @@ class Arpeggiator:
     def panic(self):
         """Stop all notes immediately"""
         if self.current_note is not None:
-            self.midi_io.send_note_off(self.current_note, self.settings.midi_channel)
+            self._note_off(self.current_note, self._channel)
             self.current_note = None
 
         # Reset CV output
@@ -440,8 +341,8 @@ class Arpeggiator:
         return {
             'enabled': self.settings.enabled,
             'pattern': self.settings.get_pattern_name(),
-            'notes_held': len(self.note_buffer),
-            'sequence_length': len(self.step_sequence),
+            'notes_held': self.sequence.count,
+            'sequence_length': self.sequence.length,
             'current_step': self.current_step,
             'latch': self.settings.latch
         }
@@ -4,11 +4,163 @@ Manages timing from both external MIDI clock and internal clock sources
 """
 
 import time
+from array import array
 import adafruit_midi
 from adafruit_midi.timing_clock import TimingClock
 from adafruit_midi.start import Start
 from adafruit_midi.stop import Stop
 from adafruit_midi.midi_continue import Continue
+from .scheduler import SUBTICKS_PER_TICK
+
+NS_PER_MINUTE = 60000000000
+
+
+class JitterStats:
+    """Tick lateness statistics (max, mean, p99) without storing samples
+
+    Lateness is bucketed into a fixed histogram, so p99 is reported as the
+    upper edge of its bucket.
+    """
+
+    BUCKET_NS = 250000  # 0.25 ms per bucket
+    BUCKETS = 64        # Last bucket collects everything >= 15.75 ms
+
+    def __init__(self):
+        """Preallocate the histogram"""
+        self.histogram = array('L', [0] * self.BUCKETS)
+        self.reset()
+
+    def reset(self):
+        """Clear all statistics"""
+        i = 0
+        while i < self.BUCKETS:
+            self.histogram[i] = 0
+            i += 1
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, lateness_ns):
+        """
+        Record one tick's lateness
+
+        Args:
+            lateness_ns: How late the tick was emitted (nanoseconds, >= 0)
+        """
+        self.count += 1
+        self.total_ns += lateness_ns
+        if lateness_ns > self.max_ns:
+            self.max_ns = lateness_ns
+        bucket = lateness_ns // self.BUCKET_NS
+        if bucket >= self.BUCKETS:
+            bucket = self.BUCKETS - 1
+        self.histogram[bucket] += 1
+
+    def mean_ns(self):
+        """Mean lateness in nanoseconds (0 if no ticks yet)"""
+        return self.total_ns // self.count if self.count else 0
+
+    def p99_ns(self):
+        """99th percentile lateness in nanoseconds (bucket upper edge)"""
+        if not self.count:
+            return 0
+        target = self.count - self.count // 100  # Ticks at or below p99
+        seen = 0
+        bucket = 0
+        while bucket < self.BUCKETS:
+            seen += self.histogram[bucket]
+            if seen >= target:
+                break
+            bucket += 1
+        return min((bucket + 1) * self.BUCKET_NS, self.max_ns)
+
+
+class TempoEstimator:
+    """Rolling-window average of external clock tick intervals
+
+    A fixed ring buffer of intervals (microseconds) with a running sum:
+    O(1) per tick and no allocation. Also detects tempo changes (a new
+    interval more than change_percent away from the average).
+    """
+
+    MAX_INTERVAL_US = 10000000  # Clamp (a long pause is a tempo change anyway)
+
+    def __init__(self, size=96, min_samples=12, change_percent=15):
+        """
+        Initialize an empty window
+
+        Args:
+            size: Intervals to average (96 = 4 beats at 24 PPQN)
+            min_samples: Intervals needed before averaging (12 = half a beat)
+            change_percent: Deviation from the average that counts as a tempo change
+        """
+        self.size = size
+        self.min_samples = min_samples
+        self.change_percent = change_percent
+        self.intervals = array('l', [0] * size)
+        self.reset()
+
+    def reset(self):
+        """Forget all intervals"""
+        self.head = 0  # Next slot to write
+        self.count = 0
+        self.total = 0  # Running sum of the intervals in the window
+
+    def is_tempo_change(self, interval_us):
+        """
+        Check an interval against the current average
+
+        Args:
+            interval_us: New tick interval in microseconds
+
+        Returns:
+            True if the window is full enough and the interval is off by
+            more than change_percent
+        """
+        if self.count < self.min_samples:
+            return False
+        # |interval - avg| > avg * change% without dividing
+        deviation = interval_us * self.count - self.total
+        if deviation < 0:
+            deviation = -deviation
+        return deviation * 100 > self.total * self.change_percent
+
+    def add(self, interval_us):
+        """
+        Add an interval, dropping the oldest once the window is full
+
+        Args:
+            interval_us: Tick interval in microseconds
+        """
+        if interval_us > self.MAX_INTERVAL_US:
+            interval_us = self.MAX_INTERVAL_US
+        head = self.head
+        if self.count == self.size:
+            self.total -= self.intervals[head]
+        else:
+            self.count += 1
+        self.intervals[head] = interval_us
+        self.total += interval_us
+        head += 1
+        self.head = 0 if head == self.size else head
+
+    def average_us(self):
+        """Average interval in microseconds (0 if empty)"""
+        return self.total // self.count if self.count else 0
+
+    def bpm(self):
+        """
+        Get the averaged tempo
+
+        Returns:
+            BPM rounded to the nearest integer (24 PPQN), or None until
+            min_samples intervals are in the window
+        """
+        if self.count < self.min_samples or not self.total:
+            return None
+        # 60e6 us / (avg * 24) = 2.5e6 * count / total, rounded
+        numerator = 2500000 * self.count
+        return (2 * numerator + self.total) // (2 * self.total)
 
 
 class ClockHandler:
@@ -18,6 +170,14 @@ class ClockHandler:
     CLOCK_INTERNAL = 0
     CLOCK_EXTERNAL = 1
 
+    # External sync modes
+    SYNC_DIRECT = 0  # Each TimingClock is a tick (jitter passes through)
+    SYNC_PLL = 1     # Phase-locked follower generates evenly spaced ticks
+
+    # PLL loop gains (as right shifts of the phase error)
+    PLL_PHASE_SHIFT = 3   # Phase correction: 1/8 of the error per tick
+    PLL_PERIOD_SHIFT = 6  # Period correction: 1/64 of the error per tick
+
     def __init__(self, midi_in_port=None, swing_percent=50, multiply=1, divide=1):
         """
         Initialize clock handler
@@ -44,18 +204,42 @@ class ClockHandler:
         # Callback for when a step should trigger
         self.on_step_callback = None
 
+        # Callback on every tick, given the absolute tick position
+        # (ticks since start, never wraps at step boundaries)
+        self.on_tick_callback = None
+        self.song_ticks = 0
+
+        # Gate scheduler advanced with the clock position (optional)
+        self.scheduler = None
+        self.last_interval_ns = None  # Last external tick interval (sub-tick position)
+
         # BPM calculation (for external clock)
         self.bpm = None
         self.displayed_bpm = None  # Last BPM shown to user (for stability)
-        self.last_tick_time = None
-        self.tick_intervals = []  # Store recent intervals for averaging
-        self.max_intervals = 96  # Average over 96 ticks (4 beats at 24 PPQN) for stability
+        self.last_tick_ns = None
+        self.tempo = TempoEstimator()  # Average over 96 ticks (4 beats at 24 PPQN) for stability
         self.bpm_update_threshold = 5  # Only update displayed BPM if change is >= 5 BPM
 
         # Internal clock
         self.clock_source = self.CLOCK_INTERNAL  # Default to internal
         self.internal_bpm = 120  # Default internal BPM
-        self.last_internal_tick = None
+
+        # Integer-nanosecond tick schedule: tick times are computed from an
+        # anchor (tick position + time) rather than accumulated, so they
+        # never drift or lose precision with uptime
+        self.anchor_ns = None  # Time of the anchor tick (None = not started)
+        self.anchor_tick = 0  # song_ticks at the anchor
+        self.last_internal_tick_ns = None
+        self.next_internal_tick_ns = None
+        self.max_catchup_ticks = 4  # Overdue ticks emitted per poll
+        self.resync_ticks = 24  # Further behind than this: drop ticks and re-anchor
+        self.resyncs = 0
+        self.jitter = JitterStats()
+
+        # External clock follower (SYNC_PLL)
+        self.sync_mode = self.SYNC_DIRECT
+        self.dropout_ticks = 48  # Free-run this many ticks (2 beats) without input
+        self._reset_pll()
 
         # Clock transformations (Translation Hub)
         self.swing_percent = max(50, min(75, swing_percent))  # Clamp to 50-75%
@@ -65,8 +249,10 @@ class ClockHandler:
         # Calculate base interval (with multiply/divide applied)
         self.base_tick_interval = self._calculate_base_interval(self.internal_bpm)
 
-        # Current tick interval (dynamically calculated with swing)
-        self.current_tick_interval = self.base_tick_interval
+        # Tick offsets within a swing pair (see _update_tick_offsets)
+        # (list: slow tempos exceed 32-bit array entries)
+        self._pair_offsets_ns = [0] * 13
+        self._update_tick_offsets()
 
     def _calculate_tick_interval(self, bpm):
         """
@@ -135,6 +321,79 @@ class ClockHandler:
             ratio = (100 - self.swing_percent) / 100.0
             return pair_time * ratio / 6
 
+    def _update_tick_offsets(self):
+        """Precompute the swung tick times within a pair of 16ths (12 ticks)
+
+        One tick is NS_PER_MINUTE * divide / (bpm * 24 * multiply) ns, or
+        the followed external period * divide / multiply. The first 16th
+        of each pair gets swing_percent of the pair time.
+        """
+        if self.pll_period_ns is not None and self._following():
+            # Follow the estimated external tick period
+            tick_num = self.pll_period_ns * self.divide
+            tick_den = self.multiply
+        else:
+            tick_num = NS_PER_MINUTE * self.divide
+            tick_den = self.internal_bpm * 24 * self.multiply
+        self._tick_num = tick_num
+        self._tick_den = tick_den
+
+        # Offsets in units of 1 / (600 * tick_den) ns, then floored to ns
+        on_beat = 12 * tick_num * self.swing_percent
+        off_beat = 12 * tick_num * (100 - self.swing_percent)
+        units = 0
+        k = 0
+        while k <= 12:
+            self._pair_offsets_ns[k] = units // (600 * tick_den)
+            units += on_beat if k < 6 else off_beat
+            k += 1
+
+    def _tick_time_ns(self, tick):
+        """
+        Time of an absolute tick position, relative to tick 0
+
+        Args:
+            tick: Absolute tick position (song_ticks)
+
+        Returns:
+            Nanoseconds from tick 0 at the current tempo and swing
+        """
+        pair = tick // 12
+        return (pair * 12 * self._tick_num) // self._tick_den + self._pair_offsets_ns[tick - pair * 12]
+
+    def _anchor_internal(self, now_ns):
+        """
+        Restart the tick schedule from the current position
+
+        Args:
+            now_ns: Time of the current tick position
+        """
+        self.last_internal_tick_ns = now_ns
+        self._set_anchor(now_ns, self.song_ticks)
+
+    def _set_anchor(self, anchor_ns, anchor_tick):
+        """
+        Place the tick schedule so a tick position falls at a given time
+
+        Args:
+            anchor_ns: Time of the anchor tick
+            anchor_tick: Tick position at that time (may be ahead of song_ticks)
+        """
+        self.anchor_ns = anchor_ns
+        self.anchor_tick = anchor_tick
+        self.next_internal_tick_ns = self._next_tick_ns()
+
+    def _next_tick_ns(self):
+        """Due time of the next tick (song_ticks + 1) from the anchor"""
+        return (self.anchor_ns + self._tick_time_ns(self.song_ticks + 1)
+                - self._tick_time_ns(self.anchor_tick))
+
+    def _retime(self):
+        """Apply a tempo/swing change from the last tick onward"""
+        self._update_tick_offsets()
+        if self.last_internal_tick_ns is not None:
+            self._anchor_internal(self.last_internal_tick_ns)
+
     def set_clock_division(self, division):
         """
         Set the clock division
@@ -154,6 +413,121 @@ class ClockHandler:
         """
         self.on_step_callback = callback
 
+    def set_tick_callback(self, callback):
+        """
+        Set the callback function to call on every clock tick
+
+        Args:
+            callback: Function called with the absolute tick position
+                     (e.g. LaneDispatcher.on_tick)
+        """
+        self.on_tick_callback = callback
+
+    def set_scheduler(self, scheduler):
+        """
+        Set the gate scheduler to advance with the clock
+
+        Args:
+            scheduler: GateScheduler (see prisme/core/scheduler.py)
+        """
+        self.scheduler = scheduler
+
+    def get_position(self):
+        """
+        Get the current clock position in sub-ticks
+
+        Interpolates between ticks from the time since the last tick.
+
+        Returns:
+            Position in sub-ticks (SUBTICKS_PER_TICK per tick)
+        """
+        position = self.song_ticks * SUBTICKS_PER_TICK
+        if not self.running:
+            return position
+
+        if self.clock_source == self.CLOCK_INTERNAL or self._following():
+            last = self.last_internal_tick_ns
+            if last is None:
+                return position
+            fraction = ((time.monotonic_ns() - last) * SUBTICKS_PER_TICK
+                        // (self.next_internal_tick_ns - last))
+        else:
+            last = self.last_tick_ns
+            interval = self.last_interval_ns
+            if last is None or not interval:
+                return position
+            fraction = (time.monotonic_ns() - last) * SUBTICKS_PER_TICK // interval
+        return position + max(0, min(fraction, SUBTICKS_PER_TICK - 1))
+
+    def _generating(self):
+        """True if ticks come from the internal schedule and it is anchored"""
+        if self.clock_source == self.CLOCK_INTERNAL:
+            return self.anchor_ns is not None
+        return self._following() and self.pll_locked and self.anchor_ns is not None
+
+    def get_step_interval_ns(self):
+        """
+        Get the current time between steps (ignoring swing)
+
+        Returns:
+            Nanoseconds per step, or None if stopped or the tempo is unknown
+        """
+        if not self.running:
+            return None
+        if self._generating():
+            return self._tick_num * self.ticks_per_step // self._tick_den
+        if self.clock_source == self.CLOCK_EXTERNAL and not self._following():
+            if self.last_interval_ns is not None:
+                return self.last_interval_ns * self.ticks_per_step
+        return None
+
+    def get_next_step_ns(self):
+        """
+        Estimate when the next step is due (swing included on the internal schedule)
+
+        Returns:
+            Due time (time.monotonic_ns() scale), or None if unknown
+        """
+        if not self.running:
+            return None
+        ticks = self.ticks_per_step - self.tick_count
+        if self._generating():
+            return (self.anchor_ns + self._tick_time_ns(self.song_ticks + ticks)
+                    - self._tick_time_ns(self.anchor_tick))
+        if self.clock_source == self.CLOCK_EXTERNAL and not self._following():
+            if self.last_tick_ns is not None and self.last_interval_ns is not None:
+                return self.last_tick_ns + ticks * self.last_interval_ns
+        return None
+
+    def get_next_event_ns(self):
+        """
+        Estimate when the clock next needs processing: the next tick, or a
+        pending gate note-off that falls before it
+
+        Lets the main loop sleep until then instead of polling.
+
+        Returns:
+            Due time (time.monotonic_ns() scale), or None if unknown
+        """
+        if not self.running:
+            return None
+        if self._generating():
+            due = self.next_internal_tick_ns
+            scheduler = self.scheduler
+            if scheduler is not None and scheduler.count:
+                # Sub-tick position reached at the same interpolation as get_position()
+                offset = scheduler.next_due() - self.song_ticks * SUBTICKS_PER_TICK
+                if offset < SUBTICKS_PER_TICK:
+                    last = self.last_internal_tick_ns
+                    gate_ns = last - (-max(0, offset) * (due - last) // SUBTICKS_PER_TICK)
+                    if gate_ns < due:
+                        due = gate_ns
+            return due
+        if self.clock_source == self.CLOCK_EXTERNAL and not self._following():
+            if self.last_tick_ns is not None and self.last_interval_ns is not None:
+                return self.last_tick_ns + self.last_interval_ns
+        return None
+
     def set_clock_source(self, source):
         """
         Set the clock source
@@ -165,13 +539,17 @@ class ClockHandler:
         if source == self.CLOCK_INTERNAL:
             # Start internal clock automatically
             self.running = True
-            self.last_internal_tick = time.monotonic()
             self.tick_count = 0
+            self._rewind_position()
+            self._update_tick_offsets()  # Back to the internal BPM
+            self._anchor_internal(time.monotonic_ns())
             print("Switched to internal clock")
         else:
             # External clock requires Start message
             self.running = False
             self.tick_count = 0
+            self._rewind_position()
+            self._reset_pll()
             print("Switched to external clock")
 
     def set_internal_bpm(self, bpm):
@@ -183,6 +561,7 @@ class ClockHandler:
         """
         self.internal_bpm = max(40, min(240, bpm))  # Clamp to reasonable range
         self.base_tick_interval = self._calculate_base_interval(self.internal_bpm)
+        self._retime()
 
     def set_swing(self, swing_percent):
         """
@@ -196,6 +575,7 @@ class ClockHandler:
                           75 = extreme swing
         """
         self.swing_percent = max(50, min(75, swing_percent))
+        self._retime()
 
     def set_multiply(self, multiply):
         """
@@ -207,6 +587,7 @@ class ClockHandler:
         assert multiply in [1, 2, 4], "Multiply must be 1, 2, or 4"
         self.multiply = multiply
         self.base_tick_interval = self._calculate_base_interval(self.internal_bpm)
+        self._retime()
 
     def set_divide(self, divide):
         """
@@ -218,6 +599,7 @@ class ClockHandler:
         assert divide in [1, 2, 4, 8], "Divide must be 1, 2, 4, or 8"
         self.divide = divide
         self.base_tick_interval = self._calculate_base_interval(self.internal_bpm)
+        self._retime()
 
     def get_clock_source(self):
         """Get the current clock source"""
@@ -238,31 +620,50 @@ class ClockHandler:
         else:
             # External MIDI clock
             self._process_external_clock()
+            if self.sync_mode == self.SYNC_PLL:
+                self._process_pll_output()
+
+        # Fire note-offs that fall between ticks
+        scheduler = self.scheduler
+        if scheduler is not None and scheduler.count:
+            scheduler.advance(self.get_position())
 
     def _process_internal_clock(self):
-        """Generate internal clock ticks based on BPM with drift compensation and swing"""
+        """Generate internal clock ticks on an integer-nanosecond schedule
+
+        Emits every overdue tick (up to max_catchup_ticks per poll) so a
+        late loop doesn't lose ticks, and re-anchors if it falls more than
+        resync_ticks behind (e.g. after a blocking operation).
+        """
         if not self.running:
             return
 
-        current_time = time.monotonic()
+        now = time.monotonic_ns()
 
         # Initialize timing on first run
-        if self.last_internal_tick is None:
-            self.last_internal_tick = current_time
-            # Calculate initial interval (might have swing)
-            self.current_tick_interval = self._calculate_next_tick_delay()
+        if self.anchor_ns is None:
+            self._anchor_internal(now)
             return
 
-        # Check if it's time for next tick
-        elapsed = current_time - self.last_internal_tick
-        if elapsed >= self.current_tick_interval:
-            # Compensate for timing drift by adding the exact interval
-            # rather than resetting to current_time
-            self.last_internal_tick += self.current_tick_interval
-            self.tick_count += 1
+        self._run_schedule(now)
+
+    def _run_schedule(self, now):
+        """
+        Emit every tick due by now (bounded burst, re-anchor if far behind)
 
-            # Calculate next interval (dynamic for swing)
-            self.current_tick_interval = self._calculate_next_tick_delay()
+        Args:
+            now: Current time (time.monotonic_ns())
+        """
+        burst = 0
+        while now >= self.next_internal_tick_ns and burst < self.max_catchup_ticks:
+            due = self.next_internal_tick_ns
+            self.jitter.record(now - due)
+
+            self.last_internal_tick_ns = due
+            self.tick_count += 1
+            self._emit_tick()
+            self.next_internal_tick_ns = self._next_tick_ns()
+            burst += 1
 
             # Check if we should trigger a step
             if self.tick_count >= self.ticks_per_step:
@@ -272,6 +673,186 @@ class ClockHandler:
                 if self.on_step_callback:
                     self.on_step_callback()
 
+        # Hopelessly behind: drop the backlog rather than burst through it
+        if now - self.next_internal_tick_ns > self.resync_ticks * (self._tick_num // self._tick_den):
+            self.resyncs += 1
+            self._anchor_internal(now)
+
+    def set_sync_mode(self, mode):
+        """
+        Set how external clock is followed
+
+        Args:
+            mode: SYNC_DIRECT (tick per TimingClock) or SYNC_PLL
+                  (phase-locked follower with its own evenly spaced ticks)
+        """
+        self.sync_mode = mode
+        self._reset_pll()
+
+    def _following(self):
+        """True if the PLL follower is generating the ticks"""
+        return self.clock_source == self.CLOCK_EXTERNAL and self.sync_mode == self.SYNC_PLL
+
+    def _reset_pll(self):
+        """Forget the followed period and phase (waits to re-lock)"""
+        self.pll_period_ns = None  # Estimated external tick period
+        self.pll_phase_ns = None  # Estimated time of the last external tick
+        self.pll_ext_ticks = 0  # External ticks since (re)lock
+        self.pll_base_tick = 0  # Output tick position at the (re)lock
+        self.pll_last_input_ns = None  # Arrival of the last external tick
+        self.pll_locked = False
+        self.pll_relocks = 0
+
+    def _pll_input(self, now):
+        """
+        Update the follower from one external tick
+
+        A second-order loop: the phase error against the predicted tick
+        time corrects both the phase (fast) and the period (slow).
+
+        Args:
+            now: Arrival time of the TimingClock (time.monotonic_ns())
+        """
+        last_input = self.pll_last_input_ns
+        self.pll_last_input_ns = now
+
+        if self.pll_phase_ns is None or last_input is None:
+            # First tick: only the phase is known
+            self.pll_phase_ns = now
+            self.pll_ext_ticks = 0
+            self.pll_base_tick = self.song_ticks
+            return
+
+        if self.pll_period_ns is None:
+            # Second tick: first period estimate, start generating
+            self.pll_period_ns = now - last_input
+            self.pll_phase_ns = now
+            self.pll_ext_ticks = 1
+            self.pll_locked = True
+            self._update_tick_offsets()
+            self._lock_output()
+            return
+
+        predicted = self.pll_phase_ns + self.pll_period_ns
+        error = now - predicted
+        if error > self.pll_period_ns // 2 or -error > self.pll_period_ns // 2:
+            # Lost lock (dropout, restart, tempo jump): take the new phase,
+            # keep the period, and continue from the current output position
+            self.pll_relocks += 1
+            self.pll_phase_ns = now
+            self.pll_ext_ticks = 0
+            self.pll_base_tick = self.song_ticks
+            if now - last_input < 2 * self.pll_period_ns:
+                self.pll_period_ns = now - last_input
+        else:
+            self.pll_phase_ns = predicted + (error >> self.PLL_PHASE_SHIFT)
+            self.pll_period_ns += error >> self.PLL_PERIOD_SHIFT
+            self.pll_ext_ticks += 1
+
+        self.pll_locked = True
+        self._update_tick_offsets()
+        self._lock_output()
+
+    def _lock_output(self):
+        """Align the output schedule to the latest external tick estimate"""
+        # Output ticks per external tick = multiply / divide
+        scaled = self.pll_ext_ticks * self.multiply
+        if scaled % self.divide:
+            return  # External tick falls between output ticks
+        anchor_tick = self.pll_base_tick + scaled // self.divide
+        if self.last_internal_tick_ns is None:
+            self.last_internal_tick_ns = self.pll_phase_ns
+        self._set_anchor(self.pll_phase_ns, anchor_tick)
+
+    def _process_pll_output(self):
+        """Generate the follower's ticks (free-runs through short dropouts)"""
+        if not self.running or not self.pll_locked:
+            return
+
+        now = time.monotonic_ns()
+        if now - self.pll_last_input_ns > self.dropout_ticks * self.pll_period_ns:
+            # Input gone for too long: stop and wait to re-lock
+            print("MIDI Clock: input lost - waiting to re-lock")
+            self.pll_locked = False
+            self.pll_phase_ns = None
+            return
+
+        self._run_schedule(now)
+
+    def is_free_running(self):
+        """True if the follower is generating ticks without recent input"""
+        return (self.pll_locked and
+                time.monotonic_ns() - self.pll_last_input_ns > 2 * self.pll_period_ns)
+
+    def get_jitter_stats(self):
+        """
+        Get internal clock lateness statistics
+
+        Returns:
+            Dictionary with tick count, max/mean/p99 lateness (microseconds)
+            and the number of re-anchors
+        """
+        jitter = self.jitter
+        return {
+            'ticks': jitter.count,
+            'max_us': jitter.max_ns // 1000,
+            'mean_us': jitter.mean_ns() // 1000,
+            'p99_us': jitter.p99_ns() // 1000,
+            'resyncs': self.resyncs
+        }
+
+    def _rewind_position(self):
+        """Restart the absolute tick position (clock start/reset)"""
+        self.song_ticks = 0
+        if self.scheduler is not None:
+            self.scheduler.reset(0)
+
+    def _update_external_bpm(self, interval_us):
+        """
+        Feed one external tick interval to the tempo estimate
+
+        Args:
+            interval_us: Time since the previous TimingClock (microseconds)
+        """
+        tempo = self.tempo
+
+        # Detect tempo change: if interval is very different from average, clear buffer
+        if tempo.is_tempo_change(interval_us):
+            print(f"Tempo change detected - clearing buffer (interval: {interval_us}us, avg: {tempo.average_us()}us)")
+            tempo.reset()
+            self.displayed_bpm = None
+
+        tempo.add(interval_us)
+
+        # Calculate BPM once there's at least half a beat of samples
+        rounded_bpm = tempo.bpm()
+        if rounded_bpm is None:
+            return
+
+        # Only update displayed BPM if change is significant (hysteresis)
+        if self.displayed_bpm is None:
+            self.displayed_bpm = rounded_bpm
+            self.bpm = rounded_bpm
+            print(f"External BPM: {self.bpm}")
+        elif abs(rounded_bpm - self.displayed_bpm) >= self.bpm_update_threshold:
+            self.displayed_bpm = rounded_bpm
+            self.bpm = rounded_bpm
+            print(f"External BPM: {self.bpm}")
+        else:
+            # Keep the stable displayed value
+            self.bpm = self.displayed_bpm
+
+    def _emit_tick(self):
+        """Advance the absolute tick position and run the tick callback"""
+        self.song_ticks += 1
+
+        # Note-offs due on this tick go out before any new step
+        if self.scheduler is not None:
+            self.scheduler.advance(self.song_ticks * SUBTICKS_PER_TICK)
+
+        if self.on_tick_callback:
+            self.on_tick_callback(self.song_ticks)
+
     def _process_external_clock(self):
         """Process incoming MIDI clock messages"""
         if self.midi_clock is None:
@@ -285,6 +866,10 @@ class ClockHandler:
                 # Start message received
                 self.running = True
                 self.tick_count = 0
+                self._rewind_position()
+                self._reset_pll()
+                self.anchor_ns = None
+                self.last_internal_tick_ns = None
                 print("MIDI Clock: Start")
 
             elif isinstance(msg, Stop):
@@ -301,76 +886,55 @@ class ClockHandler:
             elif isinstance(msg, TimingClock):
                 # Clock tick received
                 if self.running:
-                    # Calculate BPM
-                    current_time = time.monotonic()
-                    if self.last_tick_time is not None:
-                        interval = current_time - self.last_tick_time
-
-                        # Detect tempo change: if interval is very different from average, clear buffer
-                        if len(self.tick_intervals) >= 12:
-                            avg_interval = sum(self.tick_intervals) / len(self.tick_intervals)
-                            # If new interval differs by more than 15% from average, tempo changed
-                            if abs(interval - avg_interval) > (avg_interval * 0.15):
-                                print(f"Tempo change detected - clearing buffer (interval: {interval:.4f}s, avg: {avg_interval:.4f}s)")
-                                self.tick_intervals = []
-                                self.displayed_bpm = None
-
-                        self.tick_intervals.append(interval)
-
-                        # Keep only recent intervals
-                        if len(self.tick_intervals) > self.max_intervals:
-                            self.tick_intervals.pop(0)
-
-                        # Debug: print buffer status every 24 ticks
-                        if len(self.tick_intervals) % 24 == 0:
-                            print(f"Buffer: {len(self.tick_intervals)} samples")
-
-                        # Calculate average interval and BPM
-                        if len(self.tick_intervals) >= 12:  # Need at least half a beat of samples
-                            avg_interval = sum(self.tick_intervals) / len(self.tick_intervals)
-                            # BPM = 60 / (avg_interval * 24) since 24 PPQN
-                            calculated_bpm = 60.0 / (avg_interval * 24)
-
-                            # Round to nearest integer for stability
-                            rounded_bpm = round(calculated_bpm)
-
-                            # Only update displayed BPM if change is significant (hysteresis)
-                            if self.displayed_bpm is None:
-                                self.displayed_bpm = rounded_bpm
-                                self.bpm = rounded_bpm
-                                print(f"External BPM: {self.bpm}")
-                            elif abs(rounded_bpm - self.displayed_bpm) >= self.bpm_update_threshold:
-                                self.displayed_bpm = rounded_bpm
-                                self.bpm = rounded_bpm
-                                print(f"External BPM: {self.bpm}")
-                            else:
-                                # Keep the stable displayed value
-                                self.bpm = self.displayed_bpm
-
-                    self.last_tick_time = current_time
-
-                    self.tick_count += 1
-
-                    # Check if we should trigger a step
-                    if self.tick_count >= self.ticks_per_step:
-                        self.tick_count = 0
-
-                        # Trigger step callback
-                        if self.on_step_callback:
-                            self.on_step_callback()
+                    self._on_external_tick(time.monotonic_ns())
 
             # Get next message
             msg = self.midi_clock.receive()
 
+    def _on_external_tick(self, now):
+        """
+        Handle one TimingClock message
+
+        Args:
+            now: Arrival time (time.monotonic_ns())
+        """
+        # Calculate BPM
+        if self.last_tick_ns is not None:
+            self.last_interval_ns = now - self.last_tick_ns
+            self._update_external_bpm(self.last_interval_ns // 1000)
+
+        self.last_tick_ns = now
+
+        if self.sync_mode == self.SYNC_PLL:
+            # Follower: input only steers the generated ticks
+            self._pll_input(now)
+            return
+
+        self.tick_count += 1
+        self._emit_tick()
+
+        # Check if we should trigger a step
+        if self.tick_count >= self.ticks_per_step:
+            self.tick_count = 0
+
+            # Trigger step callback
+            if self.on_step_callback:
+                self.on_step_callback()
+
     def reset(self):
         """Reset clock state"""
         self.running = False
         self.tick_count = 0
+        self._rewind_position()
         self.bpm = None
         self.displayed_bpm = None
-        self.last_tick_time = None
-        self.tick_intervals = []
-        self.last_internal_tick = None
+        self.last_tick_ns = None
+        self.last_interval_ns = None
+        self.tempo.reset()
+        self.anchor_ns = None
+        self.last_internal_tick_ns = None
+        self.jitter.reset()
+        self._reset_pll()
 
     def is_running(self):
         """Check if clock is currently running"""
@@ -392,8 +956,9 @@ class ClockHandler:
         """Start the clock (mainly for internal clock)"""
         self.running = True
         if self.clock_source == self.CLOCK_INTERNAL:
-            self.last_internal_tick = time.monotonic()
             self.tick_count = 0
+            self._rewind_position()
+            self._anchor_internal(time.monotonic_ns())
 
     def stop(self):
         """Stop the clock (mainly for internal clock)"""
@@ -2,8 +2,26 @@
 
 Part of prisme Translation Hub architecture.
 Routes MIDI input based on user-selected source.
+
+Input paths:
+    - get_midi_message(): one adafruit_midi message object per call
+    - read_events(): every pending byte in one readinto(), parsed into
+      reusable MidiEvents (no per-message allocation)
+    - thru_events(): like read_events(), but everything that isn't
+      intercepted is forwarded to the output as raw byte spans
+      (memoryview slices of the receive buffer) before decoding
 """
 
+from .midi_parser import (
+    MidiParser, data_length, READ_BUFFER_SIZE,
+    NOTE_OFF, NOTE_ON, CONTROL_CHANGE, PROGRAM_CHANGE, CHANNEL_PRESSURE,
+    PITCH_BEND, SYSTEM_EXCLUSIVE, START, STOP, CONTINUE
+)
+
+# THRU table actions (per status byte, can be combined)
+THRU_FORWARD = 0x01  # Forward raw bytes to the output
+THRU_DECODE = 0x02  # Yield the event to the caller
+
 
 class InputRouter:
     """Routes MIDI input from selected source
@@ -15,17 +33,43 @@ class InputRouter:
     - Gate IN (future)
     """
 
-    def __init__(self, settings, midi_uart=None, midi_usb=None):
+    def __init__(self, settings, midi_uart=None, midi_usb=None, uart_port=None, usb_port=None,
+                 source=None, thru_notes=True):
         """Initialize input router
 
         Args:
             settings: Settings object with input_source
             midi_uart: MIDI object for UART (DIN-5 jack)
             midi_usb: MIDI object for USB MIDI
+            uart_port: Raw UART (busio.UART) for read_events()
+            usb_port: Raw USB MIDI input port (usb_midi.ports[0]) for read_events()
+            source: Fixed INPUT_SOURCE_* for read_events() / thru_events()
+                (None = follow settings.input_source)
+            thru_notes: False = thru_events() always decodes notes, even in
+                THRU routing mode (for callers that handle every note)
         """
         self.settings = settings
         self.midi_uart = midi_uart
         self.midi_usb = midi_usb
+        self.uart_port = uart_port
+        self.usb_port = usb_port
+        self.source = source
+        self.thru_notes = thru_notes
+
+        # Batched input: one receive buffer, one parser per port
+        # (each port keeps its own running status / partial message)
+        self.rx_buffer = bytearray(READ_BUFFER_SIZE)
+        self.rx_view = memoryview(self.rx_buffer)
+        self.rx_length = 0
+        self.uart_parser = MidiParser()
+        self.usb_parser = MidiParser()
+        self.parser = None  # Parser used by the last read
+
+        # THRU fast path: action per status byte, rebuilt when settings change
+        self.thru_table = bytearray(256)
+        self.thru_revision = None
+        self._status_byte = bytearray(1)  # Re-inserted running status
+        self._message = bytearray(3)  # Reassembled non-contiguous message
 
     def get_midi_message(self):
         """Get next MIDI message from selected input source
@@ -44,6 +88,172 @@ class InputRouter:
 
         return None
 
+    def read(self):
+        """Read and parse all pending MIDI bytes from the selected source
+
+        One readinto() per call drains up to READ_BUFFER_SIZE bytes (about
+        20 ms of DIN MIDI), so bursts of CC/aftertouch are handled in a
+        single loop iteration.
+
+        Returns:
+            Number of events parsed
+        """
+        port = None
+        parser = None
+        source = self.source
+        if source is None:
+            source = self.settings.input_source
+        if source == self.settings.INPUT_SOURCE_MIDI_IN:
+            port = self.uart_port
+            parser = self.uart_parser
+        elif source == self.settings.INPUT_SOURCE_USB:
+            port = self.usb_port
+            parser = self.usb_parser
+        # Future: CV IN, Gate IN support
+
+        self.parser = parser
+        self.rx_length = 0
+        if parser is None:
+            return 0
+
+        length = 0
+        if port is not None:
+            length = port.readinto(self.rx_buffer) or 0  # None = nothing pending
+        self.rx_length = length
+
+        return parser.feed(self.rx_buffer, length)
+
+    def read_events(self):
+        """Read all pending MIDI bytes and iterate over the parsed events
+
+        Returns:
+            Iterator of MidiEvent (the same object is reused for every
+            event - read its fields before advancing)
+        """
+        self.read()
+        if self.parser is None:
+            return iter(())
+        return self.parser.events()
+
+    def update_thru_table(self):
+        """Rebuild the per-status THRU actions from the current settings
+
+        Everything is forwarded raw except:
+            - Notes: decoded only (TRANSLATION mode feeds the pipeline;
+              THRU mode re-sends them on the output channel) - notes already
+              on the output channel in THRU mode are forwarded raw (unless
+              thru_notes is False)
+            - CC / Channel Pressure / Pitch Bend: also decoded when Custom
+              CC is enabled
+            - Program Change: also decoded (preset recall)
+            - Start / Stop / Continue: also decoded (transport feedback)
+        """
+        settings = self.settings
+        table = self.thru_table
+        thru = self.thru_notes and settings.routing_mode == settings.ROUTING_THRU
+        custom_cc = settings.custom_cc_source != settings.CC_SOURCE_DISABLED
+        modulation = THRU_FORWARD | (THRU_DECODE if custom_cc else 0)
+
+        status = 0
+        while status < 256:
+            table[status] = THRU_FORWARD
+            status += 1
+
+        channel = 0
+        while channel < 16:
+            if thru and channel == settings.midi_channel:
+                notes = THRU_FORWARD
+            else:
+                notes = THRU_DECODE
+            table[NOTE_OFF | channel] = notes
+            table[NOTE_ON | channel] = notes
+            table[CONTROL_CHANGE | channel] = modulation
+            table[PROGRAM_CHANGE | channel] = THRU_FORWARD | THRU_DECODE
+            table[CHANNEL_PRESSURE | channel] = modulation
+            table[PITCH_BEND | channel] = modulation
+            channel += 1
+
+        table[START] = THRU_FORWARD | THRU_DECODE
+        table[STOP] = THRU_FORWARD | THRU_DECODE
+        table[CONTINUE] = THRU_FORWARD | THRU_DECODE
+
+        self.thru_revision = settings.revision
+
+    def thru_events(self, out_port):
+        """Read all pending MIDI bytes, forward raw spans, decode the rest
+
+        Consecutive forwarded messages are written as one memoryview slice
+        of the receive buffer. A span starting with a running-status data
+        byte gets its status byte re-inserted (our own output may have
+        changed the receiver's running status in between).
+
+        Args:
+            out_port: Output port with write() (e.g. the MIDI OUT UART)
+
+        Returns:
+            Iterator of MidiEvent for events marked THRU_DECODE, in order
+            with the forwarded bytes
+        """
+        if self.settings.revision != self.thru_revision:
+            self.update_thru_table()
+        self.read()
+        if self.parser is None:
+            return iter(())
+        return self._forward(out_port)
+
+    def _forward(self, out_port):
+        """Generator behind thru_events()"""
+        parser = self.parser
+        table = self.thru_table
+        buffer = self.rx_buffer
+        view = self.rx_view
+        event = parser.event
+
+        span_start = 0
+        span_end = 0  # Empty when span_end == span_start
+        i = 0
+        while i < parser.count:
+            status = parser.statuses[i]
+            action = table[status]
+
+            if action & THRU_FORWARD:
+                start = parser.starts[i]
+                end = parser.ends[i]
+                if start >= 0 and start == span_end and span_end > span_start:
+                    # Contiguous with the pending span
+                    span_end = end
+                else:
+                    if span_end > span_start:
+                        out_port.write(view[span_start:span_end])
+                    span_start = span_end = 0
+                    if start < 0:
+                        # Split or interrupted message: write it reassembled
+                        message = self._message
+                        message[0] = status
+                        message[1] = parser.data1[i]
+                        message[2] = parser.data2[i]
+                        out_port.write(memoryview(message)[:1 + data_length(status)])
+                    else:
+                        if buffer[start] < 0x80 and status < SYSTEM_EXCLUSIVE:
+                            # Running status (channel messages only; a SysEx
+                            # continuation chunk goes out as is)
+                            self._status_byte[0] = status
+                            out_port.write(self._status_byte)
+                        span_start = start
+                        span_end = end
+
+            if action & THRU_DECODE:
+                if span_end > span_start:
+                    out_port.write(view[span_start:span_end])
+                    span_start = span_end = 0
+                event.set(status, parser.data1[i], parser.data2[i])
+                yield event
+
+            i += 1
+
+        if span_end > span_start:
+            out_port.write(view[span_start:span_end])
+
     def get_current_source_name(self):
         """Get human-readable name of current input source
 
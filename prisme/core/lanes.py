@@ -0,0 +1,243 @@
+"""Multi-lane arpeggiator with independent clock divisions
+
+Part of prisme Translation Hub architecture.
+Runs N Arpeggiator lanes in parallel (e.g. a bass lane at 8ths and a lead
+lane at 16ths), each with its own pattern, MIDI channel and division.
+A single LaneDispatcher is driven by ClockHandler's tick callback and
+tracks the earliest due tick across lanes, so ticks where no lane is due
+cost one comparison.
+
+Usage:
+    lanes = LaneDispatcher(settings, midi_io, scheduler=gate_scheduler)
+    lanes.add_lane(pattern=Settings.ARP_DOWN, midi_channel=1, clock_division=12)
+    lanes.add_lane(pattern=Settings.ARP_UP, midi_channel=2, clock_division=6)
+    clock.set_tick_callback(lanes.on_tick)
+"""
+
+from adafruit_midi.note_on import NoteOn
+from adafruit_midi.note_off import NoteOff
+from .arpeggiator import Arpeggiator
+
+# Lanes per dispatcher (each lane owns ~400 bytes of sequence buffers)
+MAX_LANES = 4
+
+
+class LaneSettings:
+    """Per-lane view of the global settings
+
+    Overrides pattern, MIDI channel and clock division; every other
+    setting (scale, octave range, velocity, strum...) is read from the
+    global Settings object.
+    """
+
+    def __init__(self, base, pattern, midi_channel, clock_division):
+        """
+        Initialize lane settings
+
+        Args:
+            base: Global Settings object
+            pattern: Settings.ARP_* pattern for this lane
+            midi_channel: Output MIDI channel (0-15)
+            clock_division: Clock ticks per step (6 = 16th, 12 = 8th)
+        """
+        self.base = base
+        self.pattern = pattern
+        self.midi_channel = midi_channel
+        self.clock_division = clock_division
+        self.lane_revision = 0
+
+    def __getattr__(self, name):
+        """Read everything not overridden from the global settings"""
+        return getattr(self.base, name)
+
+    @property
+    def revision(self):
+        """Changes when either the lane or the global settings change"""
+        return self.base.revision + self.lane_revision
+
+    def changed(self):
+        """Mark lane overrides as changed (picked up on the next step)"""
+        self.lane_revision += 1
+
+    def get_pattern_name(self):
+        """Return human-readable pattern name for this lane"""
+        return type(self.base).get_pattern_name(self)
+
+
+class ArpLane:
+    """One arpeggiator lane and its position in the tick schedule"""
+
+    def __init__(self, settings, arpeggiator):
+        """
+        Initialize a lane
+
+        Args:
+            settings: LaneSettings for this lane
+            arpeggiator: Arpeggiator playing this lane
+        """
+        self.settings = settings
+        self.arpeggiator = arpeggiator
+        self.next_due = settings.clock_division  # Absolute tick of next step
+
+    def set_pattern(self, pattern):
+        """Change this lane's pattern"""
+        self.settings.pattern = pattern
+        self.settings.changed()
+
+    def set_midi_channel(self, midi_channel):
+        """Change this lane's output MIDI channel"""
+        self.arpeggiator.panic()  # Release notes on the old channel
+        self.settings.midi_channel = midi_channel
+        self.settings.changed()
+
+    def set_clock_division(self, clock_division):
+        """Change this lane's clock division (takes effect after the next step)"""
+        self.settings.clock_division = clock_division
+        self.settings.changed()  # Gate length follows the new step length
+
+
+class LaneDispatcher:
+    """Drives several arpeggiator lanes from a single clock tick stream"""
+
+    def __init__(self, settings, midi_io, zero_alloc=False, scheduler=None):
+        """
+        Initialize the dispatcher (no lanes yet)
+
+        Args:
+            settings: Global Settings object (input channel, latch, scale...)
+            midi_io: MidiIO object shared by all lanes
+            zero_alloc: Passed to each lane's Arpeggiator
+            scheduler: GateScheduler shared by all lanes (usually the one set
+                on the clock); each lane's gate is settings.gate_length of
+                its own step. Without it notes are held until the next step.
+        """
+        self.settings = settings
+        self.midi_io = midi_io
+        self.zero_alloc = zero_alloc
+        self.scheduler = scheduler
+        self.lanes = []
+
+        # Earliest due tick across lanes (None = no lanes)
+        self.next_due = None
+        self.last_tick = 0
+
+    def add_lane(self, pattern, midi_channel, clock_division, cv_output=None):
+        """
+        Add a lane
+
+        Args:
+            pattern: Settings.ARP_* pattern for the lane
+            midi_channel: Output MIDI channel (0-15)
+            clock_division: Clock ticks per step (6 = 16th, 12 = 8th)
+            cv_output: CVOutput for this lane (CV is monophonic - give it to one lane)
+
+        Returns:
+            The new ArpLane, or None if MAX_LANES are already running
+        """
+        if len(self.lanes) >= MAX_LANES:
+            print(f"Lane limit reached ({MAX_LANES})")
+            return None
+
+        lane_settings = LaneSettings(self.settings, pattern, midi_channel, clock_division)
+        arpeggiator = Arpeggiator(lane_settings, self.midi_io, cv_output, self.zero_alloc,
+                                  self.scheduler)
+        lane = ArpLane(lane_settings, arpeggiator)
+        lane.next_due = self.last_tick + clock_division
+        self.lanes.append(lane)
+        self._update_next_due()
+        return lane
+
+    def remove_lane(self, lane):
+        """
+        Remove a lane (its sounding note is released)
+
+        Args:
+            lane: ArpLane returned by add_lane()
+        """
+        if lane in self.lanes:
+            lane.arpeggiator.panic()
+            self.lanes.remove(lane)
+            self._update_next_due()
+
+    def _update_next_due(self):
+        """Recompute the earliest due tick across lanes"""
+        next_due = None
+        for lane in self.lanes:
+            if next_due is None or lane.next_due < next_due:
+                next_due = lane.next_due
+        self.next_due = next_due
+
+    def on_tick(self, tick):
+        """
+        Clock tick callback (see ClockHandler.set_tick_callback)
+
+        Args:
+            tick: Absolute tick position (1 = first tick after start)
+        """
+        if tick <= self.last_tick:
+            # Clock restarted - realign every lane to the new start
+            self.reset(tick - 1)
+        self.last_tick = tick
+
+        # Nothing due: one comparison per tick
+        if self.next_due is None or tick < self.next_due:
+            return
+
+        for lane in self.lanes:
+            if lane.next_due <= tick:
+                lane.arpeggiator.step()
+                lane.next_due = tick + lane.settings.clock_division
+        self._update_next_due()
+
+    def reset(self, tick=0):
+        """
+        Restart every lane's division count from a tick position
+
+        Args:
+            tick: Tick position to count from (0 = clock start)
+        """
+        self.last_tick = tick
+        for lane in self.lanes:
+            lane.next_due = tick + lane.settings.clock_division
+        self._update_next_due()
+
+    def add_note(self, note, velocity):
+        """Add a held note to every lane"""
+        for lane in self.lanes:
+            lane.arpeggiator.add_note(note, velocity)
+
+    def remove_note(self, note):
+        """Release a held note on every lane"""
+        for lane in self.lanes:
+            lane.arpeggiator.remove_note(note)
+
+    def clear_notes(self):
+        """Clear held notes on every lane"""
+        for lane in self.lanes:
+            lane.arpeggiator.clear_notes()
+
+    def process_midi_message(self, msg):
+        """
+        Process an incoming MIDI message (input on the global MIDI channel)
+
+        Args:
+            msg: MIDI message object
+        """
+        if hasattr(msg, 'channel') and msg.channel != self.settings.midi_channel:
+            return
+
+        if isinstance(msg, NoteOn):
+            if msg.velocity > 0:
+                self.add_note(msg.note, msg.velocity)
+            elif not self.settings.latch:
+                # Velocity 0 is note off
+                self.remove_note(msg.note)
+
+        elif isinstance(msg, NoteOff):
+            if not self.settings.latch:
+                self.remove_note(msg.note)
+
+    def panic(self):
+        """Stop all notes on every lane"""
+        for lane in self.lanes:
+            lane.arpeggiator.panic()
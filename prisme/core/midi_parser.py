@@ -0,0 +1,297 @@
+"""Byte-level MIDI parser for batched input
+
+Part of prisme Translation Hub architecture.
+Parses raw MIDI bytes (one readinto() per loop) with a running-status
+aware state machine into preallocated event buffers, and hands events
+out through a single reusable MidiEvent - no message objects are
+allocated per MIDI message.
+
+Handles:
+    - Running status (channel voice messages without a status byte)
+    - Real-time bytes (0xF8-0xFF) anywhere, even inside other messages
+    - Messages split across reads (state carries over)
+    - SysEx (not decoded; reported as raw byte spans for THRU)
+"""
+
+from array import array
+
+# Event types (channel voice: status & 0xF0, system: full status byte)
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+POLY_PRESSURE = 0xA0
+CONTROL_CHANGE = 0xB0
+PROGRAM_CHANGE = 0xC0
+CHANNEL_PRESSURE = 0xD0
+PITCH_BEND = 0xE0
+SYSTEM_EXCLUSIVE = 0xF0  # One event per SysEx chunk (raw span only, never decoded)
+MTC_QUARTER_FRAME = 0xF1
+SONG_POSITION = 0xF2
+SONG_SELECT = 0xF3
+TUNE_REQUEST = 0xF6
+TIMING_CLOCK = 0xF8
+START = 0xFA
+CONTINUE = 0xFB
+STOP = 0xFC
+ACTIVE_SENSING = 0xFE
+SYSTEM_RESET = 0xFF
+
+# Input buffer size per read (bytes) - also the most events per read
+READ_BUFFER_SIZE = 64
+
+
+def data_length(status):
+    """
+    Get the number of data bytes following a status byte
+
+    Args:
+        status: MIDI status byte (0x80-0xFF)
+
+    Returns:
+        Data byte count (0-2)
+    """
+    if status < 0xF0:
+        kind = status & 0xF0
+        if kind == PROGRAM_CHANGE or kind == CHANNEL_PRESSURE:
+            return 1
+        return 2
+    if status == SONG_POSITION:
+        return 2
+    if status == MTC_QUARTER_FRAME or status == SONG_SELECT:
+        return 1
+    return 0
+
+
+class MidiEvent:
+    """Lightweight, reusable MIDI event (fields overwritten per event)"""
+
+    def __init__(self):
+        """Create an empty event"""
+        self.status = 0  # Full status byte
+        self.type = 0  # NOTE_ON, CONTROL_CHANGE, TIMING_CLOCK...
+        self.channel = 0  # 0-15 (channel voice messages only)
+        self.data1 = 0  # Note / controller / program / pressure / LSB
+        self.data2 = 0  # Velocity / value / MSB
+        self.length = 1  # Message length in bytes (status + data)
+
+    def set(self, status, data1, data2):
+        """
+        Load the event from raw fields
+
+        Args:
+            status: Full status byte
+            data1: First data byte (0 if none)
+            data2: Second data byte (0 if none)
+        """
+        self.status = status
+        if status < 0xF0:
+            self.type = status & 0xF0
+            self.channel = status & 0x0F
+        else:
+            self.type = status
+            self.channel = 0
+        self.data1 = data1
+        self.data2 = data2
+        self.length = 1 + data_length(status)
+
+    @property
+    def note(self):
+        """Note number (note on/off, poly pressure)"""
+        return self.data1
+
+    @property
+    def velocity(self):
+        """Velocity (note on/off)"""
+        return self.data2
+
+    @property
+    def control(self):
+        """Controller number (control change)"""
+        return self.data1
+
+    @property
+    def value(self):
+        """Controller value (control change)"""
+        return self.data2
+
+    @property
+    def pressure(self):
+        """Pressure (channel pressure)"""
+        return self.data1
+
+    @property
+    def pitch_bend(self):
+        """14-bit pitch bend value (0-16383, 8192 = center)"""
+        return self.data1 | (self.data2 << 7)
+
+    def is_note_on(self):
+        """True for a Note On with velocity > 0"""
+        return self.type == NOTE_ON and self.data2 > 0
+
+    def is_note_off(self):
+        """True for a Note Off or a Note On with velocity 0"""
+        return self.type == NOTE_OFF or (self.type == NOTE_ON and self.data2 == 0)
+
+
+class MidiParser:
+    """Running-status MIDI byte parser with preallocated event storage
+
+    Besides the decoded fields, every event records where its bytes sit in
+    the fed buffer (starts/ends), so THRU can forward raw spans without
+    re-serializing. starts[i] is -1 when the bytes aren't one contiguous
+    span of this buffer (message split across reads, or a real-time byte
+    in the middle of it).
+    """
+
+    def __init__(self, capacity=READ_BUFFER_SIZE):
+        """
+        Preallocate event storage
+
+        Args:
+            capacity: Maximum events per feed() call
+        """
+        self.capacity = capacity
+        self.statuses = bytearray(capacity)
+        self.data1 = bytearray(capacity)
+        self.data2 = bytearray(capacity)
+        self.starts = array('h', [0] * capacity)  # Buffer offset of first byte
+        self.ends = array('h', [0] * capacity)  # Buffer offset after last byte
+        self.count = 0
+
+        # Parser state (carries over between reads)
+        self.running_status = 0  # 0 = none
+        self.status = 0  # Status of the message being assembled
+        self.pending = 0  # Data bytes still expected
+        self.first = -1  # First data byte of a 2-byte message (-1 = none yet)
+        self.start = -1  # Buffer offset where the message began (-1 = not contiguous)
+        self.in_sysex = False
+        self.sysex_start = 0  # Buffer offset of the current SysEx chunk
+
+        self.event = MidiEvent()
+
+    def reset(self):
+        """Forget running status and any partial message"""
+        self.running_status = 0
+        self.pending = 0
+        self.in_sysex = False
+        self.count = 0
+
+    def _store(self, status, data1, data2, start, end):
+        """Append a parsed event (dropped if storage is full)"""
+        count = self.count
+        if count < self.capacity:
+            self.statuses[count] = status
+            self.data1[count] = data1
+            self.data2[count] = data2
+            self.starts[count] = start
+            self.ends[count] = end
+            self.count = count + 1
+
+    def _end_sysex_chunk(self, end):
+        """Store the SysEx bytes seen so far in this buffer as one event"""
+        if end > self.sysex_start:
+            self._store(SYSTEM_EXCLUSIVE, 0, 0, self.sysex_start, end)
+
+    def feed(self, buffer, length):
+        """
+        Parse raw bytes into the event storage (replaces previous events)
+
+        Args:
+            buffer: Bytes read from the port
+            length: Number of valid bytes in buffer
+
+        Returns:
+            Number of complete events parsed
+        """
+        self.count = 0
+        self.sysex_start = 0
+        if self.pending:
+            self.start = -1  # Message began in the previous buffer
+
+        i = 0
+        while i < length:
+            byte = buffer[i]
+            i += 1
+
+            if byte >= 0xF8:
+                # Real-time: single byte, doesn't touch running status
+                if self.in_sysex:
+                    self._end_sysex_chunk(i - 1)
+                    self.sysex_start = i
+                elif self.pending:
+                    self.start = -1  # Message no longer contiguous
+                self._store(byte, 0, 0, i - 1, i)
+                continue
+
+            if byte >= 0x80:
+                # Status byte (also ends SysEx)
+                if self.in_sysex:
+                    self.in_sysex = False
+                    if byte == 0xF7:
+                        self._end_sysex_chunk(i)
+                        continue
+                    self._end_sysex_chunk(i - 1)  # Unterminated SysEx
+
+                if byte == 0xF0:
+                    self.in_sysex = True
+                    self.sysex_start = i - 1
+                    self.running_status = 0
+                    self.pending = 0
+                    continue
+                if byte == 0xF7:
+                    # Stray end of SysEx
+                    self.running_status = 0
+                    self.pending = 0
+                    continue
+
+                self.running_status = byte if byte < 0xF0 else 0
+                self.pending = data_length(byte)
+                if self.pending == 0:
+                    # Tune request / undefined system common
+                    self._store(byte, 0, 0, i - 1, i)
+                    continue
+                self.status = byte
+                self.first = -1
+                self.start = i - 1
+                continue
+
+            # Data byte
+            if self.in_sysex:
+                continue
+            if self.pending == 0:
+                if not self.running_status:
+                    continue  # Stray data byte
+                # Running status: reuse the last channel status
+                self.status = self.running_status
+                self.pending = data_length(self.status)
+                self.first = -1
+                self.start = i - 1
+
+            if self.first < 0 and self.pending == 2:
+                self.first = byte
+                self.pending = 1
+            elif self.first < 0:
+                # 1-byte message
+                self._store(self.status, byte, 0, self.start, i)
+                self.pending = 0
+            else:
+                self._store(self.status, self.first, byte, self.start, i)
+                self.pending = 0
+
+        if self.in_sysex:
+            self._end_sysex_chunk(length)
+
+        return self.count
+
+    def events(self):
+        """
+        Iterate over the parsed events
+
+        Yields the same MidiEvent object for every event - read its fields
+        before advancing (don't keep references).
+        """
+        event = self.event
+        i = 0
+        while i < self.count:
+            event.set(self.statuses[i], self.data1[i], self.data2[i])
+            yield event
+            i += 1
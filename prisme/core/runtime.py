@@ -0,0 +1,215 @@
+"""Cooperative task runtime (asyncio)
+
+Part of prisme Translation Hub architecture.
+Runs the clock, MIDI input, CV output, buttons, display and garbage
+collection as separate asyncio tasks instead of one fixed-order polling
+loop. Each task has a priority and a time budget:
+
+- Critical tasks (priority <= PRIORITY_OUTPUT) run on every scheduler
+  pass and are created first, so they get the CPU first.
+- Other tasks only start when their budget fits before the next clock
+  deadline (e.g. the next arp step); otherwise they yield and try again.
+  A task held back for max_wait_ns runs anyway, so nothing starves when
+  steps come faster than a slow task.
+
+A slow subsystem (display refresh, gc.collect) then no longer delays a
+step that is due.
+
+Works on CircuitPython's asyncio library and on CPython's asyncio (host
+runs: scripts/run_host_runtime.py, tests/test_runtime.py).
+"""
+
+import time
+import asyncio
+
+# Priorities (lower number = more urgent)
+PRIORITY_CLOCK = 0
+PRIORITY_INPUT = 1
+PRIORITY_OUTPUT = 2
+PRIORITY_UI = 3
+PRIORITY_BACKGROUND = 4
+
+# Tasks at or above this priority never wait for the clock deadline
+CRITICAL_PRIORITY = PRIORITY_OUTPUT
+
+# Default time budget of a task run
+DEFAULT_BUDGET_NS = 1000000  # 1 ms
+
+# A task held back for this long runs anyway
+DEFAULT_MAX_WAIT_NS = 50000000  # 50 ms
+
+
+class RuntimeTask:
+    """One periodic job: callback, priority, period and time budget, plus run stats"""
+
+    def __init__(self, name, callback, priority, period_ns, budget_ns, max_wait_ns):
+        """
+        Initialize task
+
+        Args:
+            name: Name for stats
+            callback: Function with no arguments, run once per activation
+            priority: PRIORITY_* value
+            period_ns: Time between activations (0 = every scheduler pass)
+            budget_ns: Expected worst-case run time
+            max_wait_ns: Longest a non-critical task waits for slack
+        """
+        self.name = name
+        self.callback = callback
+        self.priority = priority
+        self.period_ns = period_ns
+        self.budget_ns = budget_ns
+        self.max_wait_ns = max_wait_ns
+
+        # Statistics
+        self.runs = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.overruns = 0  # Runs longer than budget_ns
+        self.waits = 0  # Activations held back for the clock deadline
+        self.forced = 0  # Activations run after max_wait_ns without slack
+
+
+class Runtime:
+    """Schedules RuntimeTasks cooperatively with priorities and deadlines"""
+
+    def __init__(self, deadline=None):
+        """
+        Initialize an empty runtime
+
+        Args:
+            deadline: Function returning the next clock-critical time
+                      (time.monotonic_ns() scale) or None if there is none,
+                      e.g. ClockHandler.get_next_step_ns
+        """
+        self.deadline = deadline
+        self.tasks = []
+        self.running = False
+        self.passes = 0  # Scheduler passes (runs of the first critical task)
+
+    def add_task(self, name, callback, priority, period_ns=0,
+                 budget_ns=DEFAULT_BUDGET_NS, max_wait_ns=DEFAULT_MAX_WAIT_NS):
+        """
+        Add a task (before run())
+
+        Args:
+            name: Name for stats
+            callback: Function with no arguments
+            priority: PRIORITY_* value
+            period_ns: Time between activations (0 = every scheduler pass)
+            budget_ns: Expected worst-case run time (non-critical tasks
+                       wait until it fits before the next deadline)
+            max_wait_ns: Longest a non-critical task waits for slack
+
+        Returns:
+            The RuntimeTask
+        """
+        task = RuntimeTask(name, callback, priority, period_ns, budget_ns, max_wait_ns)
+        self.tasks.append(task)
+        return task
+
+    def has_slack(self, budget_ns, now):
+        """
+        Check whether work of budget_ns fits before the next clock deadline
+
+        Args:
+            budget_ns: Run time of the work
+            now: Current time (time.monotonic_ns())
+
+        Returns:
+            True if there is no deadline or the work fits before it
+        """
+        if self.deadline is None:
+            return True
+        due = self.deadline()
+        return due is None or due - now >= budget_ns
+
+    async def _wait_for_slack(self, task):
+        """Yield until the task's budget fits before the next deadline (or max_wait_ns)"""
+        now = time.monotonic_ns()
+        if self.has_slack(task.budget_ns, now):
+            return
+        task.waits += 1
+        held_since = now
+        while self.running:
+            await asyncio.sleep(0)
+            now = time.monotonic_ns()
+            if self.has_slack(task.budget_ns, now):
+                return
+            if now - held_since >= task.max_wait_ns:
+                task.forced += 1
+                return
+
+    async def _run_task(self, task, counts_passes):
+        """Activate a task until stop()"""
+        critical = task.priority <= CRITICAL_PRIORITY
+        while self.running:
+            if not critical:
+                await self._wait_for_slack(task)
+                if not self.running:
+                    break
+
+            start = time.monotonic_ns()
+            task.callback()
+            end = time.monotonic_ns()
+
+            elapsed = end - start
+            task.runs += 1
+            task.total_ns += elapsed
+            if elapsed > task.max_ns:
+                task.max_ns = elapsed
+            if elapsed > task.budget_ns:
+                task.overruns += 1
+            if counts_passes:
+                self.passes += 1
+
+            # Fixed rate: the next activation is one period after this start
+            delay_ns = start + task.period_ns - end
+            if delay_ns > 0:
+                await asyncio.sleep(delay_ns / 1000000000)
+            else:
+                await asyncio.sleep(0)
+
+    async def run(self, duration_ns=None):
+        """
+        Run all tasks (until stop(), or for duration_ns)
+
+        Args:
+            duration_ns: Stop after this long (None = run until stop())
+        """
+        self.running = True
+
+        # Most urgent first: at each pass, ready tasks run in creation order
+        ordered = sorted(self.tasks, key=lambda task: task.priority)
+        coroutines = []
+        for index in range(len(ordered)):
+            coroutines.append(asyncio.create_task(self._run_task(ordered[index], index == 0)))
+
+        if duration_ns is not None:
+            await asyncio.sleep(duration_ns / 1000000000)
+            self.stop()
+        await asyncio.gather(*coroutines)
+
+    def stop(self):
+        """Stop all tasks after their current activation"""
+        self.running = False
+
+    def get_stats(self):
+        """
+        Get per-task statistics (for debugging)
+
+        Returns:
+            dict: per task name: runs, mean_us, max_us, overruns, waits, forced;
+                  plus 'passes'
+        """
+        stats = {'passes': self.passes}
+        for task in self.tasks:
+            stats[task.name] = {
+                'runs': task.runs,
+                'mean_us': task.total_ns // task.runs // 1000 if task.runs else 0,
+                'max_us': task.max_ns // 1000,
+                'overruns': task.overruns,
+                'waits': task.waits,
+                'forced': task.forced,
+            }
+        return stats
@@ -0,0 +1,163 @@
+"""Tick-scheduled note-off events (gate length)
+
+Part of prisme Translation Hub architecture.
+A fixed-capacity binary min-heap of pending note-offs, keyed by clock
+position in sub-ticks (SUBTICKS_PER_TICK per 24 PPQN tick). All event
+fields live in preallocated arrays, so scheduling never allocates.
+
+ClockHandler advances the scheduler at every tick (before the step
+callback) and in between ticks when events are pending, which gives
+sub-step gate resolution without busy-polling.
+"""
+
+from array import array
+
+# Sub-tick resolution: 16 per tick = 384 PPQN
+SUBTICKS_PER_TICK = 16
+
+# Pending events (one per sounding note per lane is typical)
+MAX_EVENTS = 32
+
+
+class GateScheduler:
+    """Fixed-capacity min-heap of timed note-off events"""
+
+    def __init__(self, capacity=MAX_EVENTS):
+        """
+        Preallocate event storage
+
+        Args:
+            capacity: Maximum pending events
+        """
+        self.capacity = capacity
+
+        # Heap-ordered parallel event fields
+        self.due = array('l', [0] * capacity)  # Absolute position (sub-ticks)
+        self.owner = bytearray(capacity)  # Index into handlers
+        self.note = bytearray(capacity)
+        self.tag = bytearray(capacity)  # Owner's note serial (drops stale events)
+        self.count = 0
+
+        # Registered event handlers: handler(note, tag)
+        self.handlers = []
+
+        # Current clock position (sub-ticks)
+        self.now = 0
+
+    def register(self, handler):
+        """
+        Register an event handler
+
+        Args:
+            handler: Function called as handler(note, tag) when an event fires
+
+        Returns:
+            Owner id to pass to schedule()
+        """
+        self.handlers.append(handler)
+        return len(self.handlers) - 1
+
+    def schedule(self, delay, owner, note, tag=0):
+        """
+        Schedule an event relative to the current position
+
+        If the heap is full, the earliest pending event fires early to make
+        room (a short note is better than a stuck one).
+
+        Args:
+            delay: Sub-ticks from now
+            owner: Owner id from register()
+            note: MIDI note number
+            tag: Owner-defined byte passed back to the handler
+        """
+        if self.count >= self.capacity:
+            self._fire_first()
+
+        # Append at the end, then sift up
+        i = self.count
+        self.count += 1
+        due = self.now + delay
+        while i > 0:
+            parent = (i - 1) >> 1
+            if self.due[parent] <= due:
+                break
+            self._move(parent, i)
+            i = parent
+        self.due[i] = due
+        self.owner[i] = owner
+        self.note[i] = note
+        self.tag[i] = tag
+
+    def advance(self, position):
+        """
+        Move the clock position forward and fire every due event
+
+        Args:
+            position: Current clock position in sub-ticks
+        """
+        if position > self.now:
+            self.now = position
+        while self.count and self.due[0] <= self.now:
+            self._fire_first()
+
+    def next_due(self):
+        """
+        Get the position of the earliest pending event
+
+        Returns:
+            Position in sub-ticks, or None if nothing is pending
+        """
+        return self.due[0] if self.count else None
+
+    def reset(self, position=0):
+        """
+        Rebase the clock position (e.g. on clock restart)
+
+        Pending events keep their remaining time.
+
+        Args:
+            position: New current position in sub-ticks
+        """
+        shift = position - self.now
+        i = 0
+        while i < self.count:
+            self.due[i] += shift
+            i += 1
+        self.now = position
+
+    def clear(self):
+        """Drop all pending events without firing them"""
+        self.count = 0
+
+    def _fire_first(self):
+        """Remove the earliest event and call its handler"""
+        owner = self.owner[0]
+        note = self.note[0]
+        tag = self.tag[0]
+
+        # Move the last event to the root, then sift down
+        self.count -= 1
+        last = self.count
+        if last:
+            due = self.due[last]
+            i = 0
+            while True:
+                child = 2 * i + 1
+                if child >= last:
+                    break
+                if child + 1 < last and self.due[child + 1] < self.due[child]:
+                    child += 1
+                if due <= self.due[child]:
+                    break
+                self._move(child, i)
+                i = child
+            self._move(last, i)
+
+        self.handlers[owner](note, tag)
+
+    def _move(self, src, dst):
+        """Copy event fields from one heap slot to another"""
+        self.due[dst] = self.due[src]
+        self.owner[dst] = self.owner[src]
+        self.note[dst] = self.note[src]
+        self.tag[dst] = self.tag[src]
@@ -0,0 +1,578 @@
+"""Incremental step-sequence engine for the arpeggiator
+
+Part of prisme Translation Hub architecture.
+Keeps held notes sorted in preallocated byte buffers and rebuilds the
+expanded sequence in place, so note changes on the MIDI receive path
+never allocate new lists.
+
+Layout:
+    notes/velocities  - held notes sorted by pitch (binary search insert/delete)
+    order             - held notes in the order they were played
+    expanded_*        - sorted notes repeated across octaves (clipped at 127)
+    steps             - pattern index map: indices into the expanded notes
+
+Index maps are compiled once per (pattern, held count, octaves) by the
+PatternCompiler and kept in a small LRU cache, so regeneration is a table
+lookup plus a copy.
+"""
+
+from array import array
+from collections import OrderedDict
+from ..utils.config import Settings
+
+# Buffer capacities (sized for the M4: ~400 bytes total)
+MAX_HELD_NOTES = 16
+MAX_OCTAVES = 4
+MAX_EXPANDED = MAX_HELD_NOTES * MAX_OCTAVES  # 64 expanded notes
+MAX_STEPS = MAX_EXPANDED * 3  # Chord Repeat plays the expanded run 3 times
+
+# Compiled pattern table budget (largest table is MAX_STEPS bytes)
+PATTERN_CACHE_BYTES = 2048
+
+
+class PatternCompiler:
+    """Compiles and caches pattern index tables (LRU, byte budget)
+
+    A table lists grid indices `octave * held + slot` for an unclipped
+    expansion of `held` notes over `octaves` octaves. The slot is the sorted
+    rank for every pattern except As Played, where it is the play-order
+    position (translated to a sorted rank when gathered).
+    """
+
+    def __init__(self, max_bytes=PATTERN_CACHE_BYTES):
+        """
+        Initialize an empty cache
+
+        Args:
+            max_bytes: Total table bytes to keep before evicting
+        """
+        self.max_bytes = max_bytes
+        self.tables = OrderedDict()  # key -> array('B'), oldest first
+        self.size = 0  # Bytes held in tables
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, pattern, held, octaves):
+        """Get the compiled table for a pattern (compiling on a miss)
+
+        Args:
+            pattern: Settings.ARP_* pattern id (Strum already mapped)
+            held: Number of held notes (1-16)
+            octaves: Octave range (1-4)
+
+        Returns:
+            array('B') of grid indices
+        """
+        if pattern == Settings.ARP_RANDOM:
+            pattern = Settings.ARP_UP  # Same table, randomized per step
+        key = (pattern << 8) | (held << 3) | octaves
+
+        tables = self.tables
+        table = tables.pop(key, None)
+        if table is not None:
+            self.hits += 1
+            tables[key] = table  # Re-insert as most recently used
+            return table
+
+        self.misses += 1
+        table = compile_pattern(pattern, held, octaves)
+        self.size += len(table)
+        while self.size > self.max_bytes and tables:
+            oldest = next(iter(tables))
+            self.size -= len(tables.pop(oldest))
+        tables[key] = table
+        return table
+
+    def clear(self):
+        """Drop all compiled tables"""
+        self.tables = OrderedDict()
+        self.size = 0
+
+
+def compile_pattern(pattern, held, octaves):
+    """Compile a pattern's grid index table
+
+    Args:
+        pattern: Settings.ARP_* pattern id (Strum already mapped)
+        held: Number of held notes (1-16)
+        octaves: Octave range (1-4)
+
+    Returns:
+        array('B') of grid indices
+    """
+    buffer = bytearray(MAX_STEPS)
+    n = 0
+    if pattern == Settings.ARP_AS_PLAYED:
+        # Each play-order slot across octaves
+        slot = 0
+        while slot < held:
+            octave = 0
+            while octave < octaves:
+                buffer[n] = octave * held + slot
+                n += 1
+                octave += 1
+            slot += 1
+    elif pattern == Settings.ARP_OCTAVE_UP:
+        # Root note in each octave
+        while n < octaves:
+            buffer[n] = n * held
+            n += 1
+    else:
+        n = fill_index_map(pattern, held * octaves, buffer)
+    return array('B', buffer[:n])
+
+
+# Shared by every SequenceEngine (lanes compile each table once)
+shared_compiler = PatternCompiler()
+
+
+class SequenceEngine:
+    """Sorted held-note buffer with an in-place expanded step sequence"""
+
+    def __init__(self, compiler=None):
+        """
+        Preallocate all note and step buffers
+
+        Args:
+            compiler: PatternCompiler to use (default: shared_compiler)
+        """
+        # Held notes sorted by pitch (parallel buffers)
+        self.notes = bytearray(MAX_HELD_NOTES)
+        self.velocities = bytearray(MAX_HELD_NOTES)
+        self.velocities_view = memoryview(self.velocities)
+        self.count = 0
+
+        # Held notes in play order (for As Played pattern)
+        self.order = bytearray(MAX_HELD_NOTES)
+
+        # Sorted notes expanded across octaves
+        self.expanded_notes = bytearray(MAX_EXPANDED)
+        self.expanded_velocities = bytearray(MAX_EXPANDED)
+        self.expanded_velocities_view = memoryview(self.expanded_velocities)
+        self.expanded_length = 0
+
+        # octave_starts[o] = index of the first expanded note in octave o
+        # octave_starts[octaves] = expanded_length
+        self.octave_starts = bytearray(MAX_OCTAVES + 1)
+        self.octaves = 0
+
+        # Pattern index map into the expanded notes
+        self.steps = bytearray(MAX_STEPS)
+        self.steps_view = memoryview(self.steps)
+        self.length = 0
+
+        # Compiled pattern tables (use_cache=False walks the pattern chain)
+        self.compiler = compiler if compiler is not None else shared_compiler
+        self.use_cache = True
+
+    # -------------------------------------------------------------------------
+    # Held notes (O(log n) search, in-place shift)
+    # -------------------------------------------------------------------------
+
+    def _search(self, note):
+        """Binary search the sorted notes
+
+        Args:
+            note: MIDI note number
+
+        Returns:
+            Index of note, or the index where it would be inserted
+        """
+        low = 0
+        high = self.count
+        notes = self.notes
+        while low < high:
+            mid = (low + high) >> 1
+            if notes[mid] < note:
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def index_of(self, note):
+        """Get the sorted index of a held note
+
+        Args:
+            note: MIDI note number
+
+        Returns:
+            Sorted index, or -1 if the note is not held
+        """
+        index = self._search(note)
+        if index < self.count and self.notes[index] == note:
+            return index
+        return -1
+
+    def insert(self, note, velocity):
+        """Insert a held note in sorted position
+
+        Args:
+            note: MIDI note number (0-127)
+            velocity: Note velocity (0-127)
+
+        Returns:
+            True if inserted, False if already held or buffer is full
+        """
+        index = self._search(note)
+        if index < self.count and self.notes[index] == note:
+            return False
+        if self.count >= MAX_HELD_NOTES:
+            return False
+
+        # Shift higher notes up one slot
+        notes = self.notes
+        velocities = self.velocities
+        i = self.count
+        while i > index:
+            notes[i] = notes[i - 1]
+            velocities[i] = velocities[i - 1]
+            i -= 1
+        notes[index] = note
+        velocities[index] = velocity
+
+        self.order[self.count] = note
+        self.count += 1
+        return True
+
+    def remove(self, note):
+        """Remove a held note
+
+        Args:
+            note: MIDI note number
+
+        Returns:
+            True if removed, False if the note was not held
+        """
+        index = self.index_of(note)
+        if index < 0:
+            return False
+
+        # Shift higher notes down one slot
+        notes = self.notes
+        velocities = self.velocities
+        last = self.count - 1
+        i = index
+        while i < last:
+            notes[i] = notes[i + 1]
+            velocities[i] = velocities[i + 1]
+            i += 1
+
+        # Remove from play order
+        order = self.order
+        i = 0
+        while order[i] != note:
+            i += 1
+        while i < last:
+            order[i] = order[i + 1]
+            i += 1
+
+        self.count = last
+        return True
+
+    def clear(self):
+        """Forget all held notes and the generated sequence"""
+        self.count = 0
+        self.expanded_length = 0
+        self.octaves = 0
+        self.length = 0
+
+    # -------------------------------------------------------------------------
+    # Expansion and pattern index maps
+    # -------------------------------------------------------------------------
+
+    def _expand(self, octaves):
+        """Expand sorted notes across octaves in place (clipped at note 127)
+
+        Args:
+            octaves: Number of octaves to span (0-4)
+        """
+        octaves = min(octaves, MAX_OCTAVES)
+        notes = self.notes
+        out_notes = self.expanded_notes
+        starts = self.octave_starts
+
+        e = 0
+        octave = 0
+        while octave < octaves:
+            starts[octave] = e
+            offset = octave * 12
+            # Notes are sorted, so the octave ends at the first note past 127
+            end = self._search(128 - offset)
+            self.expanded_velocities_view[e:e + end] = self.velocities_view[0:end]
+            i = 0
+            while i < end:
+                out_notes[e] = notes[i] + offset
+                e += 1
+                i += 1
+            octave += 1
+        starts[octaves] = e
+
+        self.octaves = octaves
+        self.expanded_length = e
+
+    def build(self, pattern, octaves, strum_octaves=1, strum_direction=0):
+        """Rebuild the expanded notes and the pattern index map in place
+
+        Args:
+            pattern: Settings.ARP_* pattern id
+            octaves: Octave range for regular patterns (0-4)
+            strum_octaves: Octave range for the Strum pattern (1-4)
+            strum_direction: Settings.STRUM_* direction for the Strum pattern
+        """
+        if self.count == 0:
+            self.expanded_length = 0
+            self.length = 0
+            return
+
+        if pattern == Settings.ARP_STRUM:
+            # Strum expands across strum_octaves (not main octave_range)
+            self._expand(strum_octaves)
+            if strum_direction == Settings.STRUM_DOWN:
+                pattern = Settings.ARP_DOWN
+            elif strum_direction == Settings.STRUM_UP_DOWN:
+                pattern = Settings.ARP_UP_DOWN
+            else:
+                pattern = Settings.ARP_UP
+        else:
+            self._expand(octaves)
+
+        # Tables assume every octave is complete (nothing clipped at 127)
+        if self.use_cache and self.octaves and \
+                self.expanded_length == self.count * self.octaves:
+            self._gather(self.compiler.lookup(pattern, self.count, self.octaves),
+                         pattern == Settings.ARP_AS_PLAYED)
+        elif pattern == Settings.ARP_AS_PLAYED:
+            self.length = self._fill_as_played()
+        elif pattern == Settings.ARP_OCTAVE_UP:
+            self.length = self._fill_octave_up()
+        else:
+            self.length = fill_index_map(pattern, self.expanded_length, self.steps)
+
+    def _gather(self, table, as_played):
+        """Copy a compiled table into the step map
+
+        Args:
+            table: Compiled grid index table
+            as_played: True if table slots are play-order positions
+        """
+        n = len(table)
+        if not as_played:
+            # Grid indices are expanded indices when nothing is clipped
+            self.steps_view[0:n] = table
+        else:
+            steps = self.steps
+            count = self.count
+            i = 0
+            while i < n:
+                slot = table[i] % count
+                steps[i] = table[i] - slot + self.index_of(self.order[slot])
+                i += 1
+        self.length = n
+
+    def _fill_as_played(self):
+        """As Played: each note in play order, repeated across octaves
+
+        Returns:
+            Number of steps written
+        """
+        steps = self.steps
+        starts = self.octave_starts
+        n = 0
+        j = 0
+        while j < self.count:
+            rank = self.index_of(self.order[j])
+            octave = 0
+            while octave < self.octaves:
+                # Skip octaves where this note was clipped at 127
+                if starts[octave] + rank < starts[octave + 1]:
+                    steps[n] = starts[octave] + rank
+                    n += 1
+                octave += 1
+            j += 1
+        return n
+
+    def _fill_octave_up(self):
+        """Octave Up: root note in each octave
+
+        Returns:
+            Number of steps written
+        """
+        steps = self.steps
+        starts = self.octave_starts
+        n = 0
+        octave = 0
+        while octave < self.octaves:
+            if starts[octave] < starts[octave + 1]:
+                steps[n] = starts[octave]
+                n += 1
+            octave += 1
+        return n
+
+
+def fill_index_map(pattern, length, out):
+    """Write a pattern's step order as indices into `length` expanded notes
+
+    Covers every pattern whose order depends only on the expanded length
+    (As Played and Octave Up need the held-note layout, see SequenceEngine).
+
+    Args:
+        pattern: Settings.ARP_* pattern id
+        length: Number of expanded notes
+        out: Writable buffer for the step indices (at least 3 * length)
+
+    Returns:
+        Number of steps written
+    """
+    n = 0
+    last = length - 1
+
+    if pattern == Settings.ARP_DOWN or (
+            length <= 1 and pattern in (Settings.ARP_DOWN_UP, Settings.ARP_DOWN_UP_INC)):
+        i = last
+        while i >= 0:
+            out[n] = i
+            n += 1
+            i -= 1
+
+    elif pattern == Settings.ARP_UP_DOWN and length > 1:
+        # Up then down, don't repeat top/bottom notes
+        i = 0
+        while i < length:
+            out[n] = i
+            n += 1
+            i += 1
+        i = last - 1
+        while i > 0:
+            out[n] = i
+            n += 1
+            i -= 1
+
+    elif pattern == Settings.ARP_DOWN_UP and length > 1:
+        # Down then up, don't repeat top/bottom notes
+        i = last
+        while i >= 0:
+            out[n] = i
+            n += 1
+            i -= 1
+        i = 1
+        while i < last:
+            out[n] = i
+            n += 1
+            i += 1
+
+    elif pattern == Settings.ARP_UP_DOWN_INC and length > 1:
+        # Up then down, repeat top note
+        i = 0
+        while i < length:
+            out[n] = i
+            n += 1
+            i += 1
+        i = last
+        while i > 0:
+            out[n] = i
+            n += 1
+            i -= 1
+
+    elif pattern == Settings.ARP_DOWN_UP_INC and length > 1:
+        # Down then up, repeat bottom note
+        i = last
+        while i >= 0:
+            out[n] = i
+            n += 1
+            i -= 1
+        i = 1
+        while i < length:
+            out[n] = i
+            n += 1
+            i += 1
+
+    elif pattern == Settings.ARP_UP_2X:
+        i = 0
+        while i < length:
+            out[n] = i
+            out[n + 1] = i
+            n += 2
+            i += 1
+
+    elif pattern == Settings.ARP_DOWN_2X:
+        i = last
+        while i >= 0:
+            out[n] = i
+            out[n + 1] = i
+            n += 2
+            i -= 1
+
+    elif pattern == Settings.ARP_CONVERGE:
+        # Alternate between lowest and highest, moving inward
+        left = 0
+        right = last
+        while left <= right:
+            out[n] = left
+            n += 1
+            if left < right:
+                out[n] = right
+                n += 1
+            left += 1
+            right -= 1
+
+    elif pattern == Settings.ARP_DIVERGE:
+        # Alternate from middle out
+        if length > 0:
+            middle = length // 2
+            out[n] = middle
+            n += 1
+            i = 1
+            end = max(middle + 1, length - middle)
+            while i < end:
+                if middle - i >= 0:
+                    out[n] = middle - i
+                    n += 1
+                if middle + i < length:
+                    out[n] = middle + i
+                    n += 1
+                i += 1
+
+    elif pattern == Settings.ARP_PINKY_UP and length >= 4:
+        # 1-2-3-highest, repeat
+        i = 0
+        while i < last:
+            out[n] = i
+            n += 1
+            if (i + 1) % 3 == 0:
+                out[n] = last
+                n += 1
+            i += 1
+
+    elif pattern == Settings.ARP_THUMB_UP and length >= 4:
+        # lowest-2-3-4, repeat
+        i = 1
+        while i < length:
+            if i % 3 == 1:
+                out[n] = 0
+                n += 1
+            out[n] = i
+            n += 1
+            i += 1
+
+    elif pattern == Settings.ARP_CHORD_REPEAT:
+        # Simulated chord twice, then arpeggio up
+        repeat = 0
+        while repeat < 3:
+            i = 0
+            while i < length:
+                out[n] = i
+                n += 1
+                i += 1
+            repeat += 1
+
+    else:
+        # Up, Random (randomized per step), and short-chord fallbacks
+        i = 0
+        while i < length:
+            out[n] = i
+            n += 1
+            i += 1
+
+    return n
@@ -1,11 +1,17 @@
 """
 CV Output Handler
 Manages CV pitch output and trigger/gate signals via MCP4728 DAC
+
+With batch_writes=True, channel updates are collected during a loop
+iteration and sent by flush() (called from process()) as one MCP4728
+Fast Write: a single I2C transaction for all 4 channels. Channels update
+in order A-D, so the pitch (A) always lands before the gate edge (B).
 """
 
 import time
 import busio
 import adafruit_mcp4728
+from array import array
 
 
 class CVOutput:
@@ -25,19 +31,35 @@ class CVOutput:
     MIDI_REFERENCE_NOTE = 60  # C3
     CV_REFERENCE_VOLTAGE = 1.0  # 1V at C3
 
+    # Pitch scales (indexed by settings.cv_scale)
+    VOLTS_PER_OCTAVE = (1.0, 1.035)  # Standard 1V/octave, Moog Source 1.035V/octave
+
     # Trigger voltage levels
     TRIGGER_HIGH = 4095  # ~5V (full scale)
     TRIGGER_LOW = 0      # 0V
 
-    def __init__(self, i2c, settings):
+    def __init__(self, i2c, settings, calibration=None, batch_writes=False):
         """
         Initialize CV output handler
 
         Args:
             i2c: I2C bus object
             settings: Global settings object
+            calibration: CVCalibration with measured correction points (optional)
+            batch_writes: Defer DAC writes to flush() (call process() every loop)
         """
         self.settings = settings
+        self.calibration = calibration
+
+        # Last value per channel (A-D) and the pending Fast Write
+        self.batch_writes = batch_writes
+        self.dac_codes = array('H', [0] * 4)
+        self.dac_dirty = False
+        self._fast_write_buf = bytearray(8)  # 2 bytes per channel
+
+        # Shared bus arbiter (see set_arbiter)
+        self.arbiter = None
+        self.bus_id = None
 
         try:
             # Initialize MCP4728 DAC (address 0x60 by default)
@@ -45,11 +67,12 @@ class CVOutput:
 
             # Set all channels to use internal 5V reference
             # This provides stable, accurate CV output
+            # (raw_value is the 12-bit code; value is scaled to 16 bits)
             for channel in [self.dac.channel_a, self.dac.channel_b,
                            self.dac.channel_c, self.dac.channel_d]:
                 channel.vref = adafruit_mcp4728.Vref.INTERNAL
                 channel.gain = 1  # 1x gain for 0-5V output
-                channel.value = 0  # Start at 0V
+                channel.raw_value = 0  # Start at 0V
 
             self.dac_available = True
 
@@ -71,6 +94,158 @@ class CVOutput:
         # Used to implement note priority for monophonic CV output
         self.active_notes = []  # List of (note, velocity) tuples
 
+        # Pitch lookup: MIDI note -> 12-bit DAC code, one table per CV scale
+        # (256 bytes each, so set_pitch_cv() does no float math)
+        self.pitch_tables = None
+        self.pitch_table_scale = None
+        self.pitch_table = None
+        self.build_pitch_tables()
+
+    def set_calibration(self, calibration):
+        """
+        Use new calibration points (rebuilds the pitch tables)
+
+        Args:
+            calibration: CVCalibration, or None for the ideal DAC response
+        """
+        self.calibration = calibration
+        self.build_pitch_tables()
+
+    def build_pitch_tables(self):
+        """Build the pitch table for every CV scale"""
+        self.pitch_tables = [self.build_pitch_table(volts) for volts in self.VOLTS_PER_OCTAVE]
+        self.pitch_table_scale = None
+        self._select_pitch_table()
+
+    def build_pitch_table(self, volts_per_octave):
+        """
+        Build the MIDI note to DAC code table for one CV scale
+
+        Corrected through the calibration points when calibrated.
+
+        Args:
+            volts_per_octave: Pitch scale (1.0 or 1.035)
+
+        Returns:
+            array('H') of 128 DAC values (0-4095)
+        """
+        if self.calibration is not None and self.calibration.calibrated:
+            return self.calibration.build_pitch_table(
+                self.CH_PITCH, volts_per_octave,
+                self.MIDI_REFERENCE_NOTE, self.CV_REFERENCE_VOLTAGE
+            )
+
+        table = array('H', [0] * 128)
+        volts_per_semitone = volts_per_octave / 12.0
+        for note in range(128):
+            voltage = self.CV_REFERENCE_VOLTAGE + ((note - self.MIDI_REFERENCE_NOTE) * volts_per_semitone)
+            voltage = max(0.0, min(self.DAC_VREF, voltage))
+            table[note] = self.voltage_to_dac_value(voltage)
+        return table
+
+    def _select_pitch_table(self):
+        """Point pitch_table at the table for the current CV scale"""
+        scale = self.settings.cv_scale
+        if scale == self.settings.CV_SCALE_STANDARD:
+            self.pitch_table = self.pitch_tables[0]
+        else:
+            self.pitch_table = self.pitch_tables[1]
+        self.pitch_table_scale = scale
+        return self.pitch_table
+
+    def note_to_dac_value(self, midi_note):
+        """
+        Look up the DAC value for a MIDI note on the current CV scale
+
+        Args:
+            midi_note: MIDI note number (0-127)
+
+        Returns:
+            DAC value (0-4095)
+        """
+        table = self.pitch_table
+        if self.settings.cv_scale != self.pitch_table_scale:
+            table = self._select_pitch_table()
+        return table[midi_note]
+
+    def set_arbiter(self, arbiter):
+        """
+        Route DAC traffic through the shared I2C bus arbiter
+
+        The DAC registers as an urgent device: pending batched writes are
+        flushed between display refresh chunks.
+
+        Args:
+            arbiter: BusArbiter shared with the display
+        """
+        self.arbiter = arbiter
+        self.bus_id = arbiter.register("dac", self.flush)
+
+    def write_channel(self, channel, code):
+        """
+        Set a DAC channel (deferred to flush() when batching)
+
+        Args:
+            channel: DAC channel (CH_PITCH, CH_TRIGGER, ...)
+            code: 12-bit DAC value (0-4095)
+        """
+        self.dac_codes[channel] = code
+        if self.batch_writes:
+            self.dac_dirty = True
+        elif self.arbiter is not None:
+            self.arbiter.begin(self.bus_id)
+            self._channel(channel).raw_value = code
+            self.arbiter.end(self.bus_id)
+        else:
+            self._channel(channel).raw_value = code
+
+    def _channel(self, channel):
+        """Get the adafruit_mcp4728 channel object for a channel number"""
+        if channel == self.CH_PITCH:
+            return self.dac.channel_a
+        if channel == self.CH_TRIGGER:
+            return self.dac.channel_b
+        if channel == self.CH_UNUSED_C:
+            return self.dac.channel_c
+        return self.dac.channel_d
+
+    def flush(self):
+        """
+        Send pending channel values as one MCP4728 Fast Write
+
+        Fast Write: 2 bytes per channel in order A-D,
+        [0 0 PD1 PD0 D11 D10 D9 D8] [D7 ... D0] (PD = 00: normal output).
+        vref/gain set at init are kept by the DAC.
+
+        Returns:
+            True if a write was sent
+        """
+        if not self.dac_dirty or not self.dac_available:
+            return False
+        self.dac_dirty = False
+
+        buf = self._fast_write_buf
+        channel = 0
+        while channel < 4:
+            code = self.dac_codes[channel]
+            buf[2 * channel] = (code >> 8) & 0x0F
+            buf[2 * channel + 1] = code & 0xFF
+            channel += 1
+
+        arbiter = self.arbiter
+        if arbiter is not None:
+            arbiter.begin(self.bus_id)
+        try:
+            with self.dac.i2c_device as device:
+                device.write(buf)
+
+        except Exception as e:
+            print(f"Error writing DAC: {e}")
+
+        if arbiter is not None:
+            arbiter.end(self.bus_id)
+        return True
+
     def note_to_voltage(self, midi_note):
         """
         Convert MIDI note number to CV voltage
@@ -86,9 +261,9 @@ class CVOutput:
 
         # Get voltage per octave based on settings
         if self.settings.cv_scale == self.settings.CV_SCALE_STANDARD:
-            volts_per_octave = 1.0  # Standard 1V/octave
+            volts_per_octave = self.VOLTS_PER_OCTAVE[0]  # Standard 1V/octave
         else:
-            volts_per_octave = 1.035  # Moog Source 1.035V/octave
+            volts_per_octave = self.VOLTS_PER_OCTAVE[1]  # Moog Source 1.035V/octave
 
         # Calculate voltage (12 semitones = 1 octave)
         volts_per_semitone = volts_per_octave / 12.0
@@ -196,7 +371,7 @@ class CVOutput:
 
             # Convert to DAC value and output to Channel D
             dac_value = self.voltage_to_dac_value(self.custom_cc_smoothed_value)
-            self.dac.channel_d.value = dac_value
+            self.write_channel(self.CH_CUSTOM_CC, dac_value)
 
         except Exception as e:
             print(f"Error setting custom CC voltage: {e}")
@@ -212,9 +387,7 @@ class CVOutput:
             return
 
         try:
-            voltage = self.note_to_voltage(midi_note)
-            dac_value = self.voltage_to_dac_value(voltage)
-            self.dac.channel_a.value = dac_value
+            self.write_channel(self.CH_PITCH, self.note_to_dac_value(midi_note))
             self.current_note = midi_note
 
         except Exception as e:
@@ -234,7 +407,7 @@ class CVOutput:
                 # S-trig: low = active
                 trigger_value = self.TRIGGER_LOW
 
-            self.dac.channel_b.value = trigger_value
+            self.write_channel(self.CH_TRIGGER, trigger_value)
             self.trigger_active = True
 
         except Exception as e:
@@ -254,7 +427,7 @@ class CVOutput:
                 # S-trig: high = inactive
                 trigger_value = self.TRIGGER_HIGH
 
-            self.dac.channel_b.value = trigger_value
+            self.write_channel(self.CH_TRIGGER, trigger_value)
             self.trigger_active = False
 
         except Exception as e:
@@ -377,9 +550,9 @@ class CVOutput:
     def process(self):
         """
         Process CV output (call in main loop)
-        Reserved for future use - gate mode doesn't require timing
+        Sends the channel values batched during this loop iteration
         """
-        pass
+        self.flush()
 
     def reset(self):
         """Reset all CV outputs to 0V"""
@@ -387,7 +560,7 @@ class CVOutput:
             return
 
         try:
-            self.dac.channel_a.value = 0  # Pitch CV to 0V
+            self.write_channel(self.CH_PITCH, 0)  # Pitch CV to 0V
             self.trigger_off()  # Trigger to inactive state
             self.current_note = None
 
@@ -416,11 +589,13 @@ class CVOutput:
         # Send note on
         print(f"\n  Note ON...")
         self.note_on(midi_note)
+        self.flush()
         time.sleep(duration)
 
         # Send note off
         print(f"  Note OFF...")
         self.note_off()
+        self.flush()
 
         return True
 
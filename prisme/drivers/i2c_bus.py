@@ -0,0 +1,128 @@
+"""
+Shared I2C Bus Arbiter
+Schedules traffic on the I2C bus shared by the MCP4728 DAC and the SH1107 OLED
+
+A full OLED redraw holds the bus for ~86ms. With the arbiter, the display
+refreshes one text line (1-2 SH1107 pages) at a time and yields the bus
+between chunks: time-critical work (clock processing) runs, and any
+pending DAC write goes out before the next chunk. CV lands at most one
+chunk late instead of one full redraw late.
+
+Usage:
+    bus = BusArbiter()
+    bus.set_service(clock.process_clock_messages)
+    cv_output.set_arbiter(bus)   # Urgent device: flushed between chunks
+    display.set_arbiter(bus)     # Chunked refreshes via display.refresh()
+"""
+
+import time
+from array import array
+
+# Devices sharing the bus (DAC, display, spare)
+MAX_DEVICES = 4
+
+
+class BusArbiter:
+    """Prioritises DAC writes over chunked display refreshes and records bus time"""
+
+    def __init__(self):
+        """Initialize with no devices registered"""
+        self.names = []
+        self.flushes = []  # Per device: flush() for urgent devices, else None
+
+        # Per-device bus time statistics
+        # (total is a list: long runs overflow 32 bits)
+        self.transactions = array('L', [0] * MAX_DEVICES)
+        self.total_us = [0] * MAX_DEVICES
+        self.max_us = array('L', [0] * MAX_DEVICES)
+
+        # Urgent writes that went out between display chunks
+        self.preemptions = 0
+
+        # Time-critical work to run between display chunks
+        self.service = None
+
+        # Transaction in progress
+        self._start_ns = 0
+
+    def register(self, name, flush=None):
+        """
+        Register a device on the bus
+
+        Args:
+            name: Device name for stats (e.g. "dac", "display")
+            flush: For urgent devices: function that sends pending writes
+                   and returns True if it used the bus
+
+        Returns:
+            Device id for begin()/end(), or None if MAX_DEVICES are registered
+        """
+        if len(self.names) >= MAX_DEVICES:
+            print(f"I2C device limit reached ({MAX_DEVICES})")
+            return None
+        self.names.append(name)
+        self.flushes.append(flush)
+        return len(self.names) - 1
+
+    def set_service(self, callback):
+        """
+        Set the time-critical work run between display chunks
+
+        Args:
+            callback: Function with no arguments (e.g. clock processing)
+        """
+        self.service = callback
+
+    def begin(self, device):
+        """Mark the start of a bus transaction"""
+        self._start_ns = time.monotonic_ns()
+
+    def end(self, device):
+        """
+        Mark the end of a bus transaction and record its duration
+
+        Args:
+            device: Device id from register()
+        """
+        elapsed_us = (time.monotonic_ns() - self._start_ns) // 1000
+        self.transactions[device] += 1
+        self.total_us[device] += elapsed_us
+        if elapsed_us > self.max_us[device]:
+            self.max_us[device] = elapsed_us
+
+    def yield_bus(self):
+        """
+        Let time-critical work use the bus (call between display chunks)
+
+        Runs the service callback, then flushes every urgent device.
+        """
+        if self.service is not None:
+            self.service()
+        for flush in self.flushes:
+            if flush is not None and flush():
+                self.preemptions += 1
+
+    def get_stats(self):
+        """
+        Get bus time statistics (for debugging)
+
+        Returns:
+            dict: per device name: transactions, total_us, max_us;
+                  plus 'preemptions'
+        """
+        stats = {'preemptions': self.preemptions}
+        for device in range(len(self.names)):
+            stats[self.names[device]] = {
+                'transactions': self.transactions[device],
+                'total_us': self.total_us[device],
+                'max_us': self.max_us[device],
+            }
+        return stats
+
+    def reset_stats(self):
+        """Clear bus time statistics"""
+        for device in range(MAX_DEVICES):
+            self.transactions[device] = 0
+            self.total_us[device] = 0
+            self.max_us[device] = 0
+        self.preemptions = 0
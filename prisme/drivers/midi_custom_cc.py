@@ -9,6 +9,9 @@ from adafruit_midi.pitch_bend import PitchBend
 from adafruit_midi.channel_pressure import ChannelPressure
 from adafruit_midi.note_on import NoteOn
 from adafruit_midi.note_off import NoteOff
+from prisme.core.midi_parser import (
+    NOTE_ON, NOTE_OFF, CONTROL_CHANGE, CHANNEL_PRESSURE, PITCH_BEND
+)
 
 
 class CustomCCHandler:
@@ -60,11 +63,7 @@ class CustomCCHandler:
         for msg in messages:
             # Handle Learn Mode (only for CC messages)
             if self.learn_mode_active and isinstance(msg, ControlChange):
-                # Capture CC number and exit learn mode
-                self.settings.custom_cc_number = msg.control
-                self.settings.custom_cc_source = self.settings.CC_SOURCE_CC
-                self.settings.save()  # Auto-save
-                self.exit_learn_mode(captured_cc=msg.control)
+                self._learn(msg.control)
                 # Fall through to process the message
 
             # Route message based on source type
@@ -80,60 +79,109 @@ class CustomCCHandler:
             elif self.settings.custom_cc_source == self.settings.CC_SOURCE_VELOCITY:
                 self._process_velocity(msg)
 
+    def process_event(self, event):
+        """
+        Process one parsed MIDI event (batched input path)
+
+        Args:
+            event: MidiEvent from prisme.core.midi_parser
+        """
+        source = self.settings.custom_cc_source
+        if source == self.settings.CC_SOURCE_DISABLED:
+            return
+
+        kind = event.type
+        if kind == CONTROL_CHANGE:
+            if self.learn_mode_active:
+                self._learn(event.data1)
+                source = self.settings.custom_cc_source
+            if source == self.settings.CC_SOURCE_CC:
+                self._apply_cc(event.data1, event.data2)
+
+        elif kind == CHANNEL_PRESSURE:
+            if source == self.settings.CC_SOURCE_AFTERTOUCH:
+                self._apply_aftertouch(event.data1)
+
+        elif kind == PITCH_BEND:
+            if source == self.settings.CC_SOURCE_PITCHBEND:
+                self._apply_pitch_bend(event.pitch_bend)
+
+        elif kind == NOTE_ON or kind == NOTE_OFF:
+            if source == self.settings.CC_SOURCE_VELOCITY:
+                self._apply_velocity(event.data2 if kind == NOTE_ON else 0)
+
+    def _learn(self, control):
+        """Capture a CC number and exit learn mode"""
+        self.settings.custom_cc_number = control
+        self.settings.custom_cc_source = self.settings.CC_SOURCE_CC
+        self.settings.save()  # Auto-save
+        self.exit_learn_mode(captured_cc=control)
+
     def _process_cc(self, msg):
         """Process Control Change messages"""
         if isinstance(msg, ControlChange):
-            # Only process the CC number we're listening to
-            if msg.control == self.settings.custom_cc_number:
-                voltage = self.cv_output.cc_to_voltage(msg.value)
-                self.cv_output.set_custom_cc_voltage(voltage)
-
-                # Update display tracking
-                self.last_message_type = "CC"
-                self.last_message_value = msg.value
-                self.last_cc_number = msg.control
+            self._apply_cc(msg.control, msg.value)
 
     def _process_aftertouch(self, msg):
         """Process Channel Pressure (Aftertouch) messages"""
         if isinstance(msg, ChannelPressure):
-            voltage = self.cv_output.aftertouch_to_voltage(msg.pressure)
-            self.cv_output.set_custom_cc_voltage(voltage)
-
-            # Update display tracking
-            self.last_message_type = "AT"  # Aftertouch
-            self.last_message_value = msg.pressure
-            self.last_cc_number = None
+            self._apply_aftertouch(msg.pressure)
 
     def _process_pitch_bend(self, msg):
         """Process Pitch Bend messages"""
         if isinstance(msg, PitchBend):
-            voltage = self.cv_output.pitch_bend_to_voltage(msg.pitch_bend)
-            self.cv_output.set_custom_cc_voltage(voltage)
-
-            # Update display tracking
-            self.last_message_type = "PB"  # Pitch Bend
-            self.last_message_value = msg.pitch_bend
-            self.last_cc_number = None
+            self._apply_pitch_bend(msg.pitch_bend)
 
     def _process_velocity(self, msg):
         """Process Note Velocity messages (NoteOn only)"""
-        if isinstance(msg, NoteOn) and msg.velocity > 0:
-            voltage = self.cv_output.velocity_to_voltage(msg.velocity)
+        if isinstance(msg, NoteOn):
+            self._apply_velocity(msg.velocity)
+        elif isinstance(msg, NoteOff):
+            self._apply_velocity(0)
+
+    def _apply_cc(self, control, value):
+        """Output a CC value if it's the CC number we're listening to"""
+        if control == self.settings.custom_cc_number:
+            voltage = self.cv_output.cc_to_voltage(value)
             self.cv_output.set_custom_cc_voltage(voltage)
 
             # Update display tracking
-            self.last_message_type = "VEL"
-            self.last_message_value = msg.velocity
-            self.last_cc_number = None
+            self.last_message_type = "CC"
+            self.last_message_value = value
+            self.last_cc_number = control
+
+    def _apply_aftertouch(self, pressure):
+        """Output a Channel Pressure (Aftertouch) value"""
+        voltage = self.cv_output.aftertouch_to_voltage(pressure)
+        self.cv_output.set_custom_cc_voltage(voltage)
+
+        # Update display tracking
+        self.last_message_type = "AT"  # Aftertouch
+        self.last_message_value = pressure
+        self.last_cc_number = None
 
-        elif isinstance(msg, NoteOff) or (isinstance(msg, NoteOn) and msg.velocity == 0):
-            # Note off - reset to 0V
-            self.cv_output.set_custom_cc_voltage(0.0)
+    def _apply_pitch_bend(self, pitch_bend):
+        """Output a Pitch Bend value (0-16383)"""
+        voltage = self.cv_output.pitch_bend_to_voltage(pitch_bend)
+        self.cv_output.set_custom_cc_voltage(voltage)
 
-            # Update display tracking
-            self.last_message_type = "VEL"
-            self.last_message_value = 0
-            self.last_cc_number = None
+        # Update display tracking
+        self.last_message_type = "PB"  # Pitch Bend
+        self.last_message_value = pitch_bend
+        self.last_cc_number = None
+
+    def _apply_velocity(self, velocity):
+        """Output a note velocity (0 = note off, resets to 0V)"""
+        if velocity > 0:
+            voltage = self.cv_output.velocity_to_voltage(velocity)
+        else:
+            voltage = 0.0
+        self.cv_output.set_custom_cc_voltage(voltage)
+
+        # Update display tracking
+        self.last_message_type = "VEL"
+        self.last_message_value = velocity
+        self.last_cc_number = None
 
     def get_last_midi_display(self):
         """
@@ -31,6 +31,14 @@ class MidiIO:
             out_channel=0  # Default channel, can be changed per message
         )
 
+        # Raw output port and preallocated message buffers for the
+        # zero-alloc send path (mutated in place, never reallocated)
+        self.uart_out = uart_out
+        self._note_on_msg = bytearray(3)
+        self._note_off_msg = bytearray(3)
+        self._event_msg = bytearray(3)
+        self._event_view = memoryview(self._event_msg)
+
         # Track currently held notes (for passthrough when arp is off)
         self.held_notes = set()
 
@@ -94,6 +102,54 @@ class MidiIO:
         self.midi_out.send(NoteOff(note, 0), channel=channel)
         self.has_sent_midi = True  # Flag that we sent MIDI
 
+    def write_note_on(self, note, velocity, channel=0):
+        """
+        Send a Note On message without allocating
+
+        Writes a preallocated 3-byte buffer straight to the output port
+        instead of building a NoteOn object (for the arp step hot path).
+
+        Args:
+            note: MIDI note number (0-127)
+            velocity: Note velocity (0-127)
+            channel: MIDI channel (0-15)
+        """
+        msg = self._note_on_msg
+        msg[0] = 0x90 | channel
+        msg[1] = note
+        msg[2] = velocity
+        self.uart_out.write(msg)
+        self.has_sent_midi = True  # Flag that we sent MIDI
+
+    def write_note_off(self, note, channel=0):
+        """
+        Send a Note Off message without allocating
+
+        Args:
+            note: MIDI note number (0-127)
+            channel: MIDI channel (0-15)
+        """
+        msg = self._note_off_msg
+        msg[0] = 0x80 | channel
+        msg[1] = note
+        msg[2] = 0
+        self.uart_out.write(msg)
+        self.has_sent_midi = True  # Flag that we sent MIDI
+
+    def write_event(self, event):
+        """
+        Forward a parsed MIDI event as raw bytes (pass-through)
+
+        Args:
+            event: MidiEvent from prisme.core.midi_parser
+        """
+        msg = self._event_msg
+        msg[0] = event.status
+        msg[1] = event.data1
+        msg[2] = event.data2
+        self.uart_out.write(self._event_view[:event.length])
+        self.has_sent_midi = True  # Flag that we sent MIDI
+
     def send_cc(self, control, value, channel=0):
         """
         Send a Control Change message
@@ -0,0 +1,110 @@
+"""
+Button B Demo Player
+Plays the demo arpeggio from the main loop instead of blocking it
+
+The demo used to sleep between notes (0.5-2 s with no MIDI input, clock
+or CV processing). DemoPlayer keeps the demo as a timed state: start it
+on the button press, then call process() every loop iteration.
+
+Usage:
+    demo = DemoPlayer()
+    demo.play([60, 64, 67], note_on, note_off, time.monotonic())
+    ...
+    demo.process(current_time)  # Every loop iteration
+"""
+
+
+class DemoPlayer:
+    """Timed demo: a note sequence, or a callback after a hold time"""
+
+    NOTE_TIME = 0.12  # Seconds each demo note sounds
+    GAP_TIME = 0.005  # Seconds between demo notes
+
+    def __init__(self):
+        """Initialize idle"""
+        self.notes = ()
+        self.index = 0
+        self.note_on = None
+        self.note_off = None
+        self.sounding = False  # notes[index] is on
+        self.next_time = 0.0  # Time of the next note on/off or the hold end
+        self.on_end = None  # Hold: called when the time is up
+        self.active = False
+
+    def play(self, notes, note_on, note_off, now):
+        """
+        Start playing a note sequence (stops a running demo first)
+
+        Args:
+            notes: MIDI note numbers, played in order
+            note_on: Function(note) that starts a note
+            note_off: Function(note) that ends it
+            now: Current time (time.monotonic())
+        """
+        self.stop()
+        self.notes = notes
+        self.index = 0
+        self.note_on = note_on
+        self.note_off = note_off
+        self.next_time = now
+        self.active = len(notes) > 0
+
+    def hold(self, duration, on_end, now):
+        """
+        Call on_end after duration seconds (e.g. let the arpeggiator play)
+
+        Args:
+            duration: Seconds until on_end is called
+            on_end: Function with no arguments
+            now: Current time (time.monotonic())
+        """
+        self.stop()
+        self.on_end = on_end
+        self.next_time = now + duration
+        self.active = True
+
+    def process(self, now):
+        """
+        Advance the demo (call every main loop iteration)
+
+        Args:
+            now: Current time (time.monotonic())
+        """
+        if not self.active or now < self.next_time:
+            return
+
+        if self.on_end is not None:
+            on_end = self.on_end
+            self.on_end = None
+            self.active = False
+            on_end()
+            return
+
+        note = self.notes[self.index]
+        if not self.sounding:
+            self.note_on(note)
+            self.sounding = True
+            self.next_time = now + self.NOTE_TIME
+            return
+
+        self.note_off(note)
+        self.sounding = False
+        self.index += 1
+        self.next_time = now + self.GAP_TIME
+        if self.index >= len(self.notes):
+            self.active = False
+
+    def stop(self):
+        """Stop the demo now (ends a sounding note, runs a pending hold callback)"""
+        if self.sounding:
+            self.note_off(self.notes[self.index])
+            self.sounding = False
+        if self.on_end is not None:
+            on_end = self.on_end
+            self.on_end = None
+            on_end()
+        self.active = False
+
+    def is_active(self):
+        """True while the demo is playing"""
+        return self.active
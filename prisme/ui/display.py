@@ -13,23 +13,198 @@ IMPORTANT: OLED FeatherWing 128x64 (Product #4650) uses SH1107 driver, NOT SSD13
 The older 128x32 FeatherWing uses SSD1306, but the 128x64 uses a different chip.
 """
 
+import time
 import displayio
 import terminalio
 import i2cdisplaybus  # New in CircuitPython 10.x
 from adafruit_display_text import label
 import adafruit_displayio_sh1107
+from prisme.ui.glyph_cache import GlyphCache, DEFAULT_BUDGET_BYTES
+
+
+class FrameGovernor:
+    """Adapts the display frame rate to clock and MIDI input load
+
+    Fast arp steps or a busy MIDI input lower the frame rate; a stopped
+    clock raises it, and menus always get the fast rate. Each refresh
+    chunk only goes out if it should finish within LATENESS_BUDGET_NS of
+    the next step (judged from the slowest recent chunk), so display
+    traffic doesn't make steps late. A frame deferred for MAX_DEFER_NS is
+    sent anyway, so the screen never freezes when steps are closer
+    together than one chunk.
+    """
+
+    MENU_INTERVAL_NS = 40000000      # 25 fps: menus stay responsive
+    IDLE_INTERVAL_NS = 50000000      # 20 fps with the clock stopped
+    RUNNING_INTERVAL_NS = 100000000  # 10 fps while the arp runs
+    BUSY_INTERVAL_NS = 250000000     # 4 fps for fast steps or busy input
+
+    FAST_STEP_NS = 100000000  # Steps closer than this count as busy (16ths > 150 BPM)
+    BUSY_INPUT_BYTES = 32     # Bytes per read (half the read buffer) = busy input
+
+    LATENESS_BUDGET_NS = 1000000   # Worst-case step lateness a chunk may cause
+    MAX_DEFER_NS = 1000000000      # Send a frame anyway after this long
+    CHUNK_ESTIMATE_NS = 20000000   # Chunk cost until one has been measured
+
+    def __init__(self, clock=None, input_router=None):
+        """
+        Initialize governor
+
+        Args:
+            clock: ClockHandler (step rate and next step time), or None
+            input_router: InputRouter (bytes per read), or None
+        """
+        self.clock = clock
+        self.input_router = input_router
+
+        self.interval_ns = self.IDLE_INTERVAL_NS
+        self.chunk_ns = self.CHUNK_ESTIMATE_NS  # Slowest recent chunk (decays)
+        self.last_frame_ns = None
+
+        # Chunks held back for a step or busy input, frames sent after MAX_DEFER_NS
+        self.deferred = 0
+        self.forced = 0
+
+    def input_busy(self):
+        """True if the last MIDI read found a burst of input"""
+        router = self.input_router
+        return router is not None and router.rx_length >= self.BUSY_INPUT_BYTES
+
+    def update(self, menu_active):
+        """
+        Pick the frame interval for the current load
+
+        Args:
+            menu_active: True if a menu is shown
+
+        Returns:
+            Frame interval in nanoseconds
+        """
+        if menu_active:
+            interval = self.MENU_INTERVAL_NS
+        elif self.input_busy():
+            interval = self.BUSY_INTERVAL_NS
+        else:
+            step_ns = None
+            if self.clock is not None:
+                step_ns = self.clock.get_step_interval_ns()
+            if step_ns is None:
+                interval = self.IDLE_INTERVAL_NS
+            elif step_ns < self.FAST_STEP_NS:
+                interval = self.BUSY_INTERVAL_NS
+            else:
+                interval = self.RUNNING_INTERVAL_NS
+        self.interval_ns = interval
+        return interval
+
+    def frame_due(self, now):
+        """True if a frame interval has passed since the last frame"""
+        return self.last_frame_ns is None or now - self.last_frame_ns >= self.interval_ns
+
+    def chunk_fits(self, now):
+        """
+        Check whether a refresh chunk can go out now
+
+        Args:
+            now: Current time (time.monotonic_ns())
+
+        Returns:
+            True if the chunk should be sent
+        """
+        if self.last_frame_ns is not None and now - self.last_frame_ns >= self.MAX_DEFER_NS:
+            self.forced += 1
+            return True
+
+        if self.input_busy():
+            self.deferred += 1
+            return False
+
+        next_step = None
+        if self.clock is not None:
+            next_step = self.clock.get_next_step_ns()
+        if next_step is None or self.chunk_ns <= next_step - now + self.LATENESS_BUDGET_NS:
+            return True
+
+        self.deferred += 1
+        return False
+
+    def record_chunk(self, elapsed_ns):
+        """
+        Record how long a refresh chunk held the bus
+
+        Args:
+            elapsed_ns: Chunk duration in nanoseconds
+        """
+        if elapsed_ns > self.chunk_ns:
+            self.chunk_ns = elapsed_ns
+        else:
+            self.chunk_ns -= (self.chunk_ns - elapsed_ns) >> 3
+
+    def frame_done(self, now):
+        """Mark a frame as fully sent"""
+        self.last_frame_ns = now
 
 
 class Display:
     """Handles OLED display and UI rendering"""
 
-    def __init__(self, i2c, settings):
+    # Periodic screen update interval without a FrameGovernor
+    FRAME_INTERVAL_NS = 100000000
+
+    # Short names for the compact translation display (class-level, not
+    # rebuilt on every update)
+    PATTERN_SHORT_NAMES = {
+        0: "Up",
+        1: "Dn",
+        2: "UpDn",
+        3: "DnUp",
+        4: "Rnd",
+        5: "Play",
+        6: "UpI",   # Up-Down Inclusive
+        7: "DnI",   # Down-Up Inclusive
+        8: "Up2",   # Up 2x
+        9: "Dn2",   # Down 2x
+        10: "Conv", # Converge
+        11: "Div",  # Diverge
+        12: "Pnky", # Pinky Up
+        13: "Thmb", # Thumb Up
+        14: "Oct",  # Octave Up
+        15: "Chrd"  # Chord Repeat
+    }
+
+    SCALE_SHORT_NAMES = {
+        0: "Chr",   # Chromatic
+        1: "Maj",   # Major
+        2: "Min",   # Minor
+        3: "Dor",   # Dorian
+        4: "Phr",   # Phrygian
+        5: "Lyd",   # Lydian
+        6: "Mix",   # Mixolydian
+        7: "Aeo",   # Aeolian
+        8: "Loc",   # Locrian
+        9: "Blu",   # Blues
+        10: "Pnt",  # Pentatonic Major
+        11: "PnM"   # Pentatonic Minor
+    }
+
+    CLOCK_RATE_SHORT_NAMES = {
+        0: "/8",   # CLOCK_RATE_DIV_8
+        1: "/4",   # CLOCK_RATE_DIV_4
+        2: "/2",   # CLOCK_RATE_DIV_2
+        3: "",     # CLOCK_RATE_1X (no display)
+        4: "x2",   # CLOCK_RATE_2X
+        5: "x4",   # CLOCK_RATE_4X
+        6: "x8",   # CLOCK_RATE_8X
+    }
+
+    def __init__(self, i2c, settings, manual_refresh=False):
         """
         Initialize the OLED display
 
         Args:
             i2c: I2C bus object
             settings: Settings object for display rotation preference
+            manual_refresh: Stage label changes until refresh() (auto refresh off)
         """
         # Release any existing displays
         displayio.release_displays()
@@ -135,6 +310,9 @@ class Display:
         self.status_message = None
         self.status_end_time = None
 
+        # Screen held (e.g. startup splash): periodic updates wait until then
+        self.hold_end_time = None
+
         # MIDI activity indicators
         self.midi_in_active = False
         self.midi_out_active = False
@@ -142,6 +320,289 @@ class Display:
         # Brightness control
         self.brightness_level = 0.5  # Default brightness (0.0-1.0)
 
+        # Render cache: last text per label (shown or staged), so unchanged
+        # labels are skipped instead of rebuilding their glyphs
+        # Labels in screen order, and the refresh chunk (text row) of each
+        self._labels = [self.midi_in_label, self.midi_out_label,
+                        self.line1_label, self.line2_label, self.line3_label]
+        self._label_chunk = [0, 0, 1, 2, 3]
+        self._shown_text = [text_label.text for text_label in self._labels]
+        self._pending_text = [None] * len(self._labels)
+        self._pending_count = 0
+
+        # Fixed strings shown from the glyph cache (see enable_glyph_cache):
+        # per label, its bitmap row (None = none) and whether the shown or
+        # staged text comes from the cache
+        self.glyph_cache = None
+        self._tiles = [None] * len(self._labels)
+        self._shown_fixed = [False] * len(self._labels)
+        self._pending_fixed = [False] * len(self._labels)
+
+        # Render stats: frames sent, label updates skipped as unchanged
+        self.frames = 0
+        self.skipped = 0
+
+        # Inputs of the last translation display (skip rebuilding its strings)
+        self._translation_revision = None
+        self._translation_clock_running = None
+        self._translation_text = [None, None, None]
+
+        # Manual refresh: changes are staged and sent by refresh()
+        # (one display refresh per frame instead of one per label change)
+        self.manual_refresh = manual_refresh
+        if manual_refresh:
+            self.display.auto_refresh = False
+
+        # Chunked refresh through the shared I2C bus arbiter (see set_arbiter)
+        self.arbiter = None
+        self.bus_id = None
+
+        # Load-adaptive frame rate (see set_governor)
+        self.governor = None
+        self._last_update_ns = None
+
+    def set_arbiter(self, arbiter):
+        """
+        Refresh through the shared I2C bus arbiter
+
+        Turns off auto refresh: text changes are staged and sent by
+        refresh(), one text row (1-2 SH1107 pages) per transaction, with
+        the bus yielded to the DAC between rows.
+
+        Args:
+            arbiter: BusArbiter shared with the CV output
+        """
+        self.arbiter = arbiter
+        self.bus_id = arbiter.register("display")
+        self.manual_refresh = True
+        self.display.auto_refresh = False
+
+    def set_governor(self, governor):
+        """
+        Pace frames with a FrameGovernor
+
+        Turns off auto refresh: text changes are staged and sent by
+        refresh() at the governor's frame rate, in chunks that don't delay
+        the next step.
+
+        Args:
+            governor: FrameGovernor reading the clock and MIDI input load
+        """
+        self.governor = governor
+        self.manual_refresh = True
+        self.display.auto_refresh = False
+
+    def enable_glyph_cache(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        """
+        Show menu and selection rows from pre-rendered bitmaps
+
+        Adds a hidden bitmap row over each text line. Fixed strings are
+        rendered once by a GlyphCache and shown by swapping the row's
+        bitmap, skipping the Label's text layout.
+
+        Args:
+            budget_bytes: Maximum bytes of cached row bitmaps
+        """
+        cache = GlyphCache(terminalio.FONT, budget_bytes=budget_bytes)
+        palette = displayio.Palette(2)
+        palette[0] = 0x000000
+        palette[1] = 0xFFFFFF
+        palette.make_transparent(0)
+
+        blank = cache.get("")
+        for i in range(len(self._labels)):
+            if self._label_chunk[i] == 0:
+                continue  # MIDI indicators: single characters, not worth a row
+            text_label = self._labels[i]
+            # Labels are centred vertically on their y
+            tile = displayio.TileGrid(blank, pixel_shader=palette,
+                                      x=text_label.x, y=text_label.y - cache.height // 2)
+            tile.hidden = True
+            self.group.append(tile)
+            self._tiles[i] = tile
+        self.glyph_cache = cache
+
+    def _menu_shown(self):
+        """True if a menu or selection screen is shown"""
+        return self.settings_menu_mode or self.selection_mode or self.clock_source_selection_mode
+
+    def frame_due(self):
+        """
+        Check whether the periodic screen update should run
+
+        Once per governor frame interval (FRAME_INTERVAL_NS without a
+        governor). Call from the main loop instead of a fixed interval.
+
+        Returns:
+            True if due (the next one is then one interval away)
+        """
+        now = time.monotonic_ns()
+        if self.governor is not None:
+            interval = self.governor.update(self._menu_shown())
+        else:
+            interval = self.FRAME_INTERVAL_NS
+        if self._last_update_ns is not None and now - self._last_update_ns < interval:
+            return False
+        self._last_update_ns = now
+        return True
+
+    def _set_text(self, text_label, text, fixed=False):
+        """Set a label's text (skipped if unchanged, staged in manual refresh mode)
+
+        Args:
+            text_label: Label to update
+            text: New text
+            fixed: True for strings from a small fixed set (menu rows,
+                   names): shown from the glyph cache when enabled
+        """
+        for i in range(len(self._labels)):
+            if self._labels[i] is text_label:
+                fixed = fixed and self._tiles[i] is not None
+                current = self._pending_text[i]
+                current_fixed = self._pending_fixed[i]
+                if current is None:
+                    current = self._shown_text[i]
+                    current_fixed = self._shown_fixed[i]
+                if current == text and current_fixed == fixed:
+                    self.skipped += 1
+                    return
+
+                if not self.manual_refresh:
+                    self._show(i, text, fixed)
+                    return
+
+                if self._pending_text[i] is None:
+                    self._pending_count += 1
+                self._pending_text[i] = text
+                self._pending_fixed[i] = fixed
+                return
+
+    def _show(self, i, text, fixed):
+        """Put a text into a label, or its cached bitmap into the label's row"""
+        text_label = self._labels[i]
+        tile = self._tiles[i]
+        if fixed:
+            if self._shown_text[i] and not self._shown_fixed[i]:
+                text_label.text = ""
+            tile.bitmap = self.glyph_cache.get(text)
+            tile.hidden = False
+        else:
+            if tile is not None:
+                tile.hidden = True
+            text_label.text = text
+        self._shown_text[i] = text
+        self._shown_fixed[i] = fixed
+
+    def _text(self, text_label):
+        """Get a label's text, including a staged change"""
+        for i in range(len(self._labels)):
+            if self._labels[i] is text_label:
+                if self._pending_text[i] is not None:
+                    return self._pending_text[i]
+                return self._shown_text[i]
+        return text_label.text
+
+    def _apply_pending(self, chunk):
+        """Move staged texts into the labels (one chunk, or all for -1)
+
+        Returns:
+            True if any label changed
+        """
+        changed = False
+        for i in range(len(self._labels)):
+            text = self._pending_text[i]
+            if text is not None and (chunk < 0 or self._label_chunk[i] == chunk):
+                self._show(i, text, self._pending_fixed[i])
+                self._pending_text[i] = None
+                changed = True
+        return changed
+
+    def _chunk_pending(self, chunk):
+        """True if a text row (or any row, for -1) has a staged change"""
+        for i in range(len(self._labels)):
+            if self._pending_text[i] is not None and (chunk < 0 or self._label_chunk[i] == chunk):
+                return True
+        return False
+
+    def _send(self):
+        """Refresh the OLED, timing it for the governor"""
+        governor = self.governor
+        if governor is None:
+            self.display.refresh()
+            return
+        start = time.monotonic_ns()
+        self.display.refresh()
+        governor.record_chunk(time.monotonic_ns() - start)
+
+    def refresh(self):
+        """
+        Send staged text changes to the OLED (call every loop iteration)
+
+        Without an arbiter: one display refresh for all changes.
+        With an arbiter: one display refresh per changed text row; between
+        rows the arbiter runs clock processing and flushes pending DAC
+        writes. With a governor, frames are paced to its frame rate and a
+        chunk that would delay the next step stays staged for a later
+        call. Does nothing when auto refresh is on or nothing changed.
+        """
+        if not self._pending_count:
+            return
+
+        governor = self.governor
+        if governor is not None:
+            governor.update(self._menu_shown())
+            if not governor.frame_due(time.monotonic_ns()):
+                return
+
+        arbiter = self.arbiter
+        if arbiter is None:
+            if governor is not None and not governor.chunk_fits(time.monotonic_ns()):
+                return
+            self._apply_pending(-1)
+            self._send()
+        else:
+            chunk = 0
+            last_chunk = self._label_chunk[-1]
+            while chunk <= last_chunk:
+                if self._chunk_pending(chunk):
+                    if governor is not None and not governor.chunk_fits(time.monotonic_ns()):
+                        break
+                    self._apply_pending(chunk)
+                    arbiter.begin(self.bus_id)
+                    self._send()
+                    arbiter.end(self.bus_id)
+                    arbiter.yield_bus()
+                chunk += 1
+
+            if self._chunk_pending(-1):
+                return  # Rest of the frame goes out on a later call
+
+        self._pending_count = 0
+        self.frames += 1
+        if governor is not None:
+            governor.frame_done(time.monotonic_ns())
+
+    def get_render_stats(self):
+        """
+        Get render cache statistics (for debugging)
+
+        Returns:
+            dict: frames sent, label updates skipped as unchanged, and
+                  (with a governor) chunks deferred and frames forced,
+                  (with a glyph cache) its statistics
+        """
+        stats = {
+            'frames': self.frames,
+            'skipped': self.skipped
+        }
+        if self.governor is not None:
+            stats['deferred'] = self.governor.deferred
+            stats['forced'] = self.governor.forced
+            stats['frame_interval_ms'] = self.governor.interval_ns // 1000000
+        if self.glyph_cache is not None:
+            stats['glyph_cache'] = self.glyph_cache.get_stats()
+        return stats
+
     def update_bpm(self, bpm, clock_source_short=""):
         """
         Update the BPM display
@@ -153,9 +614,9 @@ class Display:
         if self.is_sleeping:
             return
         if bpm is None or bpm <= 0:
-            self.bpm_label.text = f"BPM: --- {clock_source_short}"
+            self._set_text(self.bpm_label, f"BPM: --- {clock_source_short}")
         else:
-            self.bpm_label.text = f"BPM: {int(bpm)} {clock_source_short}"
+            self._set_text(self.bpm_label, f"BPM: {int(bpm)} {clock_source_short}")
 
     def update_pattern(self, pattern_name):
         """
@@ -168,9 +629,9 @@ class Display:
             return
         if self.selection_mode:
             # In selection mode, show the selected pattern differently
-            self.pattern_label.text = f"> {pattern_name} <"
+            self._set_text(self.pattern_label, f"> {pattern_name} <", fixed=True)
         else:
-            self.pattern_label.text = f"Pattern: {pattern_name}"
+            self._set_text(self.pattern_label, f"Pattern: {pattern_name}")
 
     def enter_selection_mode(self, pattern_name):
         """
@@ -184,7 +645,7 @@ class Display:
         self.selection_mode = True
         self.selected_pattern = pattern_name
         self.update_pattern(pattern_name)
-        self.status_label.text = "A/C:Chg B:Confirm"
+        self._set_text(self.status_label, "A/C:Chg B:Confirm", fixed=True)
 
     def exit_selection_mode(self, confirmed=False):
         """
@@ -198,7 +659,7 @@ class Display:
         self.selection_mode = False
         if confirmed:
             self.show_message("Pattern Set!", duration=1.0)
-        self.status_label.text = ""
+        self._set_text(self.status_label, "")
 
     def show_message(self, message, duration=2.0):
         """
@@ -210,26 +671,63 @@ class Display:
         """
         if self.is_sleeping:
             return
-        self.status_label.text = message
+        self._set_text(self.status_label, message)
 
     def clear_status(self):
         """Clear the status line"""
         if self.is_sleeping or self.selection_mode:
             return
-        self.status_label.text = ""
+        self._set_text(self.status_label, "")
 
-    def show_startup(self, version="0.95.0"):
+    def show_startup(self, version="0.95.0", duration_seconds=1.0):
         """
         Show startup screen with version info
 
+        The screen is held for duration_seconds: update_display() and
+        update_translation_display() leave it alone until then, while the
+        main loop keeps running.
+
         Args:
             version: Firmware version string
+            duration_seconds: How long to keep the startup screen
         """
         if self.is_sleeping:
             return
-        self.bpm_label.text = "MIDI Arpeggiator"
-        self.pattern_label.text = f"v{version}"
-        self.status_label.text = "Ready!"
+        self._set_text(self.bpm_label, "MIDI Arpeggiator")
+        self._set_text(self.pattern_label, f"v{version}")
+        self._set_text(self.status_label, "Ready!")
+        self.hold_screen(duration_seconds)
+        self.refresh()
+
+    def hold_screen(self, duration_seconds):
+        """
+        Keep the current screen for a while (periodic updates skip it)
+
+        Args:
+            duration_seconds: How long to hold
+        """
+        self.hold_end_time = time.monotonic() + duration_seconds
+
+    def _holding(self):
+        """True while a held screen (see hold_screen) is still showing"""
+        if self.hold_end_time is None:
+            return False
+        if time.monotonic() < self.hold_end_time:
+            return True
+        self.hold_end_time = None
+        return False
+
+    def _expire_status(self):
+        """Clear a timed status message whose time is up
+
+        Returns:
+            True if a message just expired
+        """
+        if self.status_end_time and time.monotonic() >= self.status_end_time:
+            self.status_message = None
+            self.status_end_time = None
+            return True
+        return False
 
     def enter_clock_source_selection(self, clock_source_name):
         """
@@ -241,9 +739,9 @@ class Display:
         if self.is_sleeping:
             self.wake()
         self.clock_source_selection_mode = True
-        self.bpm_label.text = "Clock Source:"
-        self.pattern_label.text = f"> {clock_source_name} <"
-        self.status_label.text = "A/C:Chg B:Confirm"
+        self._set_text(self.bpm_label, "Clock Source:", fixed=True)
+        self._set_text(self.pattern_label, f"> {clock_source_name} <", fixed=True)
+        self._set_text(self.status_label, "A/C:Chg B:Confirm", fixed=True)
 
     def update_clock_source_selection(self, clock_source_name):
         """
@@ -255,7 +753,7 @@ class Display:
         if self.is_sleeping:
             return
         if self.clock_source_selection_mode:
-            self.pattern_label.text = f"> {clock_source_name} <"
+            self._set_text(self.pattern_label, f"> {clock_source_name} <", fixed=True)
 
     def exit_clock_source_selection(self, confirmed=False):
         """
@@ -280,9 +778,9 @@ class Display:
         if self.is_sleeping:
             self.wake()
         self.settings_menu_mode = True
-        self.bpm_label.text = line1
-        self.pattern_label.text = line2
-        self.status_label.text = line3
+        self._set_text(self.bpm_label, line1, fixed=True)
+        self._set_text(self.pattern_label, line2, fixed=True)
+        self._set_text(self.status_label, line3, fixed=True)
 
     def update_settings_menu(self, line1, line2, line3):
         """
@@ -294,16 +792,16 @@ class Display:
         if self.is_sleeping:
             return
         if self.settings_menu_mode:
-            self.bpm_label.text = line1
-            self.pattern_label.text = line2
-            self.status_label.text = line3
+            self._set_text(self.bpm_label, line1, fixed=True)
+            self._set_text(self.pattern_label, line2, fixed=True)
+            self._set_text(self.status_label, line3, fixed=True)
 
     def exit_settings_menu(self):
         """Exit settings menu mode"""
         if self.is_sleeping:
             return
         self.settings_menu_mode = False
-        self.status_label.text = ""
+        self._set_text(self.status_label, "")
 
     def sleep(self):
         """Put display to sleep (turns off display)"""
@@ -367,7 +865,7 @@ class Display:
         if self.is_sleeping:
             return
         self.midi_in_active = active
-        self.midi_in_label.text = "v" if active else " "
+        self._set_text(self.midi_in_label, "v" if active else " ")
 
     def set_midi_out_active(self, active):
         """
@@ -379,7 +877,7 @@ class Display:
         if self.is_sleeping:
             return
         self.midi_out_active = active
-        self.midi_out_label.text = "^" if active else " "
+        self._set_text(self.midi_out_label, "^" if active else " ")
 
     def update_midi_indicators(self, has_midi_in, has_midi_out):
         """
@@ -428,8 +926,8 @@ class Display:
             clock_running: Whether clock is running
             clock_source_short: Short indicator like "(Int)" or "(Ext)"
         """
-        # Skip updates if display is sleeping
-        if self.is_sleeping:
+        # Skip updates if display is sleeping or showing a held screen
+        if self.is_sleeping or self._holding():
             return
 
         # Skip updates if in any menu mode
@@ -438,22 +936,18 @@ class Display:
             self.update_pattern(pattern_name)
 
             # Check for timed status message
-            import time
-            current_time = time.monotonic()
-            if self.status_end_time and current_time >= self.status_end_time:
+            if self._expire_status():
                 # Status message expired, clear it
-                self.status_label.text = ""
-                self.status_message = None
-                self.status_end_time = None
+                self._set_text(self.status_label, "")
 
             # Show status message if active
             if self.status_message:
-                self.status_label.text = self.status_message
+                self._set_text(self.status_label, self.status_message)
             # Otherwise show clock status if not running (external only)
             elif not clock_running:
-                self.status_label.text = "No Clock"
-            elif clock_running and self.status_label.text == "No Clock":
-                self.status_label.text = ""
+                self._set_text(self.status_label, "No Clock")
+            elif clock_running and self._text(self.status_label) == "No Clock":
+                self._set_text(self.status_label, "")
 
     def show_status(self, message, duration_seconds=2.0):
         """
@@ -463,10 +957,9 @@ class Display:
             message: The message to show
             duration_seconds: How long to show it (default 2 seconds)
         """
-        import time
         self.status_message = message
         self.status_end_time = time.monotonic() + duration_seconds
-        self.status_label.text = message
+        self._set_text(self.status_label, message)
 
     def update_translation_display(self, settings, clock_running=True):
         """
@@ -486,8 +979,22 @@ class Display:
             settings: Settings object with all current values
             clock_running: Whether clock is currently running (default True)
         """
-        # Skip updates if display is sleeping or in menu
-        if self.is_sleeping or self.settings_menu_mode:
+        # Skip updates if display is sleeping, in menu or showing a held screen
+        if self.is_sleeping or self.settings_menu_mode or self._holding():
+            return
+
+        # A timed status message (line 3) ran out: redraw
+        if self._expire_status():
+            self._translation_revision = None
+
+        # Nothing changed since the last draw: skip building the strings
+        # (unless another screen replaced our lines in the meantime)
+        if (settings.revision == self._translation_revision
+                and clock_running == self._translation_clock_running
+                and self._text(self.line1_label) == self._translation_text[0]
+                and self._text(self.line2_label) == self._translation_text[1]
+                and self._text(self.line3_label) == self._translation_text[2]):
+            self.skipped += 3
             return
 
         # Line 1: Clock status + BPM + Pattern + Scale + Input
@@ -509,7 +1016,7 @@ class Display:
 
         # Scale (only if enabled, skip if Chromatic)
         if settings.is_scale_enabled():
-            scale_short = self._get_scale_short_name(settings.scale_type)
+            scale_short = self._get_scale_short_name(settings)
             scale_text = f" S:{scale_short}"
         else:
             scale_text = ""
@@ -518,7 +1025,7 @@ class Display:
         input_short = self._format_input_source(settings.input_source)
         input_text = f" >{input_short}"
 
-        self.line1_label.text = f"{clock_icon}{bpm_text}{pattern_text}{scale_text} {input_text}"
+        self._set_text(self.line1_label, f"{clock_icon}{bpm_text}{pattern_text}{scale_text} {input_text}")
 
         # Line 2: Clock rate + Timing Feel + Likelihood + Mode badge
         # Format: x2 ~66 .80%  [XLAT]
@@ -543,17 +1050,25 @@ class Display:
 
         # Combine parts
         if parts:
-            self.line2_label.text = f"{' '.join(parts)}  {mode_badge}"
+            self._set_text(self.line2_label, f"{' '.join(parts)}  {mode_badge}")
         else:
-            self.line2_label.text = mode_badge
+            self._set_text(self.line2_label, mode_badge)
 
-        # Line 3: Translation layer flow (simplified)
-        if settings.routing_mode == settings.ROUTING_TRANSLATION:
+        # Line 3: Timed status message, or translation layer flow (simplified)
+        if self.status_message:
+            self._set_text(self.line3_label, self.status_message)
+        elif settings.routing_mode == settings.ROUTING_TRANSLATION:
             flow_text = self._format_layer_flow(settings)
-            self.line3_label.text = flow_text
+            self._set_text(self.line3_label, flow_text)
         else:
             # THRU mode: simple indicator
-            self.line3_label.text = "Pass-through mode"
+            self._set_text(self.line3_label, "Pass-through mode")
+
+        self._translation_revision = settings.revision
+        self._translation_clock_running = clock_running
+        self._translation_text[0] = self._text(self.line1_label)
+        self._translation_text[1] = self._text(self.line2_label)
+        self._translation_text[2] = self._text(self.line3_label)
 
     def _format_clock_rate(self, settings):
         """Format clock rate for compact display (v3)
@@ -561,16 +1076,7 @@ class Display:
         Returns empty string if 1x (no transformation)
         Examples: x2, x4, /2, /4
         """
-        rate_map = {
-            0: "/8",   # CLOCK_RATE_DIV_8
-            1: "/4",   # CLOCK_RATE_DIV_4
-            2: "/2",   # CLOCK_RATE_DIV_2
-            3: "",     # CLOCK_RATE_1X (no display)
-            4: "x2",   # CLOCK_RATE_2X
-            5: "x4",   # CLOCK_RATE_4X
-            6: "x8",   # CLOCK_RATE_8X
-        }
-        return rate_map.get(settings.clock_rate, "")
+        return self.CLOCK_RATE_SHORT_NAMES.get(settings.clock_rate, "")
 
     def _format_timing_feel(self, settings):
         """Format timing feel for compact display (v3)
@@ -615,42 +1121,13 @@ class Display:
             return "GATE"
         return "?"
 
-    def _get_scale_short_name(self, scale_type):
-        """Get short scale name for display"""
-        scale_names = {
-            0: "Chr",   # Chromatic
-            1: "Maj",   # Major
-            2: "Min",   # Minor
-            3: "Dor",   # Dorian
-            4: "Phr",   # Phrygian
-            5: "Lyd",   # Lydian
-            6: "Mix",   # Mixolydian
-            7: "Aeo",   # Aeolian
-            8: "Loc",   # Locrian
-            9: "Blu",   # Blues
-            10: "Pnt",  # Pentatonic Major
-            11: "PnM"   # Pentatonic Minor
-        }
-        return scale_names.get(scale_type, "?")
+    def _get_scale_short_name(self, settings):
+        """Get short scale name for display (user scales: first 3 letters)"""
+        short = self.SCALE_SHORT_NAMES.get(settings.scale_type)
+        if short is None:
+            short = settings.get_scale_name()[:3]
+        return short
 
     def _get_pattern_short_name(self, pattern):
         """Get short pattern name for display"""
-        pattern_names = {
-            0: "Up",
-            1: "Dn",
-            2: "UpDn",
-            3: "DnUp",
-            4: "Rnd",
-            5: "Play",
-            6: "UpI",   # Up-Down Inclusive
-            7: "DnI",   # Down-Up Inclusive
-            8: "Up2",   # Up 2x
-            9: "Dn2",   # Down 2x
-            10: "Conv", # Converge
-            11: "Div",  # Diverge
-            12: "Pnky", # Pinky Up
-            13: "Thmb", # Thumb Up
-            14: "Oct",  # Octave Up
-            15: "Chrd"  # Chord Repeat
-        }
-        return pattern_names.get(pattern, "?")
+        return self.PATTERN_SHORT_NAMES.get(pattern, "?")
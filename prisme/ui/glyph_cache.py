@@ -0,0 +1,140 @@
+"""
+Glyph Cache
+Pre-rendered bitmaps for fixed UI strings (menu rows, pattern and scale names)
+
+A Label lays its text out glyph by glyph every time the text changes,
+allocating a TileGrid per character. Menu rows and pattern/scale names
+come from a small, fixed set of strings, so each one is rendered once
+into a row-sized displayio.Bitmap and shown by swapping a TileGrid's
+bitmap reference. Least recently used rows are dropped once the cache
+exceeds its byte budget.
+
+Built-in Dependencies:
+- displayio, bitmaptools (CircuitPython 9.x+)
+"""
+
+import displayio
+import bitmaptools
+
+# Row bitmaps are the full display width (TileGrid.bitmap can only be
+# swapped for a bitmap of the same size)
+ROW_WIDTH = 128
+
+# ~32 rows of terminalio text: every pattern name plus the menu rows
+DEFAULT_BUDGET_BYTES = 6144
+
+
+class GlyphCache:
+    """Renders fixed strings once into 1-bit row bitmaps, with LRU eviction"""
+
+    def __init__(self, font, width=ROW_WIDTH, budget_bytes=DEFAULT_BUDGET_BYTES):
+        """
+        Initialize an empty cache
+
+        Args:
+            font: Font to render with (e.g. terminalio.FONT)
+            width: Row bitmap width in pixels
+            budget_bytes: Maximum bytes of cached bitmaps
+        """
+        self.font = font
+        self.width = width
+        self.height = font.get_bounding_box()[1]
+        self.budget_bytes = budget_bytes
+
+        # 1 bit per pixel, rows padded to 32-bit words
+        self.bitmap_bytes = ((width + 31) // 32) * 4 * self.height
+
+        # text -> [bitmap, last use]
+        self.entries = {}
+        self.uses = 0
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, text):
+        """
+        Get the bitmap for a string, rendering it on first use
+
+        Args:
+            text: String to show (clipped to the row width)
+
+        Returns:
+            displayio.Bitmap (2 colors, text = 1). Don't modify it: it is
+            shared with every row showing the same text.
+        """
+        self.uses += 1
+        entry = self.entries.get(text)
+        if entry is not None:
+            entry[1] = self.uses
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        while self.entries and self.bytes_used() + self.bitmap_bytes > self.budget_bytes:
+            self._evict()
+
+        bitmap = self.render(text)
+        self.entries[text] = [bitmap, self.uses]
+        return bitmap
+
+    def _evict(self):
+        """Drop the least recently used bitmap (a TileGrid still showing it keeps it alive)"""
+        oldest_text = None
+        oldest_use = None
+        for text in self.entries:
+            use = self.entries[text][1]
+            if oldest_use is None or use < oldest_use:
+                oldest_text = text
+                oldest_use = use
+        del self.entries[oldest_text]
+        self.evictions += 1
+
+    def render(self, text):
+        """
+        Render a string into a new row bitmap
+
+        Args:
+            text: String to render (characters past the row width are dropped)
+
+        Returns:
+            displayio.Bitmap of width x height
+        """
+        bitmap = displayio.Bitmap(self.width, self.height, 2)
+        font = self.font
+        x = 0
+        for char in text:
+            glyph = font.get_glyph(ord(char))
+            if glyph is None:
+                continue
+            if x + glyph.width > self.width:
+                break
+
+            # Built-in fonts keep their glyphs side by side in one sheet
+            y = self.height - glyph.height - glyph.dy
+            source_x = glyph.tile_index * glyph.width
+            bitmaptools.blit(bitmap, glyph.bitmap, x + glyph.dx, y,
+                             x1=source_x, y1=0,
+                             x2=source_x + glyph.width, y2=glyph.height)
+            x += glyph.shift_x
+        return bitmap
+
+    def bytes_used(self):
+        """Bytes held by cached bitmaps"""
+        return len(self.entries) * self.bitmap_bytes
+
+    def get_stats(self):
+        """
+        Get cache statistics (for debugging)
+
+        Returns:
+            dict: entries, bytes, hits, misses, evictions
+        """
+        return {
+            'entries': len(self.entries),
+            'bytes': self.bytes_used(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
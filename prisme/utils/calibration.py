@@ -0,0 +1,175 @@
+"""
+CV output calibration for the MCP4728 DAC channels
+Stores per-channel correction points in NVM and builds corrected pitch tables
+"""
+
+import struct
+import microcontroller
+from array import array
+
+# Calibration storage in NVM (settings slots use bytes 0-95, 96-191 are free)
+NVM_CALIBRATION_MAGIC = b'CAL1'
+NVM_CALIBRATION_START = 192  # 64 bytes reserved: 192-255
+
+# Correction points: one per volt (= one per octave at 1V/oct), 0V-5V
+CALIBRATION_CHANNELS = 4
+CALIBRATION_POINTS = 6
+
+# 24 DAC codes (H = unsigned short): 4 (magic) + 48 bytes = 52 bytes
+CALIBRATION_STRUCT_FORMAT = '24H'
+
+
+class CVCalibration:
+    """Per-channel DAC correction points with linear interpolation
+
+    For each DAC channel, points[channel * CALIBRATION_POINTS + v] is the
+    12-bit code that measures exactly v volts at the output jack
+    (v = 0-5). Codes in between are interpolated, so a 128-note pitch
+    table built from the points is accurate across all 5 octaves.
+    """
+
+    DAC_MAX_VALUE = 4095  # 12-bit DAC
+    DAC_VREF = 5.0  # 5V reference
+
+    def __init__(self):
+        """Initialize with uncorrected (ideal) points"""
+        self.points = array('H', [0] * (CALIBRATION_CHANNELS * CALIBRATION_POINTS))
+        self.calibrated = False  # True once points are loaded or set
+        self.reset()
+
+    def reset(self):
+        """Return every channel to the ideal (uncorrected) response"""
+        for channel in range(CALIBRATION_CHANNELS):
+            for point in range(CALIBRATION_POINTS):
+                self.points[channel * CALIBRATION_POINTS + point] = self.ideal_code(point)
+        self.calibrated = False
+
+    def ideal_code(self, voltage):
+        """
+        Get the uncorrected DAC code for a voltage
+
+        Args:
+            voltage: Output voltage (0.0-5.0)
+
+        Returns:
+            DAC code (0-4095)
+        """
+        code = int((voltage / self.DAC_VREF) * self.DAC_MAX_VALUE)
+        return max(0, min(self.DAC_MAX_VALUE, code))
+
+    def set_channel_points(self, channel, codes):
+        """
+        Set the correction points for one channel
+
+        Args:
+            channel: DAC channel (0-3 = A-D)
+            codes: CALIBRATION_POINTS DAC codes measuring 0V, 1V ... 5V
+        """
+        if len(codes) != CALIBRATION_POINTS:
+            print(f"Calibration needs {CALIBRATION_POINTS} points, got {len(codes)}")
+            return
+        base = channel * CALIBRATION_POINTS
+        for point in range(CALIBRATION_POINTS):
+            self.points[base + point] = max(0, min(self.DAC_MAX_VALUE, int(codes[point])))
+        self.calibrated = True
+
+    def get_channel_points(self, channel):
+        """
+        Get the correction points for one channel
+
+        Args:
+            channel: DAC channel (0-3 = A-D)
+
+        Returns:
+            List of CALIBRATION_POINTS DAC codes
+        """
+        base = channel * CALIBRATION_POINTS
+        return list(self.points[base:base + CALIBRATION_POINTS])
+
+    def voltage_to_dac_value(self, channel, voltage):
+        """
+        Convert a voltage to a corrected DAC code
+
+        Args:
+            channel: DAC channel (0-3 = A-D)
+            voltage: Desired output voltage (0.0-5.0)
+
+        Returns:
+            DAC code (0-4095)
+        """
+        voltage = max(0.0, min(self.DAC_VREF, voltage))
+
+        # Segment between the two surrounding 1V points
+        segment = min(int(voltage), CALIBRATION_POINTS - 2)
+        fraction = voltage - segment
+        base = channel * CALIBRATION_POINTS + segment
+        low = self.points[base]
+        high = self.points[base + 1]
+
+        code = int(low + (high - low) * fraction + 0.5)
+        return max(0, min(self.DAC_MAX_VALUE, code))
+
+    def build_pitch_table(self, channel, volts_per_octave, reference_note=60, reference_voltage=1.0):
+        """
+        Build a corrected MIDI note to DAC code table
+
+        Args:
+            channel: DAC channel the pitch CV is on
+            volts_per_octave: Pitch scale (1.0 or 1.035)
+            reference_note: MIDI note at reference_voltage (60 = C3)
+            reference_voltage: Voltage of reference_note
+
+        Returns:
+            array('H') of 128 DAC codes
+        """
+        table = array('H', [0] * 128)
+        volts_per_semitone = volts_per_octave / 12.0
+        for note in range(128):
+            voltage = reference_voltage + ((note - reference_note) * volts_per_semitone)
+            table[note] = self.voltage_to_dac_value(channel, voltage)
+        return table
+
+    def save(self):
+        """
+        Save calibration points to NVM
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            packed_data = struct.pack(CALIBRATION_STRUCT_FORMAT, *self.points)
+            nvm_data = NVM_CALIBRATION_MAGIC + packed_data
+            microcontroller.nvm[NVM_CALIBRATION_START:NVM_CALIBRATION_START + len(nvm_data)] = nvm_data
+            print(f"Calibration saved to NVM ({len(packed_data)} bytes)")
+            return True
+
+        except Exception as e:
+            print(f"Failed to save calibration: {e}")
+            return False
+
+    def load(self):
+        """
+        Load calibration points from NVM
+
+        Returns:
+            True if calibration was found, False otherwise (ideal response kept)
+        """
+        try:
+            struct_size = struct.calcsize(CALIBRATION_STRUCT_FORMAT)
+            total_size = len(NVM_CALIBRATION_MAGIC) + struct_size
+            nvm_data = bytes(microcontroller.nvm[NVM_CALIBRATION_START:NVM_CALIBRATION_START + total_size])
+
+            if not nvm_data.startswith(NVM_CALIBRATION_MAGIC):
+                print("No CV calibration in NVM, using ideal DAC response")
+                return False
+
+            unpacked = struct.unpack(CALIBRATION_STRUCT_FORMAT, nvm_data[len(NVM_CALIBRATION_MAGIC):])
+            for i in range(len(unpacked)):
+                self.points[i] = min(self.DAC_MAX_VALUE, unpacked[i])
+            self.calibrated = True
+            print("CV calibration loaded")
+            return True
+
+        except Exception as e:
+            print(f"Failed to load calibration from NVM: {e}")
+            return False
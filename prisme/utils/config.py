@@ -3,8 +3,12 @@ Global settings for the MIDI Arpeggiator
 Manages configuration for arpeggiation patterns, timing, and behavior
 """
 
+import time
 import struct
 import microcontroller
+from prisme.utils.scales import ScaleBank
+from prisme.utils.nvm_store import SlotStore
+from prisme.utils.schema import SchemaCodec
 
 # Firmware version
 FIRMWARE_VERSION = "1.0.0"
@@ -28,7 +32,96 @@ SETTINGS_STRUCT_FORMAT = 'BBBHBBBBBBBBBBBfBBBBBBBBBBB'  # v2 (migration only)
 # 29 values: 18 core + 2 Translation basics + 8 v3 unified controls + 1 display
 # Removed (7): cv_enabled, scale_enabled, arp_enabled, clock_multiply, clock_divide, swing_percent, clock_enabled
 # Added (9): clock_rate, timing_feel, midi_filter, likelihood, strum_speed, strum_octaves, strum_repeat, strum_direction, display_rotation
-SETTINGS_STRUCT_FORMAT_V3 = 'BBBHBBBBBBBBBBfBBBBBBBBBBBBBH'  # v3 (29 values + display_rotation)
+SETTINGS_STRUCT_FORMAT_V3 = 'BBBHBBBBBBBBBBfBBBBBBBBBBBBBH'  # v3 (29 values + display_rotation, loading only)
+
+# Bit-packed settings record (v4+): one table drives encode, decode and
+# migration (prisme/utils/schema.py). Fields are only ever appended; a field
+# added in version N gets its default when a record older than N is loaded.
+# The first 29 fields are also the order of SETTINGS_STRUCT_FORMAT_V3.
+SETTINGS_SCHEMA_VERSION = 4
+SETTINGS_SCHEMA = (
+    # (name, bits, default, version, scale)
+    ('pattern', 5, 0, 3, 1),                 # ARP_UP .. ARP_STRUM (0-16)
+    ('enabled', 1, True, 3, 1),
+    ('clock_source', 1, 0, 3, 1),            # CLOCK_INTERNAL / CLOCK_EXTERNAL
+    ('internal_bpm', 9, 120, 3, 1),          # 30-300
+    ('clock_division', 7, 6, 3, 1),          # Ticks per step (6-48)
+    ('octave_range', 3, 1, 3, 1),            # 0-4
+    ('midi_channel', 4, 0, 3, 1),
+    ('velocity_passthrough', 1, True, 3, 1),
+    ('fixed_velocity', 7, 100, 3, 1),
+    ('latch', 1, False, 3, 1),
+    ('cv_scale', 1, 0, 3, 1),                # CV_SCALE_STANDARD / CV_SCALE_MOOG
+    ('trigger_polarity', 1, 0, 3, 1),        # TRIGGER_VTRIG / TRIGGER_STRIG
+    ('scale_type', 8, 0, 3, 1),              # Scale bank index (0-255)
+    ('scale_root', 4, 0, 3, 1),
+    ('gate_length', 7, 0.8, 3, 100),         # 0.10-1.00 in 1% steps
+    ('custom_cc_source', 3, 0, 3, 1),        # CC_SOURCE_* (0-4)
+    ('custom_cc_number', 7, 74, 3, 1),
+    ('custom_cc_smoothing', 2, 1, 3, 1),     # CC_SMOOTH_* (0-3)
+    ('routing_mode', 1, 1, 3, 1),            # ROUTING_THRU / ROUTING_TRANSLATION
+    ('input_source', 2, 0, 3, 1),            # INPUT_SOURCE_* (0-3)
+    ('clock_rate', 3, 3, 3, 1),              # CLOCK_RATE_DIV_8 .. CLOCK_RATE_8X
+    ('timing_feel', 7, 50, 3, 1),            # 50-100
+    ('midi_filter', 2, 0, 3, 1),             # MIDI_FILTER_* (0-3)
+    ('likelihood', 7, 100, 3, 1),            # 0-100
+    ('strum_speed', 3, 1, 3, 1),             # 0-5
+    ('strum_octaves', 3, 1, 3, 1),           # 1-4
+    ('strum_repeat', 1, False, 3, 1),
+    ('strum_direction', 2, 0, 3, 1),         # 0-2
+    ('display_rotation', 1, 0, 3, 180),      # 0 or 180 degrees
+    ('note_priority', 2, 2, 4, 1),           # NOTE_PRIORITY_* (0-3)
+)
+SETTINGS_CODEC = SchemaCodec(SETTINGS_SCHEMA, SETTINGS_SCHEMA_VERSION)
+
+# V2 layout (migration only): the 27 SETTINGS_STRUCT_FORMAT values, in order,
+# as version 2 fields. Settings dropped in v3 are named None; the v2 clock
+# fields load as-is and _load_v2_and_migrate() converts them to clock_rate and
+# timing_feel. The fields v3 added follow as version 3 and take their defaults.
+SETTINGS_SCHEMA_V2 = (
+    # (name, bits, default, version, scale) - bits as stored in the v2 struct
+    ('pattern', 8, 0, 2, 1),
+    ('enabled', 8, True, 2, 1),
+    ('clock_source', 8, 0, 2, 1),
+    ('internal_bpm', 16, 120, 2, 1),
+    ('clock_division', 8, 6, 2, 1),
+    ('octave_range', 8, 1, 2, 1),
+    ('midi_channel', 8, 0, 2, 1),
+    ('velocity_passthrough', 8, True, 2, 1),
+    ('fixed_velocity', 8, 100, 2, 1),
+    ('latch', 8, False, 2, 1),
+    (None, 8, True, 2, 1),                   # cv_enabled
+    ('cv_scale', 8, 0, 2, 1),
+    ('trigger_polarity', 8, 0, 2, 1),
+    ('scale_type', 8, 0, 2, 1),
+    ('scale_root', 8, 0, 2, 1),
+    ('gate_length', 32, 0.8, 2, 1),
+    ('custom_cc_source', 8, 0, 2, 1),
+    ('custom_cc_number', 8, 74, 2, 1),
+    ('custom_cc_smoothing', 8, 1, 2, 1),
+    ('routing_mode', 8, 1, 2, 1),
+    ('input_source', 8, 0, 2, 1),
+    (None, 8, True, 2, 1),                   # scale_enabled
+    (None, 8, True, 2, 1),                   # arp_enabled
+    ('clock_multiply', 8, 1, 2, 1),          # -> clock_rate
+    ('clock_divide', 8, 1, 2, 1),            # -> clock_rate
+    ('swing_percent', 8, 50, 2, 1),          # -> timing_feel
+    (None, 8, True, 2, 1),                   # clock_enabled
+) + tuple(field for field in SETTINGS_SCHEMA
+          if field[0] in (
+              'midi_filter', 'likelihood', 'strum_speed', 'strum_octaves',
+              'strum_repeat', 'strum_direction', 'display_rotation'))
+SETTINGS_CODEC_V2 = SchemaCodec(SETTINGS_SCHEMA_V2, 2)
+
+# Wear-levelled storage: a version byte plus the packed fields (zero padded
+# to NVM_SETTINGS_RECORD_SIZE, room for later fields) rotate over 4 slots of
+# 24 bytes (NVM bytes 0-95) with a sequence counter and CRC. NVM 96-191 is
+# free for presets; calibration uses 192-255. With no valid slot, boot falls
+# back to the single magic-prefixed ARP3/ARP2 block at NVM_SETTINGS_START.
+NVM_SETTINGS_SLOT_MAGIC = b'S4'
+NVM_SETTINGS_SLOT_SIZE = 24
+NVM_SETTINGS_SLOT_COUNT = 4
+NVM_SETTINGS_RECORD_SIZE = 18  # Slot size - 6 bytes of slot header and CRC
 
 class Settings:
     """Global settings container for the arpeggiator"""
@@ -166,6 +259,17 @@ class Settings:
         SCALE_MELODIC_MIN: [0, 2, 3, 5, 7, 9, 11],  # Melodic minor
     }
 
+    # Built-in scale names (user scales from /scales.txt follow these)
+    SCALE_NAMES = (
+        "Chromatic", "Major", "Minor", "Dorian", "Phrygian", "Lydian",
+        "Mixolydian", "Min Pent", "Maj Pent", "Blues", "Harm Min", "Mel Min",
+    )
+
+    # Deferred saving: write once settings stop changing for SAVE_IDLE_TIME
+    # seconds, or SAVE_MAX_DELAY after the first unsaved change
+    SAVE_IDLE_TIME = 2.0
+    SAVE_MAX_DELAY = 10.0
+
     def __init__(self):
         # Arpeggiator settings
         self.pattern = self.ARP_UP  # Default pattern
@@ -201,6 +305,15 @@ class Settings:
         self.scale_type = self.SCALE_CHROMATIC  # Default to chromatic (no quantization)
         self.scale_root = 0  # Root note (0=C, 1=C#, 2=D, etc.)
 
+        # Built-in + user scales (scale_type indexes the bank)
+        self.scale_bank = ScaleBank(self.SCALE_INTERVALS, self.SCALE_NAMES)
+
+        # Quantization table for (scale_type, scale_root): 128 bytes, rebuilt
+        # by quantize_to_scale() when either setting changes
+        self._quantize_table = None
+        self._quantize_scale = None
+        self._quantize_root = None
+
         # Custom CC settings
         self.custom_cc_source = self.CC_SOURCE_DISABLED  # Default to disabled
         self.custom_cc_number = 74  # Default to CC 74 (Filter Cutoff)
@@ -261,6 +374,20 @@ class Settings:
         # See: docs/architecture/POLYPHONY_DESIGN.md
         self.note_priority = self.NOTE_PRIORITY_LAST  # Default: Last note (most intuitive)
 
+        # Change counter - bumped on every save() so cached copies of these
+        # settings (e.g. the arpeggiator's step snapshot) know to refresh
+        self.revision = 0
+
+        # Deferred NVM writes: save() marks settings dirty, flush_if_idle()
+        # writes them once changes stop (one write per burst of changes)
+        self.dirty = False
+        self._dirty_since = 0.0  # First unsaved change
+        self._changed_at = 0.0  # Latest unsaved change
+        self._store = SlotStore(
+            NVM_SETTINGS_START, NVM_SETTINGS_SLOT_SIZE, NVM_SETTINGS_SLOT_COUNT,
+            NVM_SETTINGS_SLOT_MAGIC, NVM_SETTINGS_RECORD_SIZE
+        )
+
     def get_pattern_name(self):
         """Return human-readable pattern name"""
         patterns = {
@@ -366,29 +493,15 @@ class Settings:
 
     def get_scale_name(self):
         """Return human-readable scale name"""
-        scale_names = {
-            self.SCALE_CHROMATIC: "Chromatic",
-            self.SCALE_MAJOR: "Major",
-            self.SCALE_MINOR: "Minor",
-            self.SCALE_DORIAN: "Dorian",
-            self.SCALE_PHRYGIAN: "Phrygian",
-            self.SCALE_LYDIAN: "Lydian",
-            self.SCALE_MIXOLYDIAN: "Mixolydian",
-            self.SCALE_MINOR_PENT: "Min Pent",
-            self.SCALE_MAJOR_PENT: "Maj Pent",
-            self.SCALE_BLUES: "Blues",
-            self.SCALE_HARMONIC_MIN: "Harm Min",
-            self.SCALE_MELODIC_MIN: "Mel Min",
-        }
-        return scale_names.get(self.scale_type, "Unknown")
+        return self.scale_bank.get_name(self.scale_type)
 
     def next_scale(self):
         """Cycle to next scale"""
-        self.scale_type = (self.scale_type + 1) % 12
+        self.scale_type = (self.scale_type + 1) % self.scale_bank.count()
 
     def previous_scale(self):
         """Cycle to previous scale"""
-        self.scale_type = (self.scale_type - 1) % 12
+        self.scale_type = (self.scale_type - 1) % self.scale_bank.count()
 
     def get_root_note_name(self):
         """Return human-readable root note name"""
@@ -677,6 +790,33 @@ class Settings:
         Args:
             midi_note: Input MIDI note number (0-127)
 
+        Returns:
+            Quantized MIDI note number
+        """
+        # Scale or root changed since the table was built
+        if self.scale_type != self._quantize_scale or self.scale_root != self._quantize_root:
+            self._build_quantize_table()
+
+        if 0 <= midi_note < 128:
+            return self._quantize_table[midi_note]
+        return self._nearest_in_scale(midi_note)
+
+    def _build_quantize_table(self):
+        """Precompute the quantized note for all 128 MIDI notes"""
+        table = bytearray(128)
+        for note in range(128):
+            table[note] = self._nearest_in_scale(note)
+        self._quantize_table = bytes(table)
+        self._quantize_scale = self.scale_type
+        self._quantize_root = self.scale_root
+
+    def _nearest_in_scale(self, midi_note):
+        """
+        Find the nearest note in the current scale (builds the table)
+
+        Args:
+            midi_note: Input MIDI note number
+
         Returns:
             Quantized MIDI note number
         """
@@ -684,31 +824,17 @@ class Settings:
         if self.scale_type == self.SCALE_CHROMATIC:
             return midi_note
 
-        # Get the scale intervals
-        intervals = self.SCALE_INTERVALS[self.scale_type]
+        # Load the scale's next-up/next-down tables
+        bank = self.scale_bank
+        if bank.active != self.scale_type:
+            bank.select(self.scale_type)
 
         # Find the octave and note within octave
         octave = midi_note // 12
         note_in_octave = midi_note % 12
 
-        # Adjust for root note
-        note_relative_to_root = (note_in_octave - self.scale_root) % 12
-
-        # Find nearest note in scale
-        min_distance = 12
-        nearest_interval = 0
-
-        for interval in intervals:
-            distance = abs(note_relative_to_root - interval)
-            # Also check wrap-around distance
-            wrap_distance = 12 - distance
-
-            if distance < min_distance:
-                min_distance = distance
-                nearest_interval = interval
-            if wrap_distance < min_distance:
-                min_distance = wrap_distance
-                nearest_interval = interval
+        # Adjust for root note, then find nearest note in scale
+        nearest_interval = bank.nearest((note_in_octave - self.scale_root) % 12)
 
         # Calculate quantized note
         quantized_note_in_octave = (self.scale_root + nearest_interval) % 12
@@ -719,72 +845,91 @@ class Settings:
 
     def save(self):
         """
-        Save current settings to NVM (non-volatile memory) using v3 format
+        Mark settings changed (written to NVM later by flush_if_idle())
 
         Returns:
-            True if successful, False otherwise
+            True (kept for callers of the old synchronous save)
+        """
+        self.revision += 1
+
+        now = time.monotonic()
+        if not self.dirty:
+            self.dirty = True
+            self._dirty_since = now
+        self._changed_at = now
+        return True
+
+    def flush_if_idle(self, now):
+        """
+        Write unsaved settings once they have stopped changing
+        Call periodically from the main loop (cheap when nothing changed)
+
+        Args:
+            now: Current time (time.monotonic())
+        """
+        if not self.dirty:
+            return
+        if (now - self._changed_at >= self.SAVE_IDLE_TIME or
+                now - self._dirty_since >= self.SAVE_MAX_DELAY):
+            self.flush()
+
+    def flush(self):
         """
+        Write settings to the next NVM slot now (if there are unsaved changes)
+
+        Returns:
+            True if successful (or nothing to write), False otherwise
+        """
+        if not self.dirty:
+            return True
+
         try:
-            # Pack settings into compact binary format (v3)
-            # Order must match SETTINGS_STRUCT_FORMAT_V3
-            packed_data = struct.pack(
-                SETTINGS_STRUCT_FORMAT_V3,
-                self.pattern,              # B (byte)
-                int(self.enabled),         # B (byte as bool)
-                self.clock_source,         # B (byte)
-                self.internal_bpm,         # H (unsigned short)
-                self.clock_division,       # B (byte)
-                self.octave_range,         # B (byte)
-                self.midi_channel,         # B (byte)
-                int(self.velocity_passthrough),  # B (byte as bool)
-                self.fixed_velocity,       # B (byte)
-                int(self.latch),           # B (byte as bool)
-                # cv_enabled removed (v3)
-                self.cv_scale,             # B (byte)
-                self.trigger_polarity,     # B (byte)
-                self.scale_type,           # B (byte)
-                self.scale_root,           # B (byte)
-                self.gate_length,          # f (float)
-                self.custom_cc_source,     # B (byte)
-                self.custom_cc_number,     # B (byte)
-                self.custom_cc_smoothing,  # B (byte)
-                # Translation Hub v3 settings
-                self.routing_mode,         # B (byte)
-                self.input_source,         # B (byte)
-                # Unified controls (v3) - replaced 7 old settings
-                self.clock_rate,           # B (byte)
-                self.timing_feel,          # B (byte)
-                self.midi_filter,          # B (byte)
-                self.likelihood,           # B (byte)
-                self.strum_speed,          # B (byte)
-                self.strum_octaves,        # B (byte)
-                int(self.strum_repeat),    # B (byte as bool)
-                self.strum_direction,      # B (byte)
-                self.display_rotation      # H (unsigned short: 0 or 180)
-            )
-
-            # Prepend v3 magic bytes
-            nvm_data = NVM_SETTINGS_MAGIC_V3 + packed_data
-
-            # Write to NVM
-            microcontroller.nvm[NVM_SETTINGS_START:NVM_SETTINGS_START + len(nvm_data)] = nvm_data
-
-            print(f"Settings saved to NVM (v3 format, {len(packed_data)} bytes)")
+            self._store.save(self._pack())
+            self.dirty = False
+            print(f"Settings saved to NVM (slot {self._store.slot}, sequence {self._store.sequence})")
             return True
 
         except Exception as e:
             print(f"Failed to save settings: {e}")
+            # Try again after the next idle period
+            self._dirty_since = self._changed_at = time.monotonic()
             return False
 
+    def _pack(self):
+        """Pack settings into a versioned bit-packed record (SETTINGS_SCHEMA)"""
+        record = bytearray(NVM_SETTINGS_RECORD_SIZE)
+        record[0] = SETTINGS_SCHEMA_VERSION
+        packed = SETTINGS_CODEC.encode(self)
+        record[1:1 + len(packed)] = packed
+        return record
+
+    def _unpack(self, record):
+        """
+        Load a versioned bit-packed record (older versions migrate via defaults)
+
+        Args:
+            record: Bytes written by _pack()
+        """
+        # A newer firmware's record starts with the fields this one knows
+        version = min(record[0], SETTINGS_SCHEMA_VERSION)
+        SETTINGS_CODEC.decode(self, record[1:], version)
+
     def load(self):
         """
-        Load settings from NVM with format migration (v2 → v3)
+        Load settings from NVM (newest valid slot) with migration from older formats
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Try v3 format first (current)
+            # Newest valid wear-levelled slot (current)
+            record = self._store.load()
+            if record is not None:
+                self._unpack(record)
+                print(f"Settings loaded (v{record[0]}, slot {self._store.slot}, sequence {self._store.sequence})")
+                return True
+
+            # Single v3 block (before wear levelling)
             struct_size_v3 = struct.calcsize(SETTINGS_STRUCT_FORMAT_V3)
             total_size_v3 = len(NVM_SETTINGS_MAGIC_V3) + struct_size_v3
             nvm_data = bytes(microcontroller.nvm[NVM_SETTINGS_START:NVM_SETTINGS_START + total_size_v3])
@@ -808,8 +953,9 @@ class Settings:
                 packed_data = nvm_data[len(NVM_SETTINGS_MAGIC):]
                 unpacked = struct.unpack(SETTINGS_STRUCT_FORMAT, packed_data)
                 self._load_v2_and_migrate(unpacked)
-                self.save()  # Save in new v3 format
-                print("Settings migrated to v3 format")
+                self.save()  # Save in the current format
+                self.flush()
+                print("Settings migrated from v2 format")
                 return True
 
             # No valid settings found
@@ -827,38 +973,8 @@ class Settings:
         Args:
             unpacked: Tuple of unpacked values from struct.unpack
         """
-        self.pattern = unpacked[0]
-        self.enabled = bool(unpacked[1])
-        self.clock_source = unpacked[2]
-        self.internal_bpm = unpacked[3]
-        self.clock_division = unpacked[4]
-        self.octave_range = unpacked[5]
-        self.midi_channel = unpacked[6]
-        self.velocity_passthrough = bool(unpacked[7])
-        self.fixed_velocity = unpacked[8]
-        self.latch = bool(unpacked[9])
-        # cv_enabled removed in v3
-        self.cv_scale = unpacked[10]
-        self.trigger_polarity = unpacked[11]
-        self.scale_type = unpacked[12]
-        self.scale_root = unpacked[13]
-        self.gate_length = unpacked[14]
-        self.custom_cc_source = unpacked[15]
-        self.custom_cc_number = unpacked[16]
-        self.custom_cc_smoothing = unpacked[17]
-        # Translation Hub v3
-        self.routing_mode = unpacked[18]
-        self.input_source = unpacked[19]
-        # Unified controls (v3)
-        self.clock_rate = unpacked[20]
-        self.timing_feel = unpacked[21]
-        self.midi_filter = unpacked[22]
-        self.likelihood = unpacked[23]
-        self.strum_speed = unpacked[24]
-        self.strum_octaves = unpacked[25]
-        self.strum_repeat = bool(unpacked[26])
-        self.strum_direction = unpacked[27]
-        self.display_rotation = unpacked[28]
+        # The v3 struct holds the version 3 schema fields, in table order
+        SETTINGS_CODEC.apply_values(self, unpacked, 3)
 
     def _load_v2_and_migrate(self, unpacked):
         """Load v2 format and migrate to v3
@@ -866,36 +982,14 @@ class Settings:
         Args:
             unpacked: Tuple of unpacked values from v2 struct.unpack
         """
-        # Load core settings (unchanged)
-        self.pattern = unpacked[0]
-        self.enabled = bool(unpacked[1])
-        self.clock_source = unpacked[2]
-        self.internal_bpm = unpacked[3]
-        self.clock_division = unpacked[4]
-        self.octave_range = unpacked[5]
-        self.midi_channel = unpacked[6]
-        self.velocity_passthrough = bool(unpacked[7])
-        self.fixed_velocity = unpacked[8]
-        self.latch = bool(unpacked[9])
-        # Skip cv_enabled (unpacked[10]) - removed in v3
-        self.cv_scale = unpacked[11]
-        self.trigger_polarity = unpacked[12]
-        self.scale_type = unpacked[13]
-        self.scale_root = unpacked[14]
-        self.gate_length = unpacked[15]
-        self.custom_cc_source = unpacked[16]
-        self.custom_cc_number = unpacked[17]
-        self.custom_cc_smoothing = unpacked[18]
-        # Translation Hub basics
-        self.routing_mode = unpacked[19]
-        self.input_source = unpacked[20]
-        # Skip scale_enabled, arp_enabled (unpacked[21-22]) - removed in v3
+        # Values in SETTINGS_SCHEMA_V2 order; settings added in v3 get defaults
+        SETTINGS_CODEC_V2.apply_values(self, unpacked, 2)
 
         # Migrate clock settings (v2 → v3)
-        clock_multiply = unpacked[23]
-        clock_divide = unpacked[24]
-        swing_percent = unpacked[25]
-        # clock_enabled = unpacked[26]  # Ignored (auto-detected in v3)
+        clock_multiply = self.clock_multiply
+        clock_divide = self.clock_divide
+        swing_percent = self.swing_percent
+        del self.clock_multiply, self.clock_divide, self.swing_percent
 
         # Convert multiply/divide to unified clock_rate
         if clock_divide == 8:
@@ -916,15 +1010,6 @@ class Settings:
         # Convert swing to timing_feel
         self.timing_feel = max(50, swing_percent)
 
-        # Default new v3 settings
-        self.midi_filter = self.MIDI_FILTER_OFF
-        self.likelihood = 100  # All notes (disabled)
-        self.strum_speed = 1  # /32
-        self.strum_octaves = 1
-        self.strum_repeat = False
-        self.strum_direction = 0  # Up
-        self.display_rotation = self.DISPLAY_ROTATION_0  # Normal orientation
-
 
 # Global settings instance
 settings = Settings()
@@ -0,0 +1,152 @@
+"""
+Wear-levelled record storage in NVM
+Rotates writes of one record across several NVM slots
+
+Each write goes to the slot after the newest one, with a sequence
+counter and a CRC, so no byte is rewritten on every save and a write
+cut short by power loss leaves the previous record intact. At boot the
+newest slot with a valid CRC wins.
+
+Slot layout (little-endian):
+    magic (2 bytes) | sequence (H) | payload | CRC-16 (H) of all before it
+"""
+
+import struct
+import microcontroller
+
+# Slot header: magic + sequence
+SLOT_HEADER_FORMAT = '<2sH'
+SLOT_CRC_FORMAT = '<H'
+
+
+def crc16(data):
+    """
+    CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF)
+
+    Args:
+        data: bytes-like
+
+    Returns:
+        16-bit CRC
+    """
+    crc = 0xFFFF
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            if crc & 0x8000:
+                crc = ((crc << 1) ^ 0x1021) & 0xFFFF
+            else:
+                crc = (crc << 1) & 0xFFFF
+    return crc
+
+
+def is_newer(sequence, other):
+    """True if sequence was written after other (16-bit counters that wrap)"""
+    return sequence != other and ((sequence - other) & 0xFFFF) < 0x8000
+
+
+class SlotStore:
+    """One fixed-size record, written round-robin over slot_count NVM slots"""
+
+    def __init__(self, start, slot_size, slot_count, magic, payload_size):
+        """
+        Initialize store (reads nothing yet, see load())
+
+        Args:
+            start: First NVM byte of slot 0
+            slot_size: Bytes per slot
+            slot_count: Number of slots
+            magic: 2-byte slot marker
+            payload_size: Record size in bytes
+        """
+        self.start = start
+        self.slot_size = slot_size
+        self.slot_count = slot_count
+        self.magic = magic
+        self.payload_size = payload_size
+        self.header_size = struct.calcsize(SLOT_HEADER_FORMAT)
+        self.record_size = self.header_size + payload_size + struct.calcsize(SLOT_CRC_FORMAT)
+        if self.record_size > slot_size:
+            raise ValueError(f"Record of {self.record_size} bytes does not fit a {slot_size} byte slot")
+
+        # Newest valid slot (None = no valid slot)
+        self.slot = None
+        self.sequence = 0
+
+        # Statistics
+        self.writes = 0
+
+    def _slot_offset(self, slot):
+        return self.start + slot * self.slot_size
+
+    def _read_slot(self, slot):
+        """
+        Read and check one slot
+
+        Returns:
+            (sequence, payload), or None if the slot is empty or corrupt
+        """
+        offset = self._slot_offset(slot)
+        record = bytes(microcontroller.nvm[offset:offset + self.record_size])
+        magic, sequence = struct.unpack_from(SLOT_HEADER_FORMAT, record)
+        if magic != self.magic:
+            return None
+        crc_offset = self.header_size + self.payload_size
+        (crc,) = struct.unpack_from(SLOT_CRC_FORMAT, record, crc_offset)
+        if crc != crc16(record[:crc_offset]):
+            return None
+        return (sequence, record[self.header_size:crc_offset])
+
+    def load(self):
+        """
+        Find the newest valid slot
+
+        Returns:
+            Payload bytes of the newest record, or None if no slot is valid
+        """
+        newest = None
+        for slot in range(self.slot_count):
+            record = self._read_slot(slot)
+            if record is None:
+                continue
+            if newest is None or is_newer(record[0], newest[1]):
+                newest = (slot, record[0], record[1])
+
+        if newest is None:
+            self.slot = None
+            self.sequence = 0
+            return None
+        self.slot = newest[0]
+        self.sequence = newest[1]
+        return newest[2]
+
+    def save(self, payload):
+        """
+        Write payload to the slot after the newest one
+
+        Args:
+            payload: payload_size bytes
+        """
+        if len(payload) != self.payload_size:
+            raise ValueError(f"Payload is {len(payload)} bytes, expected {self.payload_size}")
+
+        if self.slot is None:
+            slot = 0
+            sequence = self.sequence
+        else:
+            slot = (self.slot + 1) % self.slot_count
+            sequence = (self.sequence + 1) & 0xFFFF
+
+        record = bytearray(self.record_size)
+        struct.pack_into(SLOT_HEADER_FORMAT, record, 0, self.magic, sequence)
+        record[self.header_size:self.header_size + self.payload_size] = payload
+        crc_offset = self.header_size + self.payload_size
+        struct.pack_into(SLOT_CRC_FORMAT, record, crc_offset, crc16(record[:crc_offset]))
+
+        # One write per save; the previous newest slot stays intact
+        offset = self._slot_offset(slot)
+        microcontroller.nvm[offset:offset + self.record_size] = record
+
+        self.slot = slot
+        self.sequence = sequence
+        self.writes += 1
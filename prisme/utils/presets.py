@@ -0,0 +1,263 @@
+"""
+Preset bank for performance presets
+Fixed-size bit-packed preset records in one binary file on CIRCUITPY
+
+A preset is the performance subset of the settings (pattern, scale, clock
+rate, timing feel, CV and Custom CC), packed with the settings schema so
+field widths and migrations are shared with the NVM record.
+
+File layout (/presets.bin, little-endian):
+
+    magic (4 bytes) | record size (H) | record count (H)
+    record 0 | record 1 | ... | record count-1
+
+Record (RECORD_SIZE bytes):
+
+    schema version (B, 0 = empty slot) | packed fields (zero padded) | CRC-16 (H)
+
+Records are read with one seek + readinto() into a preallocated buffer:
+the file is never parsed as a whole. A MIDI Program Change reads its
+record right away and applies it on the next arpeggiator step; the preset
+after the current one is read ahead of time (prefetch()), so stepping
+through a set switches from RAM.
+
+CIRCUITPY is read-only to the board while it is mounted over USB, so
+store() only works when the drive is writable (or when run on the host
+against the mounted drive).
+"""
+
+import struct
+from prisme.utils.config import SETTINGS_SCHEMA, SETTINGS_SCHEMA_VERSION
+from prisme.utils.nvm_store import crc16
+from prisme.utils.schema import SchemaCodec
+
+# Preset file on CIRCUITPY
+PRESETS_PATH = "/presets.bin"
+
+# File header: magic + record size + record count
+PRESET_FILE_MAGIC = b'PRS1'
+PRESET_HEADER_FORMAT = '<4sHH'
+PRESET_HEADER_SIZE = struct.calcsize(PRESET_HEADER_FORMAT)
+
+# One record per MIDI program (0-127)
+PRESET_COUNT = 128
+PRESET_RECORD_SIZE = 16
+PRESET_CRC_FORMAT = '<H'
+
+# Settings stored in a preset (the rest stay as they are on recall)
+PRESET_FIELDS = (
+    'pattern', 'octave_range', 'gate_length', 'likelihood',
+    'scale_type', 'scale_root',
+    'clock_rate', 'timing_feel',
+    'cv_scale', 'trigger_polarity',
+    'custom_cc_source', 'custom_cc_number', 'custom_cc_smoothing',
+    'strum_speed', 'strum_octaves', 'strum_repeat', 'strum_direction',
+)
+PRESET_SCHEMA = tuple(field for field in SETTINGS_SCHEMA if field[0] in PRESET_FIELDS)
+PRESET_CODEC = SchemaCodec(PRESET_SCHEMA, SETTINGS_SCHEMA_VERSION)
+
+# No preset pending / staged
+NO_PRESET = -1
+
+
+class PresetBank:
+    """Performance presets on flash, recalled one record at a time"""
+
+    def __init__(self, path=PRESETS_PATH):
+        """
+        Initialize bank (does not touch the file yet)
+
+        Args:
+            path: Preset file
+        """
+        self.path = path
+        self._file = None  # Read handle, opened on first use
+        self.count = None  # Records in the file (None until the header is read)
+
+        # Preset read ahead of time (prefetch)
+        self.staged_index = NO_PRESET  # Slot last read ahead
+        self.staged_valid = False  # It holds a preset
+        self.staged = bytearray(PRESET_RECORD_SIZE)
+
+        # Preset requested by Program Change, applied on the next step
+        self.pending_index = NO_PRESET
+        self.pending = bytearray(PRESET_RECORD_SIZE)
+
+        # Last applied preset
+        self.current = NO_PRESET
+
+        # Statistics
+        self.reads = 0
+
+    def _open(self):
+        """
+        Open the file and check its header (once)
+
+        Returns:
+            True if the file is a readable preset file
+        """
+        if self._file is not None:
+            return True
+        if self.count == 0:
+            return False  # Already failed
+        self.count = 0
+        try:
+            f = open(self.path, "rb")
+        except OSError:
+            return False  # No presets
+        header = f.read(PRESET_HEADER_SIZE)
+        if len(header) == PRESET_HEADER_SIZE:
+            magic, record_size, count = struct.unpack(PRESET_HEADER_FORMAT, header)
+            if magic == PRESET_FILE_MAGIC and record_size == PRESET_RECORD_SIZE:
+                self._file = f
+                self.count = min(count, PRESET_COUNT)
+                print(f"Preset bank: {self.count} slots")
+                return True
+        print(f"Error reading {self.path}: not a preset file")
+        f.close()
+        return False
+
+    def close(self):
+        """Close the read handle (the header is read again on next use)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self.count = None
+
+    def _read(self, index, record):
+        """
+        Read one record into a buffer
+
+        Args:
+            index: Preset slot
+            record: bytearray(PRESET_RECORD_SIZE) to fill
+
+        Returns:
+            True if the slot holds a valid preset
+        """
+        if not self._open() or index < 0 or index >= self.count:
+            return False
+        try:
+            self._file.seek(PRESET_HEADER_SIZE + index * PRESET_RECORD_SIZE)
+            length = self._file.readinto(record)
+        except OSError as e:
+            print(f"Error reading {self.path}: {e}")
+            return False
+        self.reads += 1
+        if length != PRESET_RECORD_SIZE:
+            return False
+        version = record[0]
+        if version == 0 or version > PRESET_CODEC.version:
+            return False  # Empty slot or written by newer firmware
+        crc_offset = PRESET_RECORD_SIZE - struct.calcsize(PRESET_CRC_FORMAT)
+        (crc,) = struct.unpack_from(PRESET_CRC_FORMAT, record, crc_offset)
+        return crc == crc16(memoryview(record)[:crc_offset])
+
+    def prefetch(self):
+        """Read the preset after the current one into RAM (call from the main loop)"""
+        index = self.current + 1  # Preset 0 before the first recall
+        if index == self.staged_index:
+            return
+        self.staged_valid = self._read(index, self.staged)
+        self.staged_index = index
+
+    def request(self, index):
+        """
+        Queue a preset for the next step (MIDI Program Change)
+
+        Args:
+            index: Preset slot (program number)
+
+        Returns:
+            True if the preset was found
+        """
+        if index != self.staged_index or not self.staged_valid:
+            # Read into the spare buffer: a queued preset stays intact if this fails
+            self.staged_index = index
+            self.staged_valid = self._read(index, self.staged)
+            if not self.staged_valid:
+                print(f"Preset {index} is empty")
+                return False
+        # Swap buffers (no file access when it was read ahead)
+        self.pending, self.staged = self.staged, self.pending
+        self.staged_index = NO_PRESET
+        self.staged_valid = False
+        self.pending_index = index
+        return True
+
+    def apply_pending(self, settings):
+        """
+        Apply the queued preset, if any (call at the start of a step)
+
+        Args:
+            settings: Settings object to update
+
+        Returns:
+            True if a preset was applied
+        """
+        if self.pending_index == NO_PRESET:
+            return False
+        PRESET_CODEC.decode(settings, memoryview(self.pending)[1:], self.pending[0])
+        settings.save()  # Bumps revision: arpeggiator, router and display follow
+        self.current = self.pending_index
+        self.pending_index = NO_PRESET
+        return True
+
+    def store(self, index, settings):
+        """
+        Write the current settings to a preset slot (creates the file if needed)
+
+        Args:
+            index: Preset slot (0 to PRESET_COUNT - 1)
+            settings: Settings object to store
+
+        Returns:
+            True if the preset was written
+        """
+        if index < 0 or index >= PRESET_COUNT:
+            print(f"Preset {index} out of range")
+            return False
+
+        record = bytearray(PRESET_RECORD_SIZE)
+        record[0] = PRESET_CODEC.version
+        payload = PRESET_CODEC.encode(settings)
+        record[1:1 + len(payload)] = payload
+        crc_offset = PRESET_RECORD_SIZE - struct.calcsize(PRESET_CRC_FORMAT)
+        struct.pack_into(PRESET_CRC_FORMAT, record, crc_offset, crc16(record[:crc_offset]))
+
+        self.close()
+        try:
+            try:
+                f = open(self.path, "r+b")
+                header = f.read(PRESET_HEADER_SIZE)
+            except OSError:
+                f = open(self.path, "w+b")
+                header = b""
+            with f:
+                if len(header) == PRESET_HEADER_SIZE:
+                    magic, record_size, count = struct.unpack(PRESET_HEADER_FORMAT, header)
+                    if magic != PRESET_FILE_MAGIC or record_size != PRESET_RECORD_SIZE:
+                        count = 0
+                else:
+                    count = 0
+                if count == 0:
+                    # New file: header and empty slots
+                    count = PRESET_COUNT
+                    f.seek(0)
+                    f.write(struct.pack(PRESET_HEADER_FORMAT, PRESET_FILE_MAGIC,
+                                        PRESET_RECORD_SIZE, PRESET_COUNT))
+                    f.write(bytes(PRESET_COUNT * PRESET_RECORD_SIZE))
+                if index >= count:
+                    print(f"Preset file only has {count} slots")
+                    return False
+                f.seek(PRESET_HEADER_SIZE + index * PRESET_RECORD_SIZE)
+                f.write(record)
+        except OSError as e:
+            print(f"Error writing {self.path}: {e}")
+            return False
+
+        if index == self.staged_index:
+            self.staged_index = NO_PRESET  # Stale copy
+            self.staged_valid = False
+        print(f"Preset {index} stored")
+        return True
@@ -0,0 +1,243 @@
+"""
+Scale bank for scale quantization
+Built-in scales plus user scales from a text file on CIRCUITPY, as 12-bit masks
+
+Each scale is a 12-bit mask over the pitch classes above the root
+(bit 0 = root, bit 11 = major seventh). For the active scale two 12-byte
+tables hold the distance to the next scale degree up and down from each
+pitch class, so the nearest degree is two lookups.
+
+User scales file (/scales.txt), one scale per line:
+
+    # Maqam approximations in 12-TET
+    Hijaz: 0 1 4 5 7 8 10
+    Rast: 0 2 4 5 7 9 10
+    Saba: 011100110100
+
+Degrees are semitones above the root (0-11); a 12-digit 0/1 string is a
+mask written root first. The file is only scanned when the scale list is
+first needed, and only line offsets are kept: a scale's name and mask are
+read from disk when it is selected, so just the active scale is in RAM.
+"""
+
+from array import array
+
+# User scales file on CIRCUITPY
+SCALES_PATH = "/scales.txt"
+
+# scale_type is stored as one byte
+MAX_SCALES = 256
+
+# All 12 pitch classes
+CHROMATIC_MASK = 0xFFF
+
+
+def intervals_to_mask(intervals):
+    """
+    Convert scale degrees to a 12-bit mask
+
+    Args:
+        intervals: Semitones above the root (0-11)
+
+    Returns:
+        Mask with bit n set for each degree n
+    """
+    mask = 0
+    for interval in intervals:
+        mask |= 1 << (interval % 12)
+    return mask
+
+
+def parse_scale_line(line):
+    """
+    Parse one line of the user scales file
+
+    Args:
+        line: "Name: 0 2 4 ..." or "Name: 101011010101"
+
+    Returns:
+        (name, mask), or None for blank lines, comments and invalid lines
+    """
+    line = line.strip()
+    if not line or line.startswith("#"):
+        return None
+    colon = line.find(":")
+    if colon <= 0:
+        return None
+    name = line[:colon].strip()
+    degrees = line[colon + 1:].split()
+
+    try:
+        if len(degrees) == 1 and len(degrees[0]) == 12:
+            # Mask written root first
+            mask = 0
+            for bit in range(12):
+                digit = degrees[0][bit]
+                if digit == "1":
+                    mask |= 1 << bit
+                elif digit != "0":
+                    return None
+        else:
+            intervals = [int(degree) for degree in degrees]
+            for interval in intervals:
+                if interval < 0 or interval > 11:
+                    return None
+            mask = intervals_to_mask(intervals)
+    except ValueError:
+        return None
+
+    if mask == 0:
+        return None
+    return (name, mask)
+
+
+class ScaleBank:
+    """Built-in and user scales with an O(1) nearest-degree lookup for the active one"""
+
+    def __init__(self, builtin_intervals, builtin_names, path=SCALES_PATH):
+        """
+        Initialize bank (does not touch the file yet)
+
+        Args:
+            builtin_intervals: dict of scale index -> degree list (indices 0..n-1)
+            builtin_names: Names of the built-in scales, by index
+            path: User scales file
+        """
+        self.builtin_masks = array('H', [0] * len(builtin_intervals))
+        for index in range(len(builtin_intervals)):
+            self.builtin_masks[index] = intervals_to_mask(builtin_intervals[index])
+        self.builtin_names = builtin_names
+        self.path = path
+
+        # File offsets of the user scale lines (None until scanned)
+        self.offsets = None
+
+        # Active scale
+        self.active = None  # Scale index
+        self.name = ""
+        self.mask = 0
+        self.up = bytearray(12)  # Semitones up to the next degree (0 = in scale)
+        self.down = bytearray(12)  # Semitones down to the next degree
+
+    def _scan(self):
+        """Index the user scales file (line offsets only)"""
+        self.offsets = array('L')
+        limit = MAX_SCALES - len(self.builtin_masks)
+        try:
+            with open(self.path, "rb") as f:
+                offset = 0
+                line = f.readline()
+                while line and len(self.offsets) < limit:
+                    if parse_scale_line(line.decode()) is not None:
+                        self.offsets.append(offset)
+                    offset += len(line)
+                    line = f.readline()
+        except OSError:
+            return  # No user scales
+        except UnicodeError as e:
+            print(f"Error reading {self.path}: {e}")
+            return
+        if self.offsets:
+            print(f"Scale bank: {len(self.offsets)} user scales")
+
+    def _read(self, index):
+        """
+        Read a user scale from disk
+
+        Args:
+            index: Scale index (>= number of built-in scales)
+
+        Returns:
+            (name, mask), or None if it can't be read
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offsets[index - len(self.builtin_masks)])
+                return parse_scale_line(f.readline().decode())
+        except (OSError, UnicodeError) as e:
+            print(f"Error reading {self.path}: {e}")
+            return None
+
+    def count(self):
+        """Number of scales (built-in + user), scanning the file on first use"""
+        if self.offsets is None:
+            self._scan()
+        return len(self.builtin_masks) + len(self.offsets)
+
+    def get_name(self, index):
+        """
+        Get a scale's name (reads user scales from disk unless active)
+
+        Args:
+            index: Scale index
+
+        Returns:
+            Scale name, or "Unknown"
+        """
+        if index < len(self.builtin_masks):
+            return self.builtin_names[index]
+        if index == self.active:
+            return self.name
+        if index >= self.count():
+            return "Unknown"
+        scale = self._read(index)
+        return scale[0] if scale else "Unknown"
+
+    def select(self, index):
+        """
+        Make a scale active and build its next-up/next-down tables
+
+        Args:
+            index: Scale index (unknown indices select chromatic)
+
+        Returns:
+            True if the scale was found
+        """
+        scale = None
+        if 0 <= index < len(self.builtin_masks):
+            scale = (self.builtin_names[index], self.builtin_masks[index])
+        elif index < self.count():
+            scale = self._read(index)
+
+        found = scale is not None
+        if not found:
+            print(f"Scale {index} not found, using chromatic")
+            scale = ("Unknown", CHROMATIC_MASK)
+
+        self.active = index
+        self.name, self.mask = scale
+        self._build_tables()
+        return found
+
+    def _build_tables(self):
+        """Distance from each pitch class to the nearest degree above and below"""
+        mask = self.mask
+        for pitch in range(12):
+            distance = 0
+            while not mask & (1 << ((pitch + distance) % 12)):
+                distance += 1
+            self.up[pitch] = distance
+            distance = 0
+            while not mask & (1 << ((pitch - distance) % 12)):
+                distance += 1
+            self.down[pitch] = distance
+
+    def nearest(self, relative):
+        """
+        Find the nearest degree of the active scale
+
+        Args:
+            relative: Pitch class above the root (0-11)
+
+        Returns:
+            Nearest degree (0-11); on a tie the lower degree
+        """
+        up = self.up[relative]
+        down = self.down[relative]
+        if up < down:
+            return (relative + up) % 12
+        if down < up:
+            return (relative - down) % 12
+        above = (relative + up) % 12
+        below = (relative - down) % 12
+        return above if above < below else below
@@ -0,0 +1,136 @@
+"""
+Schema-driven bit-packed codec for settings records
+Generates encode/decode and version migrations from one field table
+
+A schema is a tuple of fields, in storage order:
+
+    (name, bits, default, version, scale)
+
+- name: Attribute name on the settings object
+- bits: Stored width (values are clamped to 0 .. 2**bits - 1)
+- default: Value for records written before the field existed; its type
+  selects the conversion (bool, int, or float stored as round(value * scale))
+- version: Format version the field was added in
+- scale: int fields store value // scale (e.g. 180 for 0/180 degrees),
+  float fields store round(value * scale); 1 = as is
+
+Fields are only ever appended, so a record of version N holds exactly the
+fields with version <= N, in table order, and newer fields take their
+default (the migration). The packed fields form one little-endian integer,
+unpacked in a single pass.
+
+Tables for fixed-layout legacy formats (apply_values) may name a field
+None: it is present in the record but no longer loaded.
+"""
+
+# Field tuple indices
+FIELD_NAME = 0
+FIELD_BITS = 1
+FIELD_DEFAULT = 2
+FIELD_VERSION = 3
+FIELD_SCALE = 4
+
+
+class SchemaCodec:
+    """Packs and unpacks the schema's fields to/from bytes"""
+
+    def __init__(self, schema, version):
+        """
+        Initialize codec
+
+        Args:
+            schema: Field table (see module docstring)
+            version: Current format version (records are written as this)
+        """
+        self.schema = schema
+        self.version = version
+
+    def bit_count(self, version=None):
+        """Bits used by a record of version (default: current)"""
+        if version is None:
+            version = self.version
+        bits = 0
+        for field in self.schema:
+            if field[FIELD_VERSION] <= version:
+                bits += field[FIELD_BITS]
+        return bits
+
+    def size(self, version=None):
+        """Bytes used by a record of version (default: current)"""
+        return (self.bit_count(version) + 7) // 8
+
+    def encode(self, obj):
+        """
+        Pack obj's fields as a current-version record
+
+        Args:
+            obj: Object with an attribute per field
+
+        Returns:
+            bytes of size()
+        """
+        packed = 0
+        shift = 0
+        for name, bits, default, version, scale in self.schema:
+            if version > self.version:
+                continue
+            value = getattr(obj, name)
+            if isinstance(default, float):
+                value = int(round(value * scale))
+            else:
+                value = int(value) // scale
+            limit = (1 << bits) - 1
+            if value < 0:
+                value = 0
+            elif value > limit:
+                value = limit
+            packed |= value << shift
+            shift += bits
+        return packed.to_bytes(self.size(), 'little')
+
+    def decode(self, obj, data, version):
+        """
+        Unpack a record into obj; fields newer than the record get defaults
+
+        Args:
+            obj: Object to set attributes on
+            data: Record bytes (at least size(version))
+            version: Format version the record was written with
+        """
+        packed = int.from_bytes(bytes(data[:self.size(version)]), 'little')
+        for name, bits, default, field_version, scale in self.schema:
+            if field_version > version:
+                setattr(obj, name, default)
+                continue
+            value = packed & ((1 << bits) - 1)
+            packed >>= bits
+            if isinstance(default, bool):
+                value = bool(value)
+            elif isinstance(default, float):
+                value = value / scale
+            else:
+                value *= scale
+            setattr(obj, name, value)
+
+    def apply_values(self, obj, values, version):
+        """
+        Set fields from unpacked values in schema order (fixed-layout formats)
+
+        Args:
+            obj: Object to set attributes on
+            values: One value per field of version, in table order
+            version: Format version of values; newer fields get defaults
+                (fields named None are skipped)
+        """
+        index = 0
+        for name, bits, default, field_version, scale in self.schema:
+            if field_version > version:
+                setattr(obj, name, default)
+                continue
+            value = values[index]
+            index += 1
+            if name is None:
+                continue  # Removed setting (keeps later fields in place)
+            if isinstance(default, bool):
+                value = bool(value)
+            setattr(obj, name, value)
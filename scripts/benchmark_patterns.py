@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Pattern Regeneration Benchmark
+
+Compares rebuilding the arpeggiator step map through the pattern chain
+(SequenceEngine.use_cache = False) against compiled table lookup, for
+every pattern and a range of held-note counts and octave ranges. Each
+pattern/octave setting is held for a while (chords change underneath it),
+like a player sticking with a pattern.
+
+Runs on the host (CPython) - relative numbers only, the M4 is much slower.
+
+Usage:
+    python3 scripts/benchmark_patterns.py
+    python3 scripts/benchmark_patterns.py --rounds 200
+    python3 scripts/benchmark_patterns.py --budget 65536   # Everything resident
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings imports microcontroller (NVM) - mock it on the host, as tests/conftest.py does
+sys.modules.setdefault('microcontroller', MagicMock())
+
+from prisme.core.sequence import (  # noqa: E402
+    SequenceEngine, PatternCompiler, PATTERN_CACHE_BYTES
+)
+
+PATTERNS = range(17)
+HELD_COUNTS = (1, 3, 4, 8, 16)
+OCTAVES = (1, 2, 4)
+
+
+def make_engine(held, compiler):
+    """Create an engine holding `held` notes from C3 up"""
+    engine = SequenceEngine(compiler)
+    engine.use_cache = compiler is not None
+    for i in range(held):
+        engine.insert(48 + i * 2, 100)
+    return engine
+
+
+def time_builds(compiler, rounds):
+    """Time `rounds` builds per held count for every pattern/octave setting
+
+    Args:
+        compiler: Shared PatternCompiler, or None for the pattern chain
+
+    Returns:
+        (seconds, builds) tuple
+    """
+    engines = [make_engine(held, compiler) for held in HELD_COUNTS]
+    builds = 0
+    start = time.perf_counter()
+    for pattern in PATTERNS:
+        for octaves in OCTAVES:
+            for _ in range(rounds):
+                for engine in engines:
+                    engine.build(pattern, octaves, octaves)
+                    builds += 1
+    return time.perf_counter() - start, builds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark pattern regeneration")
+    parser.add_argument('--rounds', type=int, default=100,
+                        help="Builds per held count per setting (default: 100)")
+    parser.add_argument('--budget', type=int, default=PATTERN_CACHE_BYTES,
+                        help=f"Cache budget in bytes (default: {PATTERN_CACHE_BYTES})")
+    args = parser.parse_args()
+
+    compiler = PatternCompiler(args.budget)
+    chain_time, builds = time_builds(None, args.rounds)
+    cache_time, _ = time_builds(compiler, args.rounds)
+    hits = compiler.hits
+    misses = compiler.misses
+
+    print(f"Builds per run:  {builds}")
+    print(f"Pattern chain:   {chain_time * 1e6 / builds:8.2f} us/build")
+    print(f"Compiled table:  {cache_time * 1e6 / builds:8.2f} us/build")
+    print(f"Speedup:         {chain_time / cache_time:8.2f}x")
+    print(f"Cache hit rate:  {hits * 100 / (hits + misses):8.1f}%")
+
+
+if __name__ == "__main__":
+    main()
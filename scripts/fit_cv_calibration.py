@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+CV Calibration Fitting Tool
+
+Fits per-channel calibration points from voltages measured at the CV jacks
+(e.g. with tests/cv_1v_octave_test.py and a multimeter) and prints:
+    - The DAC code that produces 0V, 1V ... 5V on each channel
+    - A REPL snippet that stores those points in NVM on the device
+    - Optionally, the corrected 128-note pitch table (--table)
+
+CSV format (header required, one row per measurement):
+    channel,code,volts
+    A,0,0.004
+    A,819,1.012
+    A,1638,2.019
+    ...
+
+channel is A-D or 0-3, code is the 12-bit raw_value written, volts is the
+measured output. At least two measurements per channel; one per octave
+(codes 0, 819, 1638, 2457, 3276, 4095) is recommended.
+
+Usage:
+    python3 scripts/fit_cv_calibration.py measurements.csv
+    python3 scripts/fit_cv_calibration.py measurements.csv --table --scale 1.035
+"""
+
+import sys
+import csv
+import argparse
+from pathlib import Path
+from unittest.mock import MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# calibration imports microcontroller (NVM) - mock it on the host, as tests/conftest.py does
+sys.modules.setdefault('microcontroller', MagicMock())
+
+from prisme.utils.calibration import (  # noqa: E402
+    CVCalibration, CALIBRATION_POINTS
+)
+
+CHANNEL_NAMES = "ABCD"
+
+
+def parse_channel(value):
+    """Parse a channel column value (A-D or 0-3) to 0-3"""
+    value = value.strip().upper()
+    if value in CHANNEL_NAMES:
+        return CHANNEL_NAMES.index(value)
+    channel = int(value)
+    if not 0 <= channel <= 3:
+        raise ValueError(f"Channel out of range: {value}")
+    return channel
+
+
+def read_measurements(path):
+    """Read the CSV into {channel: [(code, volts), ...]} sorted by code"""
+    measurements = {}
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            channel = parse_channel(row['channel'])
+            measurements.setdefault(channel, []).append((int(row['code']), float(row['volts'])))
+    for points in measurements.values():
+        points.sort()
+    return measurements
+
+
+def fit_channel(points):
+    """
+    Find the DAC code for each whole volt from measured (code, volts) pairs
+
+    Interpolates linearly between neighbouring measurements, extrapolating
+    from the nearest segment outside the measured range.
+
+    Args:
+        points: [(code, volts), ...] sorted by code, at least 2 entries
+
+    Returns:
+        List of CALIBRATION_POINTS codes (0-4095)
+    """
+    if len(points) < 2:
+        raise ValueError("Need at least 2 measurements per channel")
+
+    codes = []
+    for target in range(CALIBRATION_POINTS):
+        # Segment that brackets the target voltage (or the nearest end segment)
+        index = 0
+        while index < len(points) - 2 and points[index + 1][1] < target:
+            index += 1
+        (code_low, volts_low), (code_high, volts_high) = points[index], points[index + 1]
+        if volts_high == volts_low:
+            raise ValueError(f"Measurements at codes {code_low} and {code_high} read the same voltage")
+
+        code = code_low + (target - volts_low) * (code_high - code_low) / (volts_high - volts_low)
+        codes.append(max(0, min(CVCalibration.DAC_MAX_VALUE, int(round(code)))))
+    return codes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit CV calibration points from measured voltages")
+    parser.add_argument('csv', help="Measurements CSV (channel,code,volts)")
+    parser.add_argument('--table', action='store_true',
+                        help="Print the corrected 128-note pitch table for channel A")
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Volts per octave for --table (default: 1.0)")
+    args = parser.parse_args()
+
+    measurements = read_measurements(args.csv)
+    calibration = CVCalibration()
+
+    print("Calibration points (DAC code for 0V..5V):")
+    for channel in sorted(measurements):
+        codes = fit_channel(measurements[channel])
+        calibration.set_channel_points(channel, codes)
+        ideal = [calibration.ideal_code(v) for v in range(CALIBRATION_POINTS)]
+        errors = ", ".join(f"{c - i:+d}" for c, i in zip(codes, ideal))
+        print(f"  {CHANNEL_NAMES[channel]}: {codes}  (vs ideal: {errors})")
+
+    print("\nPaste into the device REPL to store in NVM:")
+    print("  from prisme.utils.calibration import CVCalibration")
+    print("  cal = CVCalibration()")
+    for channel in range(len(CHANNEL_NAMES)):
+        print(f"  cal.set_channel_points({channel}, {calibration.get_channel_points(channel)})")
+    print("  cal.save()")
+
+    if args.table:
+        table = calibration.build_pitch_table(0, args.scale)
+        print(f"\nCorrected pitch table (channel A, {args.scale}V/oct):")
+        for start in range(0, 128, 16):
+            print("  " + ", ".join(f"{code:4d}" for code in table[start:start + 16]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Host Runtime Simulation
+
+Runs the asyncio task runtime (prisme/core/runtime.py) on CPython with the
+CircuitPython mocks from tests/conftest.py: a real internal ClockHandler
+plus stand-ins for slow subsystems (display refresh, gc.collect). Prints
+step and tick lateness and per-task stats, and with --compare also runs
+the same work in the original fixed-order polling loop.
+
+Slow tasks are scheduled around steps, not ticks (at fast tempos a tick
+is shorter than a display refresh), so tick lateness improves less.
+
+Runs on the host (CPython) - relative numbers only, the M4 is much slower.
+
+Usage:
+    python3 scripts/run_host_runtime.py
+    python3 scripts/run_host_runtime.py --bpm 240 --display-ms 25 --compare
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tests"))
+
+import conftest  # noqa: E402,F401  (installs the CircuitPython module mocks)
+
+from prisme.core.clock import ClockHandler  # noqa: E402
+from prisme.core.runtime import (  # noqa: E402
+    Runtime, PRIORITY_CLOCK, PRIORITY_INPUT, PRIORITY_UI, PRIORITY_BACKGROUND
+)
+
+MS = 1000000
+
+
+def busy(ms):
+    """Hold the CPU like a blocking I2C transfer would"""
+    end = time.monotonic_ns() + int(ms * MS)
+    while time.monotonic_ns() < end:
+        pass
+
+
+class Workload:
+    """Clock plus simulated subsystems"""
+
+    def __init__(self, bpm, display_ms, display_period_ms, gc_ms):
+        self.clock = ClockHandler(midi_in_port=None)
+        self.clock.set_internal_bpm(bpm)
+        self.clock.set_clock_source(ClockHandler.CLOCK_INTERNAL)
+        self.clock.start()
+        self.clock.set_step_callback(self.on_step)
+        self.step_lateness_ns = []
+        self.display_ms = display_ms
+        self.display_period_ns = int(display_period_ms * MS)
+        self.gc_ms = gc_ms
+        self.last_frame_ns = 0
+
+    def on_step(self):
+        # The step's due time is the tick that triggered it
+        self.step_lateness_ns.append(time.monotonic_ns() - self.clock.last_internal_tick_ns)
+
+    def poll_midi(self):
+        pass  # Nothing to read on the host
+
+    def render_display(self):
+        now = time.monotonic_ns()
+        if now - self.last_frame_ns >= self.display_period_ns:
+            self.last_frame_ns = now
+            busy(self.display_ms)
+
+    def collect_garbage(self):
+        busy(self.gc_ms)
+
+
+def run_loop(work, seconds):
+    """The original fixed-order loop"""
+    end = time.monotonic() + seconds
+    gc_counter = 0
+    while time.monotonic() < end:
+        work.poll_midi()
+        work.clock.process_clock_messages()
+        work.render_display()
+        gc_counter += 1
+        if gc_counter >= 100:
+            work.collect_garbage()
+            gc_counter = 0
+        time.sleep(0.001)
+
+
+def run_runtime(work, seconds):
+    """The same work as runtime tasks"""
+    runtime = Runtime(deadline=work.clock.get_next_step_ns)
+    runtime.add_task("clock", work.clock.process_clock_messages, PRIORITY_CLOCK)
+    runtime.add_task("midi", work.poll_midi, PRIORITY_INPUT)
+    runtime.add_task("display", work.render_display, PRIORITY_UI,
+                     budget_ns=int((work.display_ms + 1) * MS))
+    runtime.add_task("gc", work.collect_garbage, PRIORITY_BACKGROUND,
+                     period_ns=100 * MS, budget_ns=int((work.gc_ms + 1) * MS))
+    asyncio.run(runtime.run(duration_ns=int(seconds * 1e9)))
+    return runtime
+
+
+def print_lateness(name, work):
+    lateness = sorted(work.step_lateness_ns)
+    if lateness:
+        p99 = lateness[min(len(lateness) - 1, len(lateness) * 99 // 100)]
+        print(f"{name}: {len(lateness)} steps, lateness mean {sum(lateness) // len(lateness) // 1000} us, "
+              f"p99 {p99 // 1000} us, max {lateness[-1] // 1000} us")
+    stats = work.clock.get_jitter_stats()
+    print(f"{' ' * len(name)}  {stats['ticks']} ticks, lateness mean {stats['mean_us']} us, "
+          f"p99 {stats['p99_us']} us, max {stats['max_us']} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the prisme task runtime on the host")
+    parser.add_argument('--seconds', type=float, default=3.0, help="Run time (default: 3)")
+    parser.add_argument('--bpm', type=int, default=180, help="Internal clock BPM (default: 180)")
+    parser.add_argument('--display-ms', type=float, default=15.0,
+                        help="Simulated display refresh time (default: 15)")
+    parser.add_argument('--display-period-ms', type=float, default=50.0,
+                        help="Time between display refreshes (default: 50)")
+    parser.add_argument('--gc-ms', type=float, default=8.0,
+                        help="Simulated gc.collect() time (default: 8)")
+    parser.add_argument('--compare', action='store_true',
+                        help="Also run the original polling loop")
+    args = parser.parse_args()
+
+    work = Workload(args.bpm, args.display_ms, args.display_period_ms, args.gc_ms)
+    runtime = run_runtime(work, args.seconds)
+    print_lateness("runtime", work)
+    for name, stats in runtime.get_stats().items():
+        if name != 'passes':
+            print(f"  {name:8s} {stats}")
+
+    if args.compare:
+        work = Workload(args.bpm, args.display_ms, args.display_period_ms, args.gc_ms)
+        run_loop(work, args.seconds)
+        print_lateness("loop   ", work)
+
+
+if __name__ == "__main__":
+    main()
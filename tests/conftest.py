@@ -25,8 +25,10 @@ sys.modules['adafruit_midi.note_on'] = MagicMock()
 sys.modules['adafruit_midi.note_off'] = MagicMock()
 sys.modules['adafruit_midi.control_change'] = MagicMock()
 sys.modules['adafruit_midi.pitch_bend'] = MagicMock()
+sys.modules['adafruit_midi.channel_pressure'] = MagicMock()
 sys.modules['microcontroller'] = MagicMock()
 sys.modules['displayio'] = MagicMock()
+sys.modules['bitmaptools'] = MagicMock()
 sys.modules['i2cdisplaybus'] = MagicMock()
 sys.modules['adafruit_displayio_sh1107'] = MagicMock()
 sys.modules['adafruit_display_text'] = MagicMock()
@@ -37,6 +39,22 @@ sys.modules['analogio'] = MagicMock()
 sys.modules['pwmio'] = MagicMock()
 
 
+def pytest_addoption(parser):
+    """Options for the host benchmarks (tests/test_benchmarks.py)
+
+    Args:
+        parser: pytest option parser
+    """
+    parser.addoption('--prisme-bench', action='store_true', default=False,
+                     help="Run the host benchmarks (skipped otherwise)")
+    parser.addoption('--prisme-bench-save', action='store_true', default=False,
+                     help="Write the benchmark results as the new baseline")
+    parser.addoption('--prisme-bench-baseline', default=None,
+                     help="Baseline JSON file (default: tests/benchmark_baseline.json)")
+    parser.addoption('--prisme-bench-threshold', type=float, default=25.0,
+                     help="Allowed slowdown against the baseline in percent (default: 25)")
+
+
 def pytest_runtest_setup(item):
     """Called before each test (kept for compatibility)
 
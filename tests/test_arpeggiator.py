@@ -0,0 +1,336 @@
+"""Unit tests for the arpeggiator sequence engine
+
+Checks that the incremental SequenceEngine produces exactly the same
+step sequences as the original list-rebuilding generator for every
+pattern, octave range and held-note set.
+
+Run with: pytest tests/test_arpeggiator.py -v
+"""
+
+import pytest
+import random
+import sys
+import os
+import tracemalloc
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils.config import Settings
+from prisme.core.arpeggiator import Arpeggiator
+from prisme.core.sequence import SequenceEngine, PatternCompiler, MAX_HELD_NOTES
+from prisme.drivers.midi_output import MidiIO
+
+
+class MockMidiIO:
+    """Mock MidiIO that records sent notes"""
+    def __init__(self):
+        self.sent = []  # List of ('on'/'off', note, channel)
+
+    def send_note_on(self, note, velocity, channel=0):
+        self.sent.append(('on', note, channel))
+
+    def send_note_off(self, note, channel=0):
+        self.sent.append(('off', note, channel))
+
+
+class FakePort:
+    """Output port that keeps the last written buffer (no copies, no counters)"""
+    def __init__(self):
+        self.last = None
+
+    def write(self, data):
+        self.last = data
+
+
+def legacy_sequence(played, settings):
+    """Reference: the original list-rebuilding _generate_sequence()
+
+    Args:
+        played: List of (note, velocity) tuples in play order
+        settings: Settings object
+
+    Returns:
+        List of (note, velocity) tuples
+    """
+    if not played:
+        return []
+    sorted_notes = sorted(played, key=lambda x: x[0])
+    expanded = []
+    for octave in range(settings.octave_range):
+        for note, velocity in sorted_notes:
+            if note + octave * 12 <= 127:
+                expanded.append((note + octave * 12, velocity))
+
+    p = settings.pattern
+    if p == Settings.ARP_UP or p == Settings.ARP_RANDOM:
+        return expanded
+    if p == Settings.ARP_DOWN:
+        return list(reversed(expanded))
+    if p == Settings.ARP_UP_DOWN:
+        return expanded + list(reversed(expanded[1:-1])) if len(expanded) > 1 else expanded
+    if p == Settings.ARP_DOWN_UP:
+        if len(expanded) > 1:
+            return list(reversed(expanded)) + expanded[1:-1]
+        return list(reversed(expanded))
+    if p == Settings.ARP_UP_DOWN_INC:
+        return expanded + list(reversed(expanded[1:])) if len(expanded) > 1 else expanded
+    if p == Settings.ARP_DOWN_UP_INC:
+        if len(expanded) > 1:
+            return list(reversed(expanded)) + expanded[1:]
+        return list(reversed(expanded))
+    if p == Settings.ARP_UP_2X:
+        return [n for n in expanded for _ in range(2)]
+    if p == Settings.ARP_DOWN_2X:
+        return [n for n in reversed(expanded) for _ in range(2)]
+    if p == Settings.ARP_CONVERGE:
+        out = []
+        left, right = 0, len(expanded) - 1
+        while left <= right:
+            out.append(expanded[left])
+            if left < right:
+                out.append(expanded[right])
+            left += 1
+            right -= 1
+        return out
+    if p == Settings.ARP_DIVERGE:
+        out = []
+        if expanded:
+            middle = len(expanded) // 2
+            out.append(expanded[middle])
+            for i in range(1, max(middle + 1, len(expanded) - middle)):
+                if middle - i >= 0:
+                    out.append(expanded[middle - i])
+                if middle + i < len(expanded):
+                    out.append(expanded[middle + i])
+        return out
+    if p == Settings.ARP_PINKY_UP:
+        if len(expanded) < 4:
+            return expanded
+        out = []
+        for i in range(len(expanded) - 1):
+            out.append(expanded[i])
+            if (i + 1) % 3 == 0:
+                out.append(expanded[-1])
+        return out
+    if p == Settings.ARP_THUMB_UP:
+        if len(expanded) < 4:
+            return expanded
+        out = []
+        for i in range(1, len(expanded)):
+            if i % 3 == 1:
+                out.append(expanded[0])
+            out.append(expanded[i])
+        return out
+    if p == Settings.ARP_OCTAVE_UP:
+        root, velocity = sorted_notes[0]
+        return [(root + o * 12, velocity) for o in range(settings.octave_range)
+                if root + o * 12 <= 127]
+    if p == Settings.ARP_CHORD_REPEAT:
+        return expanded * 3
+    if p == Settings.ARP_AS_PLAYED:
+        out = []
+        for note, velocity in played:
+            for o in range(settings.octave_range):
+                if note + o * 12 <= 127:
+                    out.append((note + o * 12, velocity))
+        return out
+    if p == Settings.ARP_STRUM:
+        strum = []
+        for octave in range(settings.strum_octaves):
+            for note, velocity in sorted_notes:
+                if note + octave * 12 <= 127:
+                    strum.append((note + octave * 12, velocity))
+        if settings.strum_direction == Settings.STRUM_DOWN:
+            return list(reversed(strum))
+        if settings.strum_direction == Settings.STRUM_UP_DOWN and len(strum) > 1:
+            return strum + list(reversed(strum[1:-1]))
+        return strum
+    raise AssertionError(f"Unknown pattern {p}")
+
+
+CHORDS = [
+    [(60, 100)],
+    [(64, 90), (60, 100)],
+    [(67, 80), (60, 100), (64, 90)],
+    [(72, 50), (60, 100), (67, 80), (64, 90), (71, 70)],
+    [(100, 100), (110, 90), (96, 80), (120, 70)],  # Clipped near note 127
+    [(n, 64 + i) for i, n in enumerate([48, 55, 60, 62, 64, 67, 69, 71, 72])],
+]
+
+
+@pytest.mark.parametrize("pattern", range(17))
+@pytest.mark.parametrize("octaves", range(5))
+def test_sequence_matches_legacy_generator(pattern, octaves):
+    """Every pattern/octave/chord combination matches the original generator"""
+    for chord in CHORDS:
+        for strum_direction in (Settings.STRUM_UP, Settings.STRUM_DOWN, Settings.STRUM_UP_DOWN):
+            settings = Settings()
+            settings.pattern = pattern
+            settings.octave_range = octaves
+            settings.strum_octaves = max(1, octaves)
+            settings.strum_direction = strum_direction
+            arp = Arpeggiator(settings, MockMidiIO())
+            for note, velocity in chord:
+                arp.add_note(note, velocity)
+            assert arp.step_sequence == legacy_sequence(chord, settings)
+
+
+def test_incremental_add_remove_matches_rebuild():
+    """Random note on/off streams stay identical to a full rebuild"""
+    rng = random.Random(1234)
+    settings = Settings()
+    for pattern in range(17):
+        settings.pattern = pattern
+        settings.octave_range = 3
+        arp = Arpeggiator(settings, MockMidiIO())
+        played = []
+        for _ in range(200):
+            note = rng.randint(40, 120)
+            if any(n == note for n, v in played):
+                arp.remove_note(note)
+                played = [(n, v) for n, v in played if n != note]
+            elif len(played) < MAX_HELD_NOTES:
+                velocity = rng.randint(1, 127)
+                arp.add_note(note, velocity)
+                played.append((note, velocity))
+            assert arp.step_sequence == legacy_sequence(played, settings)
+            assert arp.note_buffer == sorted(played)
+
+
+def test_engine_ignores_duplicates_and_overflow():
+    """Duplicate notes are rejected and the buffer is capped"""
+    engine = SequenceEngine()
+    assert engine.insert(60, 100)
+    assert not engine.insert(60, 50)
+    for note in range(61, 61 + MAX_HELD_NOTES):
+        engine.insert(note, 100)
+    assert engine.count == MAX_HELD_NOTES
+    assert engine.index_of(60) == 0
+    assert not engine.remove(20)
+
+
+def test_compiled_tables_match_pattern_chain():
+    """Cached tables produce the same steps as the uncached pattern chain"""
+    rng = random.Random(99)
+    cached = SequenceEngine(PatternCompiler())
+    uncached = SequenceEngine(PatternCompiler())
+    uncached.use_cache = False
+    for _ in range(300):
+        note = rng.randint(30, 120)
+        if cached.index_of(note) >= 0:
+            cached.remove(note)
+            uncached.remove(note)
+        else:
+            velocity = rng.randint(1, 127)
+            cached.insert(note, velocity)
+            uncached.insert(note, velocity)
+        pattern = rng.randrange(17)
+        octaves = rng.randint(0, 4)
+        cached.build(pattern, octaves, octaves or 1)
+        uncached.build(pattern, octaves, octaves or 1)
+        assert cached.steps[:cached.length] == uncached.steps[:uncached.length]
+
+
+def test_pattern_cache_evicts_least_recently_used():
+    """The compiler stays within its byte budget, dropping the oldest table"""
+    compiler = PatternCompiler(max_bytes=40)
+    first = compiler.lookup(Settings.ARP_UP, 4, 4)  # 16 bytes
+    compiler.lookup(Settings.ARP_DOWN, 4, 4)  # 16 bytes
+    assert compiler.lookup(Settings.ARP_UP, 4, 4) is first  # Hit, now newest
+    compiler.lookup(Settings.ARP_CONVERGE, 4, 4)  # Evicts Down
+
+    assert compiler.size <= 40
+    assert compiler.lookup(Settings.ARP_UP, 4, 4) is first
+    assert compiler.hits == 2
+    compiler.lookup(Settings.ARP_DOWN, 4, 4)
+    assert compiler.misses == 4
+
+
+def test_step_plays_sequence_in_order():
+    """step() walks the generated sequence and wraps around"""
+    settings = Settings()
+    settings.pattern = Settings.ARP_UP_DOWN
+    midi_io = MockMidiIO()
+    arp = Arpeggiator(settings, midi_io)
+    for note in (60, 64, 67):
+        arp.add_note(note, 100)
+
+    for _ in range(8):
+        arp.step()
+
+    played = [note for kind, note, channel in midi_io.sent if kind == 'on']
+    assert played == [60, 64, 67, 64, 60, 64, 67, 64]
+
+
+def test_remove_playing_note_sends_note_off():
+    """Releasing the sounding note turns it off immediately"""
+    settings = Settings()
+    midi_io = MockMidiIO()
+    arp = Arpeggiator(settings, midi_io)
+    arp.add_note(60, 100)
+    arp.step()
+    arp.remove_note(60)
+
+    assert midi_io.sent[-1] == ('off', 60, settings.midi_channel)
+    assert arp.current_note is None
+    assert arp.get_status()['sequence_length'] == 0
+
+
+@pytest.mark.parametrize("pattern", [Settings.ARP_UP, Settings.ARP_RANDOM, Settings.ARP_STRUM])
+def test_zero_alloc_step_does_not_allocate(pattern):
+    """Steady-state step() allocates nothing in zero-alloc mode"""
+    settings = Settings()
+    settings.pattern = pattern
+    settings.octave_range = 2
+    settings.strum_repeat = True
+    settings.strum_speed = 0  # Strum note every tick
+    port = FakePort()
+    arp = Arpeggiator(settings, MidiIO(port, port), zero_alloc=True)
+    for note in (60, 64, 67, 71):
+        arp.add_note(note, 100)
+
+    # Warm up (first-call caches, random state)
+    for _ in range(100):
+        arp.step()
+
+    tracemalloc.start()
+    try:
+        for _ in range(100):
+            arp.step()
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        # while loop with small (cached) ints: the loop itself allocates nothing
+        i = 0
+        while i < 250:
+            arp.step()
+            arp.step()
+            arp.step()
+            arp.step()
+            i += 1
+        after, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert after == before
+    assert peak == before
+    assert port.last[0] & 0xF0 in (0x80, 0x90)
+
+
+def test_settings_revision_refreshes_snapshot():
+    """Saved settings changes reach step() without re-creating the arp"""
+    settings = Settings()
+    midi_io = MockMidiIO()
+    arp = Arpeggiator(settings, midi_io)
+    arp.add_note(60, 100)
+    arp.step()
+
+    settings.midi_channel = 5
+    settings.save()
+    arp.step()
+
+    assert midi_io.sent[-1] == ('on', 60, 5)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
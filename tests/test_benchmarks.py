@@ -0,0 +1,360 @@
+"""Host benchmarks for the core engines
+
+Times the hot paths on CPython with the CircuitPython mocks from
+conftest.py (plain timeit, best of REPEAT runs):
+
+- Arpeggiator._generate_sequence for every pattern and held-note count
+- Arpeggiator.step for every pattern
+- Settings.quantize_to_scale for every scale
+- ClockHandler._process_external_clock with synthetic tick streams
+- CustomCCHandler.process_messages for every source
+
+Results are compared to a JSON baseline; a benchmark slower than the
+baseline by more than the threshold fails. Host numbers are only
+comparable on the same machine, so the baseline is not committed:
+record one before a change, then compare after it, on a quiet machine
+(shared or virtual CPUs easily vary by 30-50% between runs).
+
+Run with:
+    pytest tests/test_benchmarks.py --prisme-bench --prisme-bench-save   # Record baseline
+    pytest tests/test_benchmarks.py --prisme-bench                      # Compare
+    pytest tests/test_benchmarks.py --prisme-bench --prisme-bench-threshold 10
+"""
+
+import pytest
+import random
+import sys
+import os
+import json
+import timeit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils.config import Settings
+from prisme.core.arpeggiator import Arpeggiator
+from prisme.core.sequence import MAX_HELD_NOTES
+from prisme.core import clock as clock_module
+from prisme.core.clock import ClockHandler
+from prisme.drivers import midi_custom_cc as custom_cc_module
+from prisme.drivers.midi_custom_cc import CustomCCHandler
+from prisme.drivers.midi_output import MidiIO
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'benchmark_baseline.json')
+
+REPEAT = 10  # timeit runs per benchmark (the fastest counts)
+MIN_RUN_SECONDS = 0.01  # Calls per run are doubled until a run takes this long
+
+ALL_PATTERNS = range(Settings.ARP_UP, Settings.ARP_STRUM + 1)
+ALL_SCALES = range(Settings.SCALE_CHROMATIC, Settings.SCALE_MELODIC_MIN + 1)
+
+TICK_NS = 60 * 10 ** 9 // (120 * 24)  # 120 BPM
+
+
+class BenchmarkRecorder:
+    """Times benchmarks and checks them against the baseline"""
+
+    def __init__(self, baseline, threshold, saving):
+        """
+        Args:
+            baseline: dict of name -> microseconds per call
+            threshold: Allowed slowdown in percent
+            saving: True when recording a new baseline (never fails)
+        """
+        self.baseline = baseline
+        self.threshold = threshold
+        self.saving = saving
+        self.results = {}
+
+    def measure(self, name, func):
+        """
+        Time func and compare it to the baseline
+
+        Args:
+            name: Benchmark name (baseline key)
+            func: Function with no arguments
+
+        Returns:
+            Regression message, or None
+        """
+        timer = timeit.Timer(func)
+        number = 1
+        while timer.timeit(number) < MIN_RUN_SECONDS:
+            number *= 2
+        best = min(timer.repeat(repeat=REPEAT, number=number))
+        per_call_us = best * 1e6 / number
+        self.results[name] = round(per_call_us, 3)
+
+        base_us = self.baseline.get(name)
+        if self.saving or not base_us:
+            return None
+        slowdown = (per_call_us / base_us - 1) * 100
+        if slowdown > self.threshold:
+            return f"{name}: {per_call_us:.2f} us vs {base_us:.2f} us baseline (+{slowdown:.0f}%)"
+        return None
+
+    def check(self, regressions):
+        """Fail the test if any benchmark regressed"""
+        regressions = [message for message in regressions if message]
+        if regressions:
+            pytest.fail("Benchmark regression:\n" + "\n".join(regressions))
+
+
+@pytest.fixture(scope='module')
+def bench(request):
+    """BenchmarkRecorder for the module (skips unless --prisme-bench)"""
+    config = request.config
+    if not config.getoption('--prisme-bench'):
+        pytest.skip("host benchmarks run with --prisme-bench")
+
+    path = config.getoption('--prisme-bench-baseline') or DEFAULT_BASELINE
+    baseline = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            baseline = json.load(f)
+
+    saving = config.getoption('--prisme-bench-save')
+    recorder = BenchmarkRecorder(baseline, config.getoption('--prisme-bench-threshold'), saving)
+    yield recorder
+
+    if saving:
+        baseline.update(recorder.results)
+        with open(path, 'w') as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+
+
+class FakePort:
+    """Output port that keeps the last written buffer"""
+    def __init__(self):
+        self.last = None
+
+    def write(self, data):
+        self.last = data
+
+
+def held_notes(count):
+    """count distinct notes spread over three octaves, in play order"""
+    rng = random.Random(count)
+    return rng.sample(range(36, 84), count)
+
+
+@pytest.mark.parametrize("pattern", ALL_PATTERNS)
+def test_generate_sequence(bench, pattern):
+    """Arpeggiator._generate_sequence for 1..MAX_HELD_NOTES held notes"""
+    settings = Settings()
+    settings.pattern = pattern
+    settings.octave_range = 2
+    regressions = []
+    for count in range(1, MAX_HELD_NOTES + 1):
+        arp = Arpeggiator(settings, MidiIO(FakePort(), FakePort()))
+        for note in held_notes(count):
+            arp.add_note(note, 100)
+        regressions.append(bench.measure(
+            f"generate_sequence[{pattern}-{count}]", arp._generate_sequence))
+    bench.check(regressions)
+
+
+@pytest.mark.parametrize("pattern", ALL_PATTERNS)
+def test_step(bench, pattern):
+    """Arpeggiator.step (zero-alloc, as in main_v2) with four held notes"""
+    settings = Settings()
+    settings.pattern = pattern
+    settings.octave_range = 2
+    arp = Arpeggiator(settings, MidiIO(FakePort(), FakePort()), zero_alloc=True)
+    for note in held_notes(4):
+        arp.add_note(note, 100)
+    bench.check([bench.measure(f"step[{pattern}]", arp.step)])
+
+
+@pytest.mark.parametrize("scale", ALL_SCALES)
+def test_quantize_to_scale(bench, scale):
+    """Settings.quantize_to_scale over all 128 MIDI notes"""
+    settings = Settings()
+    settings.scale_type = scale
+    settings.scale_root = 2
+    quantize = settings.quantize_to_scale
+
+    def quantize_all():
+        for note in range(128):
+            quantize(note)
+
+    bench.check([bench.measure(f"quantize_to_scale[{scale}]", quantize_all)])
+
+
+class Start:
+    pass
+
+
+class Stop:
+    pass
+
+
+class Continue:
+    pass
+
+
+class TimingClock:
+    pass
+
+
+class FakeTime:
+    """Settable nanosecond clock for the clock module"""
+    def __init__(self):
+        self.now_ns = 10 ** 12
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+    def monotonic(self):
+        return self.now_ns / 1e9
+
+
+class TickStream:
+    """midi_clock stand-in: replays a tick burst, advancing the fake time per tick"""
+
+    def __init__(self, fake_time, intervals):
+        """
+        Args:
+            fake_time: FakeTime of the clock module
+            intervals: Time before each TimingClock (ns), one per tick
+        """
+        self.fake_time = fake_time
+        self.intervals = intervals
+        self.tick = TimingClock()
+        self.index = len(intervals)
+
+    def rewind(self):
+        self.index = 0
+
+    def receive(self):
+        if self.index >= len(self.intervals):
+            return None
+        self.fake_time.now_ns += self.intervals[self.index]
+        self.index += 1
+        return self.tick
+
+
+# Synthetic tick streams: ticks per poll, jitter (+/- ns per tick)
+TICK_STREAMS = {
+    'single': (1, 0),
+    'burst': (6, 0),
+    'beat': (24, 0),
+    'jittered_beat': (24, 400000),
+}
+
+
+@pytest.mark.parametrize("sync_mode", [ClockHandler.SYNC_DIRECT, ClockHandler.SYNC_PLL])
+@pytest.mark.parametrize("stream", sorted(TICK_STREAMS))
+def test_process_external_clock(bench, monkeypatch, stream, sync_mode):
+    """ClockHandler._process_external_clock draining a synthetic tick stream"""
+    fake_time = FakeTime()
+    monkeypatch.setattr(clock_module, 'time', fake_time)
+    for cls in (Start, Stop, Continue, TimingClock):
+        monkeypatch.setattr(clock_module, cls.__name__, cls)
+
+    count, jitter = TICK_STREAMS[stream]
+    rng = random.Random(count)
+    intervals = [TICK_NS + rng.randint(-jitter, jitter) for _ in range(count)]
+
+    clock = ClockHandler(midi_in_port=None)
+    clock.sync_mode = sync_mode
+    steps = []
+    clock.set_step_callback(lambda: steps.append(1))
+
+    # Start, then one beat so the tempo estimate is settled
+    clock.midi_clock = TickStream(fake_time, [0])
+    clock.midi_clock.tick = Start()
+    clock.midi_clock.rewind()
+    clock._process_external_clock()
+    clock.midi_clock = TickStream(fake_time, [TICK_NS] * 24)
+    clock.midi_clock.rewind()
+    clock._process_external_clock()
+
+    midi_clock = TickStream(fake_time, intervals)
+    clock.midi_clock = midi_clock
+
+    def process():
+        midi_clock.rewind()
+        clock._process_external_clock()
+
+    bench.check([bench.measure(f"process_external_clock[{stream}-{sync_mode}]", process)])
+    assert clock.running
+    if sync_mode == ClockHandler.SYNC_DIRECT:
+        assert steps
+
+
+class ControlChange:
+    def __init__(self, control, value):
+        self.control = control
+        self.value = value
+
+
+class PitchBend:
+    def __init__(self, pitch_bend):
+        self.pitch_bend = pitch_bend
+
+
+class ChannelPressure:
+    def __init__(self, pressure):
+        self.pressure = pressure
+
+
+class NoteOn:
+    def __init__(self, note, velocity):
+        self.note = note
+        self.velocity = velocity
+
+
+class NoteOff:
+    def __init__(self, note):
+        self.note = note
+
+
+class StubCVOutput:
+    """CVOutput stand-in: the value conversions without a DAC"""
+    def __init__(self):
+        self.voltage = 0.0
+
+    def cc_to_voltage(self, value):
+        return value * 5.0 / 127
+
+    def aftertouch_to_voltage(self, pressure):
+        return pressure * 5.0 / 127
+
+    def pitch_bend_to_voltage(self, pitch_bend):
+        return pitch_bend * 5.0 / 16383
+
+    def velocity_to_voltage(self, velocity):
+        return velocity * 5.0 / 127
+
+    def set_custom_cc_voltage(self, voltage):
+        self.voltage = voltage
+
+
+@pytest.mark.parametrize("source", [
+    Settings.CC_SOURCE_CC, Settings.CC_SOURCE_AFTERTOUCH,
+    Settings.CC_SOURCE_PITCHBEND, Settings.CC_SOURCE_VELOCITY,
+])
+def test_custom_cc_process_messages(bench, monkeypatch, source):
+    """CustomCCHandler.process_messages on a mixed batch of 32 messages"""
+    for cls in (ControlChange, PitchBend, ChannelPressure, NoteOn, NoteOff):
+        monkeypatch.setattr(custom_cc_module, cls.__name__, cls)
+
+    settings = Settings()
+    settings.custom_cc_source = source
+    settings.custom_cc_number = 74
+    handler = CustomCCHandler(StubCVOutput(), settings)
+
+    messages = []
+    for i in range(4):
+        messages += [ControlChange(74, i * 30), ControlChange(1, i), PitchBend(i * 4000),
+                     ChannelPressure(i * 30), NoteOn(60 + i, 100), NoteOff(60 + i),
+                     ControlChange(74, i * 30 + 1), PitchBend(i * 4000 + 1)]
+
+    bench.check([bench.measure(f"custom_cc_process_messages[{source}]",
+                               lambda: handler.process_messages(messages))])
+    assert handler.last_message_type is not None
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v', '--prisme-bench'])
@@ -0,0 +1,89 @@
+"""Unit tests for CV calibration
+
+Tests correction point interpolation, corrected pitch tables and the NVM
+round trip.
+
+Run with: pytest tests/test_calibration.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils import calibration as calibration_module
+from prisme.utils.calibration import CVCalibration, NVM_CALIBRATION_START
+from prisme.utils.config import Settings
+from prisme.drivers.cv_gate import CVOutput
+
+
+@pytest.fixture
+def nvm(monkeypatch):
+    """Replace the mocked NVM with a real 256-byte buffer"""
+    buffer = bytearray(256)
+    monkeypatch.setattr(calibration_module.microcontroller, 'nvm', buffer)
+    return buffer
+
+
+def test_ideal_points():
+    """Test uncalibrated points follow the ideal 0-5V response"""
+    cal = CVCalibration()
+    assert not cal.calibrated
+    assert cal.get_channel_points(0) == [0, 819, 1638, 2457, 3276, 4095]
+    assert cal.voltage_to_dac_value(0, 2.5) == 2048
+
+
+def test_interpolation():
+    """Test codes are interpolated between the surrounding points"""
+    cal = CVCalibration()
+    cal.set_channel_points(0, [10, 830, 1650, 2470, 3290, 4095])
+    assert cal.calibrated
+    assert cal.voltage_to_dac_value(0, 1.0) == 830
+    assert cal.voltage_to_dac_value(0, 1.5) == 1240
+    assert cal.voltage_to_dac_value(0, 5.0) == 4095
+    assert cal.voltage_to_dac_value(0, -1.0) == 10  # Clamped to 0V
+
+    # Other channels keep their own points
+    assert cal.voltage_to_dac_value(1, 1.0) == 819
+
+
+def test_corrected_pitch_table():
+    """Test CVOutput uses calibrated points for its pitch table"""
+    cal = CVCalibration()
+    cal.set_channel_points(CVOutput.CH_PITCH, [0, 800, 1600, 2400, 3200, 4000])
+    cv = CVOutput(None, Settings(), cal)
+
+    assert cv.note_to_dac_value(60) == 800  # C3 = 1V
+    assert cv.note_to_dac_value(72) == 1600  # C4 = 2V
+    assert cv.note_to_dac_value(66) == 1200  # Half an octave up
+
+    # Back to ideal response
+    cv.set_calibration(None)
+    assert cv.note_to_dac_value(72) == 1638
+
+
+def test_nvm_round_trip(nvm):
+    """Test points survive save/load and don't touch the settings block"""
+    cal = CVCalibration()
+    cal.set_channel_points(3, [5, 820, 1640, 2460, 3280, 4090])
+    assert cal.save()
+    assert nvm[:NVM_CALIBRATION_START] == bytearray(NVM_CALIBRATION_START)
+
+    loaded = CVCalibration()
+    assert loaded.load()
+    assert loaded.calibrated
+    assert loaded.get_channel_points(3) == [5, 820, 1640, 2460, 3280, 4090]
+    assert list(loaded.points) == list(cal.points)
+
+
+def test_load_without_calibration(nvm):
+    """Test empty NVM keeps the ideal response"""
+    cal = CVCalibration()
+    assert not cal.load()
+    assert not cal.calibrated
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
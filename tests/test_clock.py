@@ -5,13 +5,16 @@ correct timing calculations based on Roger Linn's swing method.
 """
 
 import pytest
+import random
 import sys
 import os
 
 # Add parent directory to path so we can import arp modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from prisme.core.clock import ClockHandler
+from prisme.core import clock as clock_module
+from prisme.core.clock import ClockHandler, JitterStats, TempoEstimator
+from prisme.core.scheduler import GateScheduler
 
 
 def test_base_interval_calculation():
@@ -242,5 +245,356 @@ def test_different_bpms():
         assert abs(delay_odd - expected_odd) < 0.0001
 
 
+class FakeTime:
+    """Stands in for the time module with a settable nanosecond clock"""
+    def __init__(self):
+        self.now_ns = 10 ** 12  # Well past boot
+
+    def monotonic_ns(self):
+        return self.now_ns
+
+    def monotonic(self):
+        return self.now_ns / 1e9
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    """Replace the clock module's time source"""
+    fake = FakeTime()
+    monkeypatch.setattr(clock_module, 'time', fake)
+    return fake
+
+
+def started_clock(fake_time, swing=50):
+    """Internal clock at 120 BPM, started at the fake time"""
+    clock = ClockHandler(midi_in_port=None, swing_percent=swing)
+    clock.set_internal_bpm(120)
+    clock.set_clock_source(ClockHandler.CLOCK_INTERNAL)
+    clock._process_internal_clock()
+    return clock
+
+
+def test_internal_ticks_follow_integer_schedule(fake_time):
+    """Tick times come from the anchor, not accumulated float intervals"""
+    clock = started_clock(fake_time)
+    start = fake_time.now_ns
+    tick_ns = 60 * 10 ** 9 // (120 * 24)
+
+    # One hour of ticks, polled exactly on time
+    for tick in range(1, 24 * 2 * 3600 + 1):
+        fake_time.now_ns = start + (tick * 60 * 10 ** 9) // (120 * 24)
+        clock._process_internal_clock()
+    assert clock.song_ticks == 24 * 2 * 3600
+    assert clock.last_internal_tick_ns == start + 3600 * 10 ** 9
+    assert clock.jitter.max_ns == 0
+    assert clock.next_internal_tick_ns - clock.last_internal_tick_ns in (tick_ns, tick_ns + 1)
+
+
+def test_late_poll_catches_up_with_bounded_burst(fake_time):
+    """A late loop gets every overdue tick, at most max_catchup_ticks per poll"""
+    clock = started_clock(fake_time)
+    steps = []
+    clock.set_step_callback(lambda: steps.append(clock.song_ticks))
+    tick_ns = 60 * 10 ** 9 // (120 * 24)
+
+    fake_time.now_ns += 6 * tick_ns + 1000  # Six ticks overdue
+    clock._process_internal_clock()
+    assert clock.song_ticks == 4
+    clock._process_internal_clock()
+    assert clock.song_ticks == 6
+    assert steps == [6]
+    assert clock.jitter.max_ns == 5 * tick_ns + 1000  # First tick
+    assert clock.resyncs == 0
+
+
+def test_far_behind_clock_re_anchors(fake_time):
+    """Falling more than resync_ticks behind drops the backlog"""
+    clock = started_clock(fake_time)
+    tick_ns = 60 * 10 ** 9 // (120 * 24)
+
+    fake_time.now_ns += 100 * tick_ns
+    clock._process_internal_clock()
+    assert clock.song_ticks == clock.max_catchup_ticks
+    assert clock.resyncs == 1
+    assert clock.next_internal_tick_ns > fake_time.now_ns
+
+
+def test_swing_schedule_matches_swing_delays(fake_time):
+    """Swung tick times follow the same pair split as _calculate_next_tick_delay"""
+    clock = started_clock(fake_time, swing=66)
+    start = clock.anchor_ns
+    pair_ns = 12 * 60 * 10 ** 9 // (120 * 24)
+
+    assert clock._tick_time_ns(6) == pair_ns * 66 // 100
+    assert clock._tick_time_ns(12) == pair_ns
+    assert clock._tick_time_ns(3) == pair_ns * 66 // 200
+
+    fake_time.now_ns = start + clock._tick_time_ns(6)
+    for _ in range(3):
+        clock._process_internal_clock()
+    assert clock.song_ticks == 6
+
+
+def test_tempo_change_retimes_from_last_tick(fake_time):
+    """Changing BPM keeps the last tick and applies the new interval after it"""
+    clock = started_clock(fake_time)
+    fake_time.now_ns += 60 * 10 ** 9 // (120 * 24)
+    clock._process_internal_clock()
+    last = clock.last_internal_tick_ns
+
+    clock.set_internal_bpm(60)
+    assert abs(clock.next_internal_tick_ns - (last + 60 * 10 ** 9 // (60 * 24))) <= 1
+
+
+def test_jitter_stats():
+    """Max, mean and bucketed p99 over recorded lateness"""
+    stats = JitterStats()
+    for _ in range(99):
+        stats.record(100000)  # 0.1 ms
+    stats.record(5000000)  # One 5 ms outlier
+
+    assert stats.max_ns == 5000000
+    assert stats.mean_ns() == (99 * 100000 + 5000000) // 100
+    assert stats.p99_ns() == JitterStats.BUCKET_NS
+
+    stats.reset()
+    assert stats.count == 0 and stats.p99_ns() == 0
+
+
+def legacy_external_bpm(intervals):
+    """Reference: the original list-based external BPM tracking
+
+    Args:
+        intervals: Tick intervals in seconds
+
+    Returns:
+        List of the reported BPM after each interval
+    """
+    tick_intervals = []
+    displayed_bpm = None
+    bpm = None
+    reported = []
+    for interval in intervals:
+        if len(tick_intervals) >= 12:
+            avg_interval = sum(tick_intervals) / len(tick_intervals)
+            if abs(interval - avg_interval) > (avg_interval * 0.15):
+                tick_intervals = []
+                displayed_bpm = None
+        tick_intervals.append(interval)
+        if len(tick_intervals) > 96:
+            tick_intervals.pop(0)
+        if len(tick_intervals) >= 12:
+            avg_interval = sum(tick_intervals) / len(tick_intervals)
+            rounded_bpm = round(60.0 / (avg_interval * 24))
+            if displayed_bpm is None or abs(rounded_bpm - displayed_bpm) >= 5:
+                displayed_bpm = rounded_bpm
+            bpm = displayed_bpm
+        reported.append(bpm)
+    return reported
+
+
+def test_external_bpm_matches_legacy_tracking():
+    """Ring-buffer estimator reports the same BPM as the list-based original"""
+    rng = random.Random(24)
+    intervals_us = []
+    for bpm in (120, 123, 90, 174, 60, 300):
+        tick_us = 60000000 // (bpm * 24)
+        for _ in range(300):
+            intervals_us.append(tick_us + rng.randint(-tick_us // 20, tick_us // 20))
+
+    clock = ClockHandler(midi_in_port=None)
+    reported = []
+    for interval_us in intervals_us:
+        clock._update_external_bpm(interval_us)
+        reported.append(clock.bpm)
+
+    assert reported == legacy_external_bpm([i / 1e6 for i in intervals_us])
+
+
+def test_tempo_estimator_window():
+    """The window keeps the newest intervals with a matching running sum"""
+    tempo = TempoEstimator(size=4, min_samples=2)
+    assert tempo.bpm() is None
+    for interval in (10, 20, 30, 40, 50, 60):
+        tempo.add(interval)
+
+    assert tempo.count == 4
+    assert tempo.total == 30 + 40 + 50 + 60
+    assert tempo.average_us() == 45
+
+    tempo.reset()
+    tempo.add(20833)
+    tempo.add(20834)
+    assert tempo.bpm() == 120
+    assert tempo.is_tempo_change(30000)
+    assert not tempo.is_tempo_change(21000)
+
+
+def test_external_ticks_drive_steps():
+    """TimingClock ticks advance the step counter and the tempo estimate"""
+    clock = ClockHandler(midi_in_port=None)
+    steps = []
+    clock.set_step_callback(lambda: steps.append(clock.song_ticks))
+    now = 0
+    for _ in range(24):
+        now += 20833333
+        clock._on_external_tick(now)
+
+    assert steps == [6, 12, 18, 24]
+    assert clock.bpm == 120
+
+
+def test_next_step_estimate(fake_time):
+    """Next step time follows the swung schedule and external tick spacing"""
+    clock = started_clock(fake_time, swing=66)
+    start = fake_time.now_ns
+    assert clock.get_step_interval_ns() == 125000000  # 16ths at 120 BPM
+
+    # The on-beat 16th of a swung pair gets 66% of the 250 ms pair
+    assert clock.get_next_step_ns() == start + 165000000
+    fake_time.now_ns = start + 165000000
+    clock._process_internal_clock()
+    clock._process_internal_clock()  # Bursts are capped at 4 ticks per poll
+    assert clock.song_ticks == 6
+    assert clock.get_next_step_ns() == start + 250000000
+
+    clock.running = False
+    assert clock.get_next_step_ns() is None
+    assert clock.get_step_interval_ns() is None
+
+    # External (direct): from the last tick and its interval
+    external = ClockHandler(midi_in_port=None)
+    external.set_clock_source(ClockHandler.CLOCK_EXTERNAL)
+    external.running = True
+    assert external.get_next_step_ns() is None
+    external._on_external_tick(1000)
+    external._on_external_tick(1000 + 20833333)
+    assert external.get_next_step_ns() == 1000 + 20833333 + 4 * 20833333
+
+
+def test_next_event_includes_gate_offs(fake_time):
+    """The loop wakes for the next tick, or earlier for a gate note-off"""
+    clock = started_clock(fake_time)
+    start = fake_time.now_ns
+    assert clock.get_next_event_ns() == start + 20833333
+
+    scheduler = GateScheduler()
+    fired = []
+    owner = scheduler.register(lambda note, tag: fired.append(note))
+    clock.set_scheduler(scheduler)
+    scheduler.schedule(8, owner, 60)  # Half a tick
+    due = clock.get_next_event_ns()
+    assert due == start + 10416667
+
+    fake_time.now_ns = due - 1
+    clock.process_clock_messages()
+    assert fired == []
+    fake_time.now_ns = due
+    clock.process_clock_messages()
+    assert fired == [60]
+    assert clock.get_next_event_ns() == start + 20833333
+
+    clock.running = False
+    assert clock.get_next_event_ns() is None
+
+    # External (direct): the next expected TimingClock
+    external = ClockHandler(midi_in_port=None)
+    external.set_clock_source(ClockHandler.CLOCK_EXTERNAL)
+    external.running = True
+    assert external.get_next_event_ns() is None
+    external._on_external_tick(1000)
+    external._on_external_tick(1000 + 20833333)
+    assert external.get_next_event_ns() == 1000 + 2 * 20833333
+
+
+def pll_clock(fake_time, multiply=1):
+    """External clock in PLL follower mode, started"""
+    clock = ClockHandler(midi_in_port=None, multiply=multiply)
+    clock.set_clock_source(ClockHandler.CLOCK_EXTERNAL)
+    clock.set_sync_mode(ClockHandler.SYNC_PLL)
+    clock.running = True
+    return clock
+
+
+def run_pll(clock, fake_time, arrivals, until_ns, poll_ns=250000):
+    """Feed external tick arrivals and poll the follower every poll_ns
+
+    Returns:
+        List of (song_ticks, time) for every generated tick
+    """
+    emitted = []
+    clock.set_tick_callback(lambda tick: emitted.append((tick, fake_time.now_ns)))
+    pending = list(arrivals)
+    while fake_time.now_ns < until_ns:
+        fake_time.now_ns += poll_ns
+        while pending and pending[0] <= fake_time.now_ns:
+            clock._on_external_tick(pending.pop(0))
+        clock._process_pll_output()
+    return emitted
+
+
+def test_pll_smooths_jittery_external_clock(fake_time):
+    """Generated ticks are evenly spaced although input arrives with +-2 ms jitter"""
+    rng = random.Random(3)
+    tick_ns = 20833333  # 120 BPM
+    start = fake_time.now_ns
+    arrivals = [start + k * tick_ns + rng.randint(-2000000, 2000000) for k in range(1, 24 * 8)]
+    clock = pll_clock(fake_time)
+    emitted = run_pll(clock, fake_time, arrivals, arrivals[-1])
+
+    # One output tick per input tick, no gaps or repeats
+    assert [tick for tick, _ in emitted] == list(range(1, len(emitted) + 1))
+    assert len(emitted) >= len(arrivals) - 2
+
+    # After locking (2 beats), tick spacing stays well inside the input jitter
+    times = [t for _, t in emitted[48:]]
+    spacing = [b - a for a, b in zip(times, times[1:])]
+    assert max(abs(gap - tick_ns) for gap in spacing) < 1000000
+    assert abs(clock.pll_period_ns - tick_ns) < 200000
+    assert clock.pll_relocks == 0
+    assert abs(clock.bpm - 120) <= 1
+
+
+def test_pll_multiplies_external_clock(fake_time):
+    """clock multiply 2 doubles the generated tick rate"""
+    tick_ns = 20833333
+    start = fake_time.now_ns
+    arrivals = [start + k * tick_ns for k in range(1, 49)]
+    clock = pll_clock(fake_time, multiply=2)
+    emitted = run_pll(clock, fake_time, arrivals, arrivals[-1] + 1)
+
+    assert abs(len(emitted) - 2 * 47) <= 2
+    times = [t for _, t in emitted[8:]]
+    spacing = [b - a for a, b in zip(times, times[1:])]
+    assert max(abs(gap - tick_ns // 2) for gap in spacing) < 300000
+
+
+def test_pll_free_runs_through_dropout(fake_time):
+    """Short input gaps are bridged; long ones stop the output"""
+    tick_ns = 20833333
+    start = fake_time.now_ns
+    arrivals = [start + k * tick_ns for k in range(1, 25)]
+    clock = pll_clock(fake_time)
+    run_pll(clock, fake_time, arrivals, arrivals[-1])
+    before = clock.song_ticks
+
+    # Half a beat without input: keeps ticking at the same rate
+    for _ in range(12):
+        fake_time.now_ns += tick_ns
+        clock._process_pll_output()
+    assert clock.is_free_running()
+    assert clock.song_ticks - before >= 11
+
+    # Three beats without input: stops and waits to re-lock
+    for _ in range(80):
+        fake_time.now_ns += tick_ns
+        clock._process_pll_output()
+    assert not clock.pll_locked
+    stopped = clock.song_ticks
+    fake_time.now_ns += 10 * tick_ns
+    clock._process_pll_output()
+    assert clock.song_ticks == stopped
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,141 @@
+"""Unit tests for CV pitch lookup tables
+
+Tests that the precomputed per-scale tables in prisme.drivers.cv_gate
+match the float voltage formula, and that pitch writes use raw_value.
+
+Run with: pytest tests/test_cv_gate.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils.config import Settings
+from prisme.drivers.cv_gate import CVOutput
+
+
+class MockChannel:
+    """Mock DAC channel (records raw 12-bit writes)"""
+    def __init__(self):
+        self.raw_value = 0
+        self.vref = None
+        self.gain = 1
+
+
+class MockI2CDevice:
+    """Mock I2CDevice recording each write transaction"""
+    def __init__(self):
+        self.writes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def write(self, buf):
+        self.writes.append(bytes(buf))
+
+
+class MockDAC:
+    """Mock MCP4728 DAC for testing"""
+    def __init__(self):
+        self.channel_a = MockChannel()
+        self.channel_b = MockChannel()
+        self.channel_c = MockChannel()
+        self.channel_d = MockChannel()
+        self.i2c_device = MockI2CDevice()
+
+
+@pytest.fixture
+def cv():
+    """CVOutput with a mock DAC"""
+    cv = CVOutput(None, Settings())
+    cv.dac = MockDAC()
+    cv.dac_available = True
+    return cv
+
+
+def test_tables_match_float_formula(cv):
+    """Test both scale tables against note_to_voltage/voltage_to_dac_value"""
+    for scale in (Settings.CV_SCALE_STANDARD, Settings.CV_SCALE_MOOG):
+        cv.settings.cv_scale = scale
+        for note in range(128):
+            expected = cv.voltage_to_dac_value(cv.note_to_voltage(note))
+            assert cv.note_to_dac_value(note) == expected, (scale, note)
+
+
+def test_table_reference_points(cv):
+    """Test C3 = 1V and clamping at both ends"""
+    assert cv.pitch_table.typecode == 'H'
+    assert cv.note_to_dac_value(60) == int(1.0 / 5.0 * 4095)
+    assert cv.note_to_dac_value(0) == 0
+    assert cv.note_to_dac_value(127) == 4095
+
+
+def test_scale_change_switches_table(cv):
+    """Test the table follows settings.cv_scale"""
+    standard = cv.note_to_dac_value(72)
+    cv.settings.cv_scale = Settings.CV_SCALE_MOOG
+    assert cv.note_to_dac_value(72) > standard
+    assert cv.pitch_table is cv.pitch_tables[1]
+
+
+def test_pitch_writes_raw_value(cv):
+    """Test note_on writes 12-bit codes to raw_value"""
+    cv.note_on(72)
+    assert cv.dac.channel_a.raw_value == cv.pitch_table[72]
+    assert cv.dac.channel_b.raw_value == CVOutput.TRIGGER_HIGH
+
+
+def test_batched_fast_write(cv):
+    """Test batched updates go out as one Fast Write per loop iteration"""
+    cv.batch_writes = True
+    cv.settings.custom_cc_smoothing = Settings.CC_SMOOTH_OFF
+    cv.note_on(72)
+    cv.set_custom_cc_voltage(5.0)
+    assert cv.dac.i2c_device.writes == []
+    assert cv.dac.channel_a.raw_value == 0  # Nothing written per channel
+
+    cv.process()
+    pitch = cv.pitch_table[72]
+    assert cv.dac.i2c_device.writes == [bytes([
+        pitch >> 8, pitch & 0xFF,  # A: pitch first...
+        0x0F, 0xFF,  # B: ...then the gate edge
+        0x00, 0x00,  # C: unused
+        0x0F, 0xFF,  # D: custom CC at 5V
+    ])]
+
+    # Nothing changed: no transaction
+    cv.process()
+    assert len(cv.dac.i2c_device.writes) == 1
+
+    cv.note_off()
+    cv.process()
+    assert cv.dac.i2c_device.writes[1][2:4] == bytes([0x00, 0x00])
+
+
+def test_arbiter_flushes_dac(cv):
+    """Test the arbiter flushes pending DAC writes when the bus is yielded"""
+    from prisme.drivers.i2c_bus import BusArbiter
+
+    bus = BusArbiter()
+    cv.batch_writes = True
+    cv.set_arbiter(bus)
+    cv.note_on(60)
+
+    bus.yield_bus()
+    assert len(cv.dac.i2c_device.writes) == 1
+    assert bus.preemptions == 1
+    assert bus.get_stats()['dac']['transactions'] == 1
+
+    # Nothing pending: no pre-emption
+    bus.yield_bus()
+    assert bus.preemptions == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,80 @@
+"""Unit tests for the non-blocking Button B demo
+
+Tests that DemoPlayer plays its notes and hold callbacks from repeated
+process() calls instead of sleeping.
+
+Run with: pytest tests/test_demo.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.ui.demo import DemoPlayer
+
+
+def run(demo, until, step=0.001):
+    """Call process() every step seconds from 0 to until"""
+    now = 0.0
+    while now < until:
+        demo.process(now)
+        now += step
+
+
+def test_sequence_timing():
+    """Test each note sounds NOTE_TIME with a GAP_TIME gap"""
+    events = []
+    demo = DemoPlayer()
+    clock = {'now': 0.0}
+    demo.play([60, 64],
+              lambda note: events.append(('on', note, clock['now'])),
+              lambda note: events.append(('off', note, clock['now'])), 0.0)
+
+    while clock['now'] < 1.0:
+        demo.process(clock['now'])
+        clock['now'] += 0.001
+
+    assert [event[:2] for event in events] == [('on', 60), ('off', 60), ('on', 64), ('off', 64)]
+    assert events[1][2] == pytest.approx(DemoPlayer.NOTE_TIME, abs=0.002)
+    assert events[2][2] == pytest.approx(DemoPlayer.NOTE_TIME + DemoPlayer.GAP_TIME, abs=0.003)
+    assert not demo.is_active()
+
+
+def test_process_returns_between_notes():
+    """Test a process() call never waits: nothing happens before the next note time"""
+    events = []
+    demo = DemoPlayer()
+    demo.play([60], events.append, events.append, 0.0)
+    demo.process(0.0)
+    demo.process(0.05)
+    assert events == [60]
+    assert demo.is_active()
+
+
+def test_hold_calls_back_once():
+    """Test hold() runs its callback when the time is up"""
+    calls = []
+    demo = DemoPlayer()
+    demo.hold(2.0, lambda: calls.append('end'), 0.0)
+    run(demo, 1.9)
+    assert calls == []
+    run(demo, 2.1)
+    assert calls == ['end']
+    assert not demo.is_active()
+
+
+def test_restart_ends_sounding_note():
+    """Test starting a new demo ends the note that was sounding"""
+    events = []
+    demo = DemoPlayer()
+    demo.play([60], lambda n: events.append(('on', n)), lambda n: events.append(('off', n)), 0.0)
+    demo.process(0.0)
+    demo.play([67], lambda n: events.append(('on', n)), lambda n: events.append(('off', n)), 0.05)
+    assert events == [('on', 60), ('off', 60)]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
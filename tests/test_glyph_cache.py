@@ -0,0 +1,163 @@
+"""Unit tests for the glyph cache
+
+Tests rendering fixed strings into row bitmaps, LRU eviction within the
+byte budget and menu rows shown by bitmap swap instead of label layout.
+
+Run with: pytest tests/test_glyph_cache.py -v
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.ui import glyph_cache as glyph_cache_module
+from prisme.ui.glyph_cache import GlyphCache
+from prisme.ui import display as display_module
+from prisme.ui.display import Display
+from prisme.utils.config import Settings
+
+
+class FakeBitmap:
+    """displayio.Bitmap stub recording blits"""
+    def __init__(self, width, height, value_count):
+        self.width = width
+        self.height = height
+        self.blits = []
+
+
+class FakeGlyph:
+    """Built-in font glyph: 6x12 tile in a shared sheet"""
+    def __init__(self, code):
+        self.bitmap = 'sheet'
+        self.tile_index = code - 32
+        self.width = 6
+        self.height = 12
+        self.dx = 0
+        self.dy = 0
+        self.shift_x = 6
+
+
+class FakeFont:
+    """terminalio.FONT stub (printable ASCII only)"""
+    def get_bounding_box(self):
+        return (6, 12)
+
+    def get_glyph(self, code):
+        if 32 <= code < 127:
+            return FakeGlyph(code)
+        return None
+
+
+class FakeLabel:
+    """Text label stub"""
+    def __init__(self, y):
+        self.text = ""
+        self.x = 0
+        self.y = y
+
+
+class FakeTileGrid:
+    """displayio.TileGrid stub"""
+    def __init__(self, bitmap, pixel_shader, x, y):
+        self.bitmap = bitmap
+        self.x = x
+        self.y = y
+        self.hidden = False
+
+
+def fake_blit(dest, source, x, y, x1, y1, x2, y2):
+    dest.blits.append((x, y, x1, x2))
+
+
+@pytest.fixture(autouse=True)
+def fake_displayio(monkeypatch):
+    """Real-ish bitmaps and blits for the cache"""
+    monkeypatch.setattr(glyph_cache_module.displayio, 'Bitmap', FakeBitmap)
+    monkeypatch.setattr(glyph_cache_module.bitmaptools, 'blit', fake_blit)
+    monkeypatch.setattr(glyph_cache_module.displayio, 'TileGrid', FakeTileGrid)
+
+
+def test_render_places_glyphs():
+    """Test each character is blitted from its tile, left to right"""
+    cache = GlyphCache(FakeFont())
+    bitmap = cache.get("AB\n")
+    assert (bitmap.width, bitmap.height) == (128, 12)
+    assert bitmap.blits == [(0, 0, 33 * 6, 34 * 6), (6, 0, 34 * 6, 35 * 6)]
+
+    # Clipped at the row width (21 characters of 6 px)
+    assert len(cache.get("x" * 30).blits) == 21
+
+
+def test_hits_share_one_bitmap():
+    """Test a string is rendered once and then returned by reference"""
+    cache = GlyphCache(FakeFont())
+    first = cache.get("Up")
+    assert cache.get("Up") is first
+    assert cache.get_stats()['hits'] == 1
+    assert cache.get_stats()['misses'] == 1
+
+
+def test_lru_eviction_within_budget():
+    """Test the least recently used row is dropped at the byte budget"""
+    cache = GlyphCache(FakeFont(), budget_bytes=3 * 192)
+    assert cache.bitmap_bytes == 192  # 128 px = 4 words per row, 12 rows
+
+    up = cache.get("Up")
+    cache.get("Down")
+    cache.get("Random")
+    cache.get("Up")  # Most recently used now
+    cache.get("Chord")
+
+    assert cache.bytes_used() <= cache.budget_bytes
+    assert "Down" not in cache.entries
+    assert cache.get("Up") is up
+    assert cache.evictions == 1
+
+
+@pytest.fixture
+def display(monkeypatch):
+    """Display (auto refresh) with fake labels and the glyph cache enabled"""
+    monkeypatch.setattr(display_module.terminalio, 'FONT', FakeFont())
+    display = Display(MagicMock(), Settings())
+    labels = [FakeLabel(0), FakeLabel(0), FakeLabel(20), FakeLabel(35), FakeLabel(50)]
+    (display.midi_in_label, display.midi_out_label,
+     display.line1_label, display.line2_label, display.line3_label) = labels
+    display.bpm_label = display.line2_label
+    display.pattern_label = display.status_label = display.line3_label
+    display._labels = labels
+    display._shown_text = [""] * len(labels)
+    display.enable_glyph_cache()
+    return display
+
+
+def test_menu_rows_swap_bitmaps(display):
+    """Test menu rows show cached bitmaps and leave the label empty"""
+    line2 = display.line2_label
+    tile = display._tiles[3]
+    cache = display.glyph_cache
+
+    display.enter_settings_menu("Arp Pattern:", "> Up <", "")
+    assert tile.hidden is False
+    assert tile.bitmap is cache.get("Arp Pattern:")
+    assert line2.text == ""
+
+    # Coming back to a row reuses its bitmap
+    misses = cache.get_stats()['misses']
+    display.update_settings_menu("Octave Range:", "> 2 <", "")
+    display.update_settings_menu("Arp Pattern:", "> Up <", "")
+    assert tile.bitmap is cache.get("Arp Pattern:")
+    assert cache.get_stats()['misses'] == misses + 2  # Only the new strings
+
+    # Leaving the menu: dynamic text goes back to the label
+    display.exit_settings_menu()
+    display.update_bpm(120)
+    assert tile.hidden is True
+    assert line2.text == "BPM: 120 "
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,337 @@
+"""Unit tests for the shared I2C bus arbiter
+
+Tests bus time stats, DAC pre-emption between display chunks, chunked
+display refreshes, the display render cache and the frame-rate governor.
+
+Run with: pytest tests/test_i2c_bus.py -v
+"""
+
+import pytest
+import sys
+import os
+import time
+from unittest.mock import MagicMock
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.drivers.i2c_bus import BusArbiter
+from prisme.ui import display as display_module
+from prisme.ui.display import Display, FrameGovernor
+from prisme.utils.config import Settings
+
+
+class FakeLabel:
+    """Text label stub"""
+    def __init__(self, name):
+        self.name = name
+        self.text = ""
+
+
+class FakeOLED:
+    """Display stub recording which label texts each refresh() sends"""
+    def __init__(self, labels, log):
+        self.labels = labels
+        self.log = log
+        self.shown = {}
+        self.auto_refresh = True
+
+    def refresh(self):
+        changed = [l.name for l in self.labels if self.shown.get(l.name) != l.text]
+        for l in self.labels:
+            self.shown[l.name] = l.text
+        self.log.append(('refresh', changed))
+
+
+def make_display(manual_refresh=False):
+    """Display with fake labels and OLED"""
+    display = Display(MagicMock(), Settings(), manual_refresh)
+    log = []
+    names = ['midi_in', 'midi_out', 'line1', 'line2', 'line3']
+    labels = [FakeLabel(name) for name in names]
+    for name, fake in zip(names, labels):
+        setattr(display, name + '_label', fake)
+    display.bpm_label = display.line2_label
+    display.pattern_label = display.status_label = display.line3_label
+    display._labels = labels
+    display._shown_text = [label.text for label in labels]
+    display.display = FakeOLED(labels, log)
+    display.display.auto_refresh = not manual_refresh
+    display.display.refresh()
+    log.clear()
+    display.log = log
+    return display
+
+
+@pytest.fixture
+def display():
+    """Display with fake labels and OLED, using an arbiter"""
+    display = make_display()
+    display.set_arbiter(BusArbiter())
+    return display
+
+
+def test_register_and_stats():
+    """Test per-device transaction stats"""
+    bus = BusArbiter()
+    dac = bus.register("dac")
+    oled = bus.register("display")
+    assert (dac, oled) == (0, 1)
+
+    bus.begin(dac)
+    bus.end(dac)
+    bus.begin(oled)
+    bus.end(oled)
+    bus.begin(oled)
+    bus.end(oled)
+
+    stats = bus.get_stats()
+    assert stats['dac']['transactions'] == 1
+    assert stats['display']['transactions'] == 2
+    assert stats['display']['max_us'] >= 0
+    assert stats['preemptions'] == 0
+
+    bus.reset_stats()
+    assert bus.get_stats()['display']['transactions'] == 0
+
+
+def test_device_limit():
+    """Test registering too many devices"""
+    bus = BusArbiter()
+    for i in range(4):
+        assert bus.register(f"dev{i}") == i
+    assert bus.register("extra") is None
+
+
+def test_yield_runs_service_then_flushes():
+    """Test yield_bus runs the service and counts urgent writes"""
+    calls = []
+    bus = BusArbiter()
+    bus.set_service(lambda: calls.append('service'))
+    bus.register("dac", lambda: calls.append('flush') or True)
+    bus.register("display")
+
+    bus.yield_bus()
+    assert calls == ['service', 'flush']
+    assert bus.preemptions == 1
+
+
+def test_staged_until_refresh(display):
+    """Test text changes are staged and auto refresh is off"""
+    assert display.display.auto_refresh is False
+    display.update_settings_menu("a", "b", "c")  # Not in menu mode: ignored
+    display.enter_settings_menu("Menu", "Item", "Value")
+    assert display.line2_label.text == ""
+    assert display._text(display.line2_label) == "Menu"
+    assert display.log == []
+
+    display.refresh()
+    assert display.line2_label.text == "Menu"
+
+
+def test_refresh_one_row_per_chunk(display):
+    """Test each changed row gets its own refresh with the bus yielded between"""
+    dac_writes = []
+    display.arbiter.register("dac", lambda: dac_writes.append(len(display.log)) or True)
+
+    display.set_midi_in_active(True)
+    display.set_midi_out_active(True)
+    display.enter_settings_menu("Menu", "Item", "Value")
+    display.refresh()
+
+    assert display.log == [
+        ('refresh', ['midi_in', 'midi_out']),
+        ('refresh', ['line2']),
+        ('refresh', ['line3']),
+    ]
+    # DAC got the bus after every chunk
+    assert dac_writes == [1, 2, 3]
+    assert display.arbiter.get_stats()['display']['transactions'] == 3
+
+    # Nothing staged: no bus traffic
+    display.refresh()
+    assert len(display.log) == 3
+
+
+def test_unchanged_text_skipped():
+    """Test repeated updates with the same text don't touch the labels"""
+    display = make_display()
+    display.update_display(120, "Up", True)
+    line2 = display.line2_label
+    assert display.get_render_stats()['skipped'] == 0
+
+    line2.text = "sentinel"  # Would be overwritten by a real assignment
+    display.update_display(120, "Up", True)
+    assert line2.text == "sentinel"
+    assert display.get_render_stats()['skipped'] >= 1
+
+
+def test_manual_refresh_one_frame():
+    """Test manual mode without an arbiter sends one refresh per frame"""
+    display = make_display(manual_refresh=True)
+    display.set_midi_in_active(True)
+    display.enter_settings_menu("Menu", "Item", "Value")
+    assert display.log == []
+
+    display.refresh()
+    assert display.log == [('refresh', ['midi_in', 'line2', 'line3'])]
+    assert display.get_render_stats()['frames'] == 1
+
+    # Same texts again: nothing staged, no frame
+    display.set_midi_in_active(True)
+    display.refresh()
+    assert len(display.log) == 1
+    assert display.get_render_stats()['frames'] == 1
+
+
+def test_translation_display_cached():
+    """Test the translation screen is only rebuilt when its inputs change"""
+    display = make_display()
+    settings = Settings()
+    display.update_translation_display(settings)
+    line1 = display.line1_label.text
+    skipped = display.get_render_stats()['skipped']
+
+    display.update_translation_display(settings)
+    assert display.get_render_stats()['skipped'] == skipped + 3
+
+    settings.pattern = (settings.pattern + 1) % 16
+    settings.revision += 1
+    display.update_translation_display(settings)
+    assert display.line1_label.text != line1
+
+
+class FakeClock:
+    """ClockHandler stub with a settable step rate and next step time"""
+    def __init__(self, step_ns=None, next_step_ns=None):
+        self.step_ns = step_ns
+        self.next_step_ns = next_step_ns
+
+    def get_step_interval_ns(self):
+        return self.step_ns
+
+    def get_next_step_ns(self):
+        return self.next_step_ns
+
+
+class FakeRouter:
+    """InputRouter stub with a settable read size"""
+    def __init__(self):
+        self.rx_length = 0
+
+
+def test_governor_frame_rate_follows_load():
+    """Test fast steps and busy input lower the frame rate, idle raises it"""
+    clock = FakeClock()
+    router = FakeRouter()
+    governor = FrameGovernor(clock, router)
+
+    assert governor.update(False) == FrameGovernor.IDLE_INTERVAL_NS
+    clock.step_ns = 125000000  # 16ths at 120 BPM
+    assert governor.update(False) == FrameGovernor.RUNNING_INTERVAL_NS
+    clock.step_ns = 62500000  # 16ths at 240 BPM
+    assert governor.update(False) == FrameGovernor.BUSY_INTERVAL_NS
+
+    clock.step_ns = None
+    router.rx_length = 64
+    assert governor.update(False) == FrameGovernor.BUSY_INTERVAL_NS
+    assert governor.update(True) == FrameGovernor.MENU_INTERVAL_NS
+
+
+def test_governor_chunk_fits_before_step():
+    """Test chunks only go out if they finish within the lateness budget"""
+    clock = FakeClock()
+    governor = FrameGovernor(clock)
+    governor.chunk_ns = 10000000
+    governor.frame_done(0)
+
+    clock.next_step_ns = 100000000 + 20000000
+    assert governor.chunk_fits(100000000)
+    clock.next_step_ns = 100000000 + 5000000  # Would be 5 ms late
+    assert not governor.chunk_fits(100000000)
+    clock.next_step_ns = 100000000 + 9500000  # 0.5 ms late: within budget
+    assert governor.chunk_fits(100000000)
+    assert governor.deferred == 1
+
+    # Held back too long: sent anyway
+    clock.next_step_ns = FrameGovernor.MAX_DEFER_NS + 1000000
+    assert governor.chunk_fits(FrameGovernor.MAX_DEFER_NS)
+    assert governor.forced == 1
+
+    # Chunk cost tracks the slowest recent chunk, decaying slowly
+    governor.record_chunk(16000000)
+    assert governor.chunk_ns == 16000000
+    governor.record_chunk(8000000)
+    assert governor.chunk_ns == 15000000
+
+
+def test_governed_refresh_defers_rows(display):
+    """Test rows that would make the next step late stay staged"""
+    clock = FakeClock()
+    display.set_governor(FrameGovernor(clock))
+    display.enter_settings_menu("Menu", "Item", "Value")
+
+    clock.next_step_ns = time.monotonic_ns()  # Step due now: no room
+    display.refresh()
+    assert display.log == []
+    assert display.get_render_stats()['deferred'] == 1
+
+    clock.next_step_ns = None  # Clock stopped
+    display.refresh()
+    assert display.log == [('refresh', ['line2']), ('refresh', ['line3'])]
+    assert display.get_render_stats()['frames'] == 1
+
+    # Next frame waits for the frame interval
+    display.exit_settings_menu()
+    display.refresh()
+    assert len(display.log) == 2
+
+
+class FakeTime:
+    """Stands in for the time module with a settable clock"""
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+    def monotonic_ns(self):
+        return int(self.now * 1e9)
+
+
+def test_startup_screen_held_without_blocking(monkeypatch):
+    """Test periodic updates leave the startup screen alone until its time is up"""
+    fake = FakeTime()
+    monkeypatch.setattr(display_module, 'time', fake)
+    display = make_display()
+    settings = Settings()
+
+    display.show_startup("1.0", duration_seconds=1.0)
+    display.update_translation_display(settings)
+    assert display.line3_label.text == "Ready!"
+
+    fake.now += 1.0
+    display.update_translation_display(settings)
+    assert display.line3_label.text != "Ready!"
+
+
+def test_status_banner_on_translation_display(monkeypatch):
+    """Test a timed status message stays on line 3 and is cleared after its time"""
+    fake = FakeTime()
+    monkeypatch.setattr(display_module, 'time', fake)
+    display = make_display()
+    settings = Settings()
+    display.update_translation_display(settings)
+    flow = display.line3_label.text
+
+    display.show_status("SETTINGS SAVED!", 2.0)
+    display.update_translation_display(settings)
+    assert display.line3_label.text == "SETTINGS SAVED!"
+
+    fake.now += 2.0
+    display.update_translation_display(settings)
+    assert display.line3_label.text == flow
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
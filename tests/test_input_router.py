@@ -135,5 +135,183 @@ def test_source_name_gate_in(mock_settings):
     assert router.get_current_source_name() == "Gate IN (Future)"
 
 
+class FakePort:
+    """Raw port stub: readinto() copies queued bytes"""
+
+    def __init__(self, data=b''):
+        self.data = bytes(data)
+
+    def readinto(self, buffer):
+        if not self.data:
+            return None  # busio.UART returns None when nothing is pending
+        count = min(len(buffer), len(self.data))
+        buffer[:count] = self.data[:count]
+        self.data = self.data[count:]
+        return count
+
+
+def test_read_events_batch(mock_settings):
+    """Test read_events drains a burst from the selected port in one call"""
+    uart_port = FakePort([0xB0, 1, 10, 1, 20, 0xD0, 64, 0x90, 60, 100])
+    usb_port = FakePort([0x90, 72, 100])
+
+    mock_settings.input_source = mock_settings.INPUT_SOURCE_MIDI_IN
+    router = InputRouter(mock_settings, uart_port=uart_port, usb_port=usb_port)
+
+    events = [(e.status, e.data1, e.data2) for e in router.read_events()]
+    assert events == [(0xB0, 1, 10), (0xB0, 1, 20), (0xD0, 64, 0), (0x90, 60, 100)]
+    assert router.rx_length == 10
+
+    # Nothing pending
+    assert list(router.read_events()) == []
+
+    # USB port untouched until selected
+    assert usb_port.data
+    mock_settings.input_source = mock_settings.INPUT_SOURCE_USB
+    events = [(e.status, e.data1, e.data2) for e in router.read_events()]
+    assert events == [(0x90, 72, 100)]
+
+
+def test_read_events_no_port(mock_settings):
+    """Test read_events with no raw port or an unsupported source"""
+    mock_settings.input_source = mock_settings.INPUT_SOURCE_MIDI_IN
+    router = InputRouter(mock_settings)
+    assert list(router.read_events()) == []
+
+    mock_settings.input_source = mock_settings.INPUT_SOURCE_CV_IN
+    router = InputRouter(mock_settings, uart_port=FakePort([0x90, 60, 100]))
+    assert list(router.read_events()) == []
+
+
+class FakeOut:
+    """Output port stub recording each write() as bytes"""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+
+
+def thru_settings(mock_settings, routing_mode, custom_cc_source=0):
+    """Configure mock settings for the THRU fast path"""
+    mock_settings.input_source = mock_settings.INPUT_SOURCE_MIDI_IN
+    mock_settings.ROUTING_THRU = 0
+    mock_settings.CC_SOURCE_DISABLED = 0
+    mock_settings.routing_mode = routing_mode
+    mock_settings.custom_cc_source = custom_cc_source
+    mock_settings.midi_channel = 0
+    mock_settings.revision = 0
+    return mock_settings
+
+
+def test_thru_forwards_raw_spans(mock_settings):
+    """Test non-note messages are forwarded as one coalesced raw span"""
+    settings = thru_settings(mock_settings, routing_mode=1)
+    data = bytes([0xF8, 0xB0, 1, 10, 1, 20, 0xE0, 0, 64, 0xF0, 0x7D, 1, 0xF7])
+    router = InputRouter(settings, uart_port=FakePort(data))
+    out = FakeOut()
+
+    assert list(router.thru_events(out)) == []
+    assert out.writes == [data]
+
+
+def test_thru_intercepts_notes(mock_settings):
+    """Test notes are decoded (TRANSLATION) and running status re-inserted"""
+    settings = thru_settings(mock_settings, routing_mode=1)
+    data = bytes([0xB0, 1, 10, 0x90, 60, 100, 0xB0, 1, 20, 1, 30])
+    router = InputRouter(settings, uart_port=FakePort(data))
+    out = FakeOut()
+
+    decoded = []
+    for event in router.thru_events(out):
+        # Bytes before the note are already out when it's handled
+        decoded.append((event.status, event.data1, event.data2, len(out.writes)))
+    assert decoded == [(0x90, 60, 100, 1)]
+    assert out.writes == [bytes([0xB0, 1, 10]), bytes([0xB0, 1, 20, 1, 30])]
+
+    # Running-status CC after an intercepted note gets its status back
+    router.uart_port = FakePort([0x90, 62, 100, 0xB0, 1, 40, 0x90, 62, 0, 50, 60])
+    router.uart_parser.reset()
+    out = FakeOut()
+    list(router.thru_events(out))
+    assert out.writes == [bytes([0xB0, 1, 40])]
+
+
+def test_thru_mode_output_channel(mock_settings):
+    """Test THRU routing forwards notes already on the output channel raw"""
+    settings = thru_settings(mock_settings, routing_mode=0)
+    router = InputRouter(settings, uart_port=FakePort([0x90, 60, 100, 0x91, 61, 100]))
+    out = FakeOut()
+
+    decoded = [(e.status, e.data1) for e in router.thru_events(out)]
+    assert out.writes == [bytes([0x90, 60, 100])]
+    assert decoded == [(0x91, 61)]
+
+
+def test_thru_fixed_source_decodes_all_notes(mock_settings):
+    """Test a fixed UART source with thru_notes=False intercepts every note"""
+    settings = thru_settings(mock_settings, routing_mode=0)
+    settings.input_source = mock_settings.INPUT_SOURCE_USB
+    router = InputRouter(settings, uart_port=FakePort([0x90, 60, 100, 0xB0, 1, 10]),
+                         source=settings.INPUT_SOURCE_MIDI_IN, thru_notes=False)
+    out = FakeOut()
+
+    decoded = [(e.status, e.data1) for e in router.thru_events(out)]
+    assert decoded == [(0x90, 60)]
+    assert out.writes == [bytes([0xB0, 1, 10])]
+
+
+def test_thru_custom_cc_decode(mock_settings):
+    """Test CC is forwarded and decoded when Custom CC is enabled"""
+    settings = thru_settings(mock_settings, routing_mode=1, custom_cc_source=1)
+    router = InputRouter(settings, uart_port=FakePort([0xB0, 74, 64]))
+    out = FakeOut()
+
+    decoded = [(e.status, e.data1, e.data2) for e in router.thru_events(out)]
+    assert decoded == [(0xB0, 74, 64)]
+    assert out.writes == [bytes([0xB0, 74, 64])]
+
+
+def test_thru_sysex_across_reads(mock_settings):
+    """Test a SysEx split over several reads is forwarded byte for byte"""
+    settings = thru_settings(mock_settings, routing_mode=1)
+    chunks = ([0xF0, 0x41, 0x10, 0x42], [0x12, 0x40, 0x00, 0x7F], [0x00, 0x41, 0xF7])
+    port = FakePort(chunks[0])
+    router = InputRouter(settings, uart_port=port)
+    out = FakeOut()
+
+    list(router.thru_events(out))
+    for chunk in chunks[1:]:
+        port.data = bytes(chunk)
+        list(router.thru_events(out))
+    assert b"".join(out.writes) == bytes(sum(chunks, []))
+
+
+def test_thru_program_change_decode(mock_settings):
+    """Test Program Change is forwarded and decoded (preset recall)"""
+    settings = thru_settings(mock_settings, routing_mode=1)
+    router = InputRouter(settings, uart_port=FakePort([0xC3, 12]))
+    out = FakeOut()
+
+    decoded = [(e.type, e.channel, e.data1) for e in router.thru_events(out)]
+    assert decoded == [(0xC0, 3, 12)]
+    assert out.writes == [bytes([0xC3, 12])]
+
+
+def test_thru_reassembles_split_message(mock_settings):
+    """Test a message split across reads is written whole"""
+    settings = thru_settings(mock_settings, routing_mode=1)
+    port = FakePort([0xE0, 0])
+    router = InputRouter(settings, uart_port=port)
+    out = FakeOut()
+
+    list(router.thru_events(out))
+    assert out.writes == []
+    port.data = bytes([64, 0xF8])
+    list(router.thru_events(out))
+    assert out.writes == [bytes([0xE0, 0, 64]), bytes([0xF8])]
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,153 @@
+"""Unit tests for the multi-lane arpeggiator
+
+Checks that each lane plays its own pattern on its own channel at its
+own clock division, driven by a single tick stream.
+
+Run with: pytest tests/test_lanes.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils.config import Settings
+from prisme.core.clock import ClockHandler
+from prisme.core.lanes import LaneDispatcher, MAX_LANES
+from prisme.core.scheduler import GateScheduler, SUBTICKS_PER_TICK
+
+
+class MockMidiIO:
+    """Mock MidiIO that records sent notes"""
+    def __init__(self):
+        self.sent = []  # List of ('on'/'off', note, channel)
+
+    def send_note_on(self, note, velocity, channel=0):
+        self.sent.append(('on', note, channel))
+
+    def send_note_off(self, note, channel=0):
+        self.sent.append(('off', note, channel))
+
+
+def notes_on(midi_io, channel):
+    """Notes turned on for one channel, in order"""
+    return [note for kind, note, ch in midi_io.sent if kind == 'on' and ch == channel]
+
+
+def make_dispatcher():
+    """Bass lane (Down, 8ths, channel 1) and lead lane (Up, 16ths, channel 2)"""
+    settings = Settings()
+    midi_io = MockMidiIO()
+    lanes = LaneDispatcher(settings, midi_io)
+    bass = lanes.add_lane(Settings.ARP_DOWN, 1, 12)
+    lead = lanes.add_lane(Settings.ARP_UP, 2, 6)
+    for note in (60, 64, 67):
+        lanes.add_note(note, 100)
+    return lanes, bass, lead, midi_io
+
+
+def test_lanes_play_own_pattern_channel_and_division():
+    """Each lane steps at its own division with its own pattern and channel"""
+    lanes, bass, lead, midi_io = make_dispatcher()
+    for tick in range(1, 49):  # Two beats
+        lanes.on_tick(tick)
+
+    assert notes_on(midi_io, 1) == [67, 64, 60, 67]
+    assert notes_on(midi_io, 2) == [60, 64, 67, 60, 64, 67, 60, 64]
+
+
+def test_dispatcher_tracks_earliest_due_tick():
+    """Ticks between steps only compare against the earliest due tick"""
+    lanes, bass, lead, midi_io = make_dispatcher()
+    assert lanes.next_due == 6
+
+    for tick in range(1, 7):
+        lanes.on_tick(tick)
+    assert lead.next_due == 12
+    assert bass.next_due == 12
+    assert lanes.next_due == 12
+
+    lead.set_clock_division(24)
+    lanes.on_tick(12)
+    assert lanes.next_due == 24
+
+
+def test_lane_settings_override_only_their_fields():
+    """Lanes share the global scale/octave settings but not pattern/channel"""
+    lanes, bass, lead, midi_io = make_dispatcher()
+    assert bass.settings.octave_range == lanes.settings.octave_range
+    assert bass.settings.pattern == Settings.ARP_DOWN
+    assert lanes.settings.pattern == Settings.ARP_UP
+    assert bass.settings.get_pattern_name() == "Down"
+
+    # Lane changes reach the arpeggiator on its next step
+    bass.set_pattern(Settings.ARP_UP)
+    for tick in range(1, 13):
+        lanes.on_tick(tick)
+    assert notes_on(midi_io, 1) == [60]
+
+
+def test_clock_restart_realigns_lanes():
+    """A clock restart (tick position going back) restarts every division"""
+    lanes, bass, lead, midi_io = make_dispatcher()
+    for tick in range(1, 10):
+        lanes.on_tick(tick)
+
+    lanes.on_tick(1)  # Restarted clock
+    assert lead.next_due == 6
+    assert bass.next_due == 12
+
+
+def test_clock_tick_callback_drives_dispatcher():
+    """ClockHandler reports absolute tick positions to the tick callback"""
+    clock = ClockHandler(midi_in_port=None)
+    ticks = []
+    clock.set_tick_callback(ticks.append)
+    clock.start()
+    for _ in range(3):
+        clock._emit_tick()
+    assert ticks == [1, 2, 3]
+
+    clock.start()
+    clock._emit_tick()
+    assert ticks[-1] == 1
+
+
+def test_lanes_gate_length_follows_own_division():
+    """A shared scheduler ends each lane's note at gate_length of its own step"""
+    settings = Settings()
+    settings.gate_length = 0.5
+    midi_io = MockMidiIO()
+    scheduler = GateScheduler()
+    lanes = LaneDispatcher(settings, midi_io, scheduler=scheduler)
+    lanes.add_lane(Settings.ARP_UP, 1, 12)
+    lanes.add_lane(Settings.ARP_UP, 2, 6)
+    lanes.add_note(60, 100)
+
+    offs = {}
+    for tick in range(1, 25):
+        scheduler.advance(tick * SUBTICKS_PER_TICK)  # Clock advances before stepping
+        for kind, note, channel in midi_io.sent:
+            if kind == 'off' and channel not in offs:
+                offs[channel] = tick
+        lanes.on_tick(tick)
+
+    # Lead steps at tick 6 (3-tick gate), bass at tick 12 (6-tick gate)
+    assert offs == {2: 9, 1: 18}
+
+
+def test_lane_limit():
+    """add_lane() refuses lanes beyond MAX_LANES"""
+    lanes = LaneDispatcher(Settings(), MockMidiIO())
+    for i in range(MAX_LANES):
+        assert lanes.add_lane(Settings.ARP_UP, i, 6) is not None
+    assert lanes.add_lane(Settings.ARP_UP, 15, 6) is None
+
+    lanes.remove_lane(lanes.lanes[0])
+    assert len(lanes.lanes) == MAX_LANES - 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
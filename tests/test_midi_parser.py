@@ -0,0 +1,144 @@
+"""Unit tests for the byte-level MIDI parser
+
+Tests running status, real-time interleaving, split messages and SysEx
+skipping.
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path so we can import arp modules
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.core.midi_parser import (
+    MidiParser, data_length,
+    NOTE_ON, NOTE_OFF, CONTROL_CHANGE, PROGRAM_CHANGE, PITCH_BEND,
+    TIMING_CLOCK, START, SONG_POSITION, SYSTEM_EXCLUSIVE
+)
+
+
+def parse(parser, data):
+    """Feed bytes and return the events as (status, data1, data2) tuples"""
+    buffer = bytes(data)
+    parser.feed(buffer, len(buffer))
+    return [(e.status, e.data1, e.data2) for e in parser.events()]
+
+
+def test_data_length():
+    """Test data byte counts per status"""
+    assert data_length(0x90) == 2
+    assert data_length(0xC3) == 1
+    assert data_length(0xD0) == 1
+    assert data_length(0xE0) == 2
+    assert data_length(SONG_POSITION) == 2
+    assert data_length(0xF3) == 1
+    assert data_length(TIMING_CLOCK) == 0
+
+
+def test_complete_messages():
+    """Test a batch of complete messages in one read"""
+    parser = MidiParser()
+    events = parse(parser, [0x90, 60, 100, 0x80, 60, 0, 0xC1, 5, 0xE0, 0x00, 0x40])
+    assert events == [(0x90, 60, 100), (0x80, 60, 0), (0xC1, 5, 0), (0xE0, 0, 64)]
+
+
+def test_running_status():
+    """Test data bytes without a status byte reuse the last status"""
+    parser = MidiParser()
+    events = parse(parser, [0xB0, 1, 10, 1, 20, 1, 30])
+    assert events == [(0xB0, 1, 10), (0xB0, 1, 20), (0xB0, 1, 30)]
+
+    # Running status survives across reads
+    assert parse(parser, [1, 40]) == [(0xB0, 1, 40)]
+
+
+def test_realtime_inside_message():
+    """Test clock bytes inside a message don't break it or running status"""
+    parser = MidiParser()
+    events = parse(parser, [0x90, 60, TIMING_CLOCK, 100, 62, START, 90])
+    assert events == [(TIMING_CLOCK, 0, 0), (0x90, 60, 100), (START, 0, 0), (0x90, 62, 90)]
+
+
+def test_split_message():
+    """Test a message split across two reads"""
+    parser = MidiParser()
+    assert parse(parser, [0x91, 64]) == []
+    assert parse(parser, [127]) == [(0x91, 64, 127)]
+
+
+def test_sysex_span():
+    """Test SysEx is reported as one raw span and clears running status"""
+    parser = MidiParser()
+    events = parse(parser, [0xB0, 7, 100, 0xF0, 0x7D, 1, 2, 3, 0xF7, 5, 6, 0xC0, 2])
+    assert events == [(0xB0, 7, 100), (SYSTEM_EXCLUSIVE, 0, 0), (0xC0, 2, 0)]
+    assert (parser.starts[1], parser.ends[1]) == (3, 9)
+
+
+def test_sysex_split_by_realtime():
+    """Test a clock byte inside SysEx splits it into chunks around the clock"""
+    parser = MidiParser()
+    events = parse(parser, [0xF0, 0x7D, TIMING_CLOCK, 1, 0xF7])
+    assert events == [(SYSTEM_EXCLUSIVE, 0, 0), (TIMING_CLOCK, 0, 0), (SYSTEM_EXCLUSIVE, 0, 0)]
+    spans = [(parser.starts[i], parser.ends[i]) for i in range(parser.count)]
+    assert spans == [(0, 2), (2, 3), (3, 5)]
+
+    # SysEx continuing into the next read
+    parse(parser, [0xF0, 1, 2])
+    assert parse(parser, [3, 0xF7]) == [(SYSTEM_EXCLUSIVE, 0, 0)]
+    assert (parser.starts[0], parser.ends[0]) == (0, 2)
+
+
+def test_event_spans():
+    """Test byte offsets recorded for raw forwarding"""
+    parser = MidiParser()
+    parse(parser, [0x90, 60, 100, 62, 90, 0xB0, 1, TIMING_CLOCK, 2])
+    spans = [(parser.starts[i], parser.ends[i]) for i in range(parser.count)]
+    # Running-status note starts at its data byte; CC interrupted by clock
+    assert spans == [(0, 3), (3, 5), (7, 8), (-1, 9)]
+
+    # Message split across reads isn't one span of the second buffer
+    parse(parser, [0x90, 60])
+    parse(parser, [100])
+    assert parser.starts[0] == -1
+
+
+def test_event_fields():
+    """Test MidiEvent decoding helpers"""
+    parser = MidiParser()
+    parser.feed(bytes([0x95, 60, 0]), 3)
+    event = next(parser.events())
+    assert event.type == NOTE_ON
+    assert event.channel == 5
+    assert event.note == 60
+    assert event.length == 3
+    assert event.is_note_off()
+    assert not event.is_note_on()
+
+    parser.feed(bytes([0xE2, 0x7F, 0x7F]), 3)
+    event = next(parser.events())
+    assert event.type == PITCH_BEND
+    assert event.pitch_bend == 16383
+
+    parser.feed(bytes([0xCF, 9]), 2)
+    event = next(parser.events())
+    assert event.type == PROGRAM_CHANGE
+    assert event.length == 2
+
+
+def test_capacity_limit():
+    """Test events beyond capacity are dropped, not overflowed"""
+    parser = MidiParser(capacity=4)
+    data = [0xB0] + [1, 1] * 10
+    assert parser.feed(bytes(data), len(data)) == 4
+    assert [e.type for e in parser.events()] == [CONTROL_CHANGE] * 4
+
+
+def test_stray_data_ignored():
+    """Test data bytes with no status are ignored"""
+    parser = MidiParser()
+    assert parse(parser, [60, 100, 0x80, 60, 0]) == [(NOTE_OFF, 60, 0)]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,164 @@
+"""Unit tests for the preset bank
+
+Tests storing presets to the binary file, recalling single records by
+seek-read (Program Change applied on the next step), read-ahead of the
+next preset, and rejection of empty, corrupt and foreign files.
+
+Run with: pytest tests/test_presets.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils.config import Settings
+from prisme.utils.presets import (
+    PresetBank, PRESET_CODEC, PRESET_FIELDS, PRESET_COUNT,
+    PRESET_HEADER_SIZE, PRESET_RECORD_SIZE, NO_PRESET
+)
+
+
+class CountingSettings(Settings):
+    """Settings that count save() calls instead of scheduling NVM writes"""
+    def __init__(self):
+        super().__init__()
+        self.saves = 0
+
+    def save(self):
+        self.saves += 1
+        self.revision += 1
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return PresetBank(str(tmp_path / "presets.bin"))
+
+
+def make_preset(pattern, scale_type, timing_feel):
+    settings = Settings()
+    settings.pattern = pattern
+    settings.scale_type = scale_type
+    settings.scale_root = 7
+    settings.timing_feel = timing_feel
+    settings.gate_length = 0.25
+    settings.custom_cc_source = Settings.CC_SOURCE_CC
+    settings.custom_cc_number = 1
+    return settings
+
+
+def test_record_fits():
+    """The packed preset fields fit a record with version byte and CRC"""
+    assert 1 + PRESET_CODEC.size() + 2 <= PRESET_RECORD_SIZE
+    assert PRESET_COUNT >= 64
+
+
+def test_store_creates_fixed_size_file(bank):
+    """The first store writes the header and every (empty) slot"""
+    assert bank.store(5, make_preset(Settings.ARP_DOWN, Settings.SCALE_MINOR, 66))
+    assert os.path.getsize(bank.path) == PRESET_HEADER_SIZE + PRESET_COUNT * PRESET_RECORD_SIZE
+
+    assert not bank.request(4)  # Empty slot
+    assert bank.pending_index == NO_PRESET
+    assert not bank.store(PRESET_COUNT, Settings())
+
+
+def test_program_change_applies_on_next_step(bank):
+    """A requested preset is read at once but only applied by apply_pending()"""
+    stored = make_preset(Settings.ARP_DOWN, Settings.SCALE_MINOR, 66)
+    bank.store(5, stored)
+
+    settings = CountingSettings()
+    settings.internal_bpm = 140  # Not part of a preset
+    assert bank.request(5)
+    assert bank.reads == 1
+    assert settings.pattern == Settings.ARP_UP
+
+    assert bank.apply_pending(settings)
+    assert settings.saves == 1
+    assert bank.current == 5
+    for name in PRESET_FIELDS:
+        assert getattr(settings, name) == getattr(stored, name), name
+    assert settings.internal_bpm == 140
+
+    assert not bank.apply_pending(settings)  # Applied once
+    assert settings.saves == 1
+
+
+def test_empty_request_keeps_queued_preset(bank):
+    """Program Change to an empty slot before the next step keeps the queued one"""
+    stored = make_preset(Settings.ARP_DOWN, Settings.SCALE_MINOR, 66)
+    bank.store(5, stored)
+    settings = CountingSettings()
+
+    assert bank.request(5)
+    assert not bank.request(9)
+    assert bank.pending_index == 5
+
+    assert bank.apply_pending(settings)
+    assert bank.current == 5
+    for name in PRESET_FIELDS:
+        assert getattr(settings, name) == getattr(stored, name), name
+
+
+def test_next_preset_is_read_ahead(bank):
+    """prefetch() stages the next preset; its Program Change reads nothing"""
+    bank.store(0, make_preset(Settings.ARP_UP, Settings.SCALE_MAJOR, 50))
+    bank.store(1, make_preset(Settings.ARP_RANDOM, Settings.SCALE_BLUES, 75))
+    settings = CountingSettings()
+
+    bank.prefetch()  # Preset 0 before the first recall
+    bank.prefetch()
+    assert (bank.staged_index, bank.staged_valid, bank.reads) == (0, True, 1)
+
+    bank.request(0)
+    bank.apply_pending(settings)
+    assert bank.reads == 1
+
+    bank.prefetch()
+    assert (bank.staged_index, bank.reads) == (1, 2)
+    bank.request(1)
+    assert bank.reads == 2
+    bank.apply_pending(settings)
+    assert settings.pattern == Settings.ARP_RANDOM
+    assert settings.scale_type == Settings.SCALE_BLUES
+
+    # Past the stored presets: the empty slot is read once, not every pass
+    bank.prefetch()
+    bank.prefetch()
+    assert (bank.staged_index, bank.staged_valid, bank.reads) == (2, False, 3)
+
+
+def test_corrupt_record_rejected(bank):
+    """A record with a bad CRC is treated as empty"""
+    bank.store(3, make_preset(Settings.ARP_DOWN, Settings.SCALE_MINOR, 66))
+    with open(bank.path, "r+b") as f:
+        f.seek(PRESET_HEADER_SIZE + 3 * PRESET_RECORD_SIZE + 2)
+        f.write(b"\xff")
+    assert not bank.request(3)
+
+
+def test_missing_or_foreign_file(bank):
+    """No file or a file without the header means no presets (checked once)"""
+    assert not bank.request(0)
+    with open(bank.path, "wb") as f:
+        f.write(b"not presets" * 10)
+    assert not bank.request(0)  # Failed open is remembered until close()
+    bank.close()
+    assert not bank.request(0)
+
+    # Storing replaces it with a preset file
+    assert bank.store(0, Settings())
+    assert bank.request(0)
+
+
+def test_store_reports_write_errors(tmp_path):
+    """A read-only drive is reported, not raised"""
+    bank = PresetBank(str(tmp_path / "missing" / "presets.bin"))
+    assert not bank.store(0, Settings())
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
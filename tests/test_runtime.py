@@ -0,0 +1,93 @@
+"""Unit tests for the cooperative asyncio runtime
+
+Runs prisme.core.runtime on CPython's asyncio: task order, waiting for
+slack before the clock deadline, the starvation guard and periods.
+
+Run with: pytest tests/test_runtime.py -v
+"""
+
+import pytest
+import sys
+import os
+import time
+import asyncio
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.core.runtime import (
+    Runtime, PRIORITY_CLOCK, PRIORITY_INPUT, PRIORITY_UI, PRIORITY_BACKGROUND
+)
+
+MS = 1000000
+
+
+def run(runtime, duration_ms):
+    asyncio.run(runtime.run(duration_ns=duration_ms * MS))
+
+
+def test_critical_tasks_run_first():
+    """Test each pass starts with the most urgent tasks, whatever the add order"""
+    order = []
+    runtime = Runtime()
+    runtime.add_task("display", lambda: order.append("display"), PRIORITY_UI)
+    runtime.add_task("midi", lambda: order.append("midi"), PRIORITY_INPUT)
+    runtime.add_task("clock", lambda: order.append("clock"), PRIORITY_CLOCK)
+    run(runtime, 5)
+
+    assert order[:3] == ["clock", "midi", "display"]
+    assert runtime.passes == runtime.get_stats()['clock']['runs']
+
+
+def test_slow_task_waits_for_slack():
+    """Test a slow task only starts when its budget fits before the next step"""
+    start = time.monotonic_ns()
+    step_ns = 50 * MS
+
+    def next_step():
+        return start + ((time.monotonic_ns() - start) // step_ns + 1) * step_ns
+
+    ui_starts = []
+    clock_runs = []
+    runtime = Runtime(deadline=next_step)
+    runtime.add_task("clock", lambda: clock_runs.append(1), PRIORITY_CLOCK)
+    runtime.add_task("display", lambda: ui_starts.append(time.monotonic_ns() - start),
+                     PRIORITY_UI, period_ns=10 * MS, budget_ns=20 * MS)
+    run(runtime, 200)
+
+    assert ui_starts
+    for offset in ui_starts:
+        assert offset % step_ns <= step_ns - 20 * MS + MS  # 1 ms scheduling slack
+    assert runtime.get_stats()['display']['waits'] > 0
+    assert len(clock_runs) > len(ui_starts)
+
+
+def test_starved_task_runs_after_max_wait():
+    """Test a task that never gets slack still runs after max_wait_ns"""
+    runs = []
+    runtime = Runtime(deadline=lambda: time.monotonic_ns() + MS)
+    runtime.add_task("clock", lambda: None, PRIORITY_CLOCK)
+    runtime.add_task("gc", lambda: runs.append(1), PRIORITY_BACKGROUND,
+                     budget_ns=5 * MS, max_wait_ns=10 * MS)
+    run(runtime, 60)
+
+    stats = runtime.get_stats()['gc']
+    assert stats['forced'] >= 2
+    assert stats['runs'] == len(runs)
+
+
+def test_period_and_overruns():
+    """Test periodic activation and overrun counting"""
+    runtime = Runtime()
+    runtime.add_task("clock", lambda: None, PRIORITY_CLOCK)
+    slow = runtime.add_task("gc", lambda: time.sleep(0.003), PRIORITY_BACKGROUND,
+                            period_ns=20 * MS, budget_ns=MS)
+    run(runtime, 100)
+
+    assert 4 <= slow.runs <= 6
+    assert slow.overruns == slow.runs
+    assert runtime.get_stats()['gc']['max_us'] >= 3000
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,177 @@
+"""Unit tests for scale quantization
+
+Checks the precomputed quantization table against the original
+per-note search for every scale, root and MIDI note, that the table
+follows scale and root changes, and the scale bank (bitmask scales,
+nearest-degree tables, user scales loaded from a file).
+
+Run with: pytest tests/test_scale_quantize.py -v
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils.config import Settings
+from prisme.utils.scales import ScaleBank, parse_scale_line, intervals_to_mask
+
+
+def legacy_quantize(settings, midi_note):
+    """Reference: the original per-note search of quantize_to_scale()
+
+    Args:
+        settings: Settings object
+        midi_note: MIDI note number
+
+    Returns:
+        Quantized MIDI note number
+    """
+    if settings.scale_type == settings.SCALE_CHROMATIC:
+        return midi_note
+
+    intervals = settings.SCALE_INTERVALS[settings.scale_type]
+    octave = midi_note // 12
+    note_relative_to_root = (midi_note % 12 - settings.scale_root) % 12
+
+    min_distance = 12
+    nearest_interval = 0
+    for interval in intervals:
+        distance = abs(note_relative_to_root - interval)
+        wrap_distance = 12 - distance
+        if distance < min_distance:
+            min_distance = distance
+            nearest_interval = interval
+        if wrap_distance < min_distance:
+            min_distance = wrap_distance
+            nearest_interval = interval
+
+    quantized_note = octave * 12 + (settings.scale_root + nearest_interval) % 12
+    return max(0, min(127, quantized_note))
+
+
+@pytest.mark.parametrize("scale", range(len(Settings.SCALE_INTERVALS)))
+def test_table_matches_search(scale):
+    """Table lookup equals the per-note search for all roots and notes"""
+    settings = Settings()
+    settings.scale_type = scale
+    for root in range(12):
+        settings.scale_root = root
+        for note in range(128):
+            assert settings.quantize_to_scale(note) == legacy_quantize(settings, note), \
+                (scale, root, note)
+
+
+def test_table_rebuilt_only_on_change():
+    """The table is rebuilt when scale or root changes, not per note"""
+    settings = Settings()
+    settings.scale_type = Settings.SCALE_MAJOR
+    settings.quantize_to_scale(61)
+    table = settings._quantize_table
+
+    settings.quantize_to_scale(66)
+    assert settings._quantize_table is table
+
+    settings.scale_root = 1  # C# major: C# stays
+    assert settings.quantize_to_scale(61) == 61
+    assert settings._quantize_table is not table
+
+    settings.scale_type = Settings.SCALE_CHROMATIC
+    assert settings.quantize_to_scale(66) == 66
+
+
+def test_out_of_range_notes_use_search():
+    """Notes outside 0-127 (e.g. after transposition) still quantize"""
+    settings = Settings()
+    settings.scale_type = Settings.SCALE_MINOR_PENT
+    for note in (-3, 128, 140):
+        assert settings.quantize_to_scale(note) == legacy_quantize(settings, note)
+
+
+def search_nearest(intervals, relative):
+    """Reference nearest-degree search (original loop) for one pitch class"""
+    min_distance = 12
+    nearest_interval = 0
+    for interval in intervals:
+        distance = abs(relative - interval)
+        wrap_distance = 12 - distance
+        if distance < min_distance:
+            min_distance = distance
+            nearest_interval = interval
+        if wrap_distance < min_distance:
+            min_distance = wrap_distance
+            nearest_interval = interval
+    return nearest_interval
+
+
+def test_nearest_matches_search_for_all_masks():
+    """Next-up/next-down lookup equals the search for every 12-bit mask"""
+    bank = ScaleBank({}, ())
+    for mask in range(1, 1 << 12):
+        bank.mask = mask
+        bank._build_tables()
+        intervals = [bit for bit in range(12) if mask & (1 << bit)]
+        for relative in range(12):
+            assert bank.nearest(relative) == search_nearest(intervals, relative), (mask, relative)
+
+
+def test_parse_scale_line():
+    """Degree lists and root-first mask strings; junk lines are skipped"""
+    assert parse_scale_line("Hijaz: 0 1 4 5 7 8 10\n") == ("Hijaz", intervals_to_mask([0, 1, 4, 5, 7, 8, 10]))
+    assert parse_scale_line("Saba: 110100110100") == ("Saba", intervals_to_mask([0, 1, 3, 6, 7, 9]))
+    for line in ("", "# comment", "No colon 0 2 4", "Bad: 0 2 x", "High: 0 12", "Empty:", "Mask: 000000000000"):
+        assert parse_scale_line(line) is None
+
+
+@pytest.fixture
+def scales_file(tmp_path):
+    path = tmp_path / "scales.txt"
+    path.write_text("# User scales\n"
+                    "Hijaz: 0 1 4 5 7 8 10\n"
+                    "broken line\n"
+                    "Whole: 101010101010\n")
+    return str(path)
+
+
+def test_user_scales_loaded_lazily(scales_file):
+    """The file is scanned on first use and scales are read on selection"""
+    settings = Settings()
+    bank = settings.scale_bank
+    bank.path = scales_file
+    assert bank.offsets is None
+
+    assert bank.count() == 14
+    assert bank.get_name(12) == "Hijaz"
+    assert bank.get_name(13) == "Whole"
+    assert bank.get_name(14) == "Unknown"
+
+    # Cycling scales reaches the user scales and wraps
+    settings.scale_type = Settings.SCALE_MELODIC_MIN
+    settings.next_scale()
+    assert settings.get_scale_name() == "Hijaz"
+    settings.next_scale()
+    settings.next_scale()
+    assert settings.scale_type == Settings.SCALE_CHROMATIC
+
+    settings.scale_type = 13  # Whole tone from D
+    settings.scale_root = 2
+    assert [settings.quantize_to_scale(note) for note in (60, 61, 62, 63)] == [60, 62, 62, 62]
+    assert bank.active == 13
+    assert bank.name == "Whole"
+
+
+def test_missing_scale_falls_back_to_chromatic(tmp_path):
+    """An index past the bank (e.g. scales file removed) quantizes nothing"""
+    settings = Settings()
+    settings.scale_bank.path = str(tmp_path / "missing.txt")
+    assert settings.scale_bank.count() == 12
+
+    settings.scale_type = 20
+    assert settings.quantize_to_scale(61) == 61
+    assert settings.get_scale_name() == "Unknown"
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
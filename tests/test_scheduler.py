@@ -0,0 +1,150 @@
+"""Unit tests for the gate-length scheduler
+
+Checks heap ordering of timed note-offs and that the arpeggiator ends
+notes at gate_length of a step when driven by the clock.
+
+Run with: pytest tests/test_scheduler.py -v
+"""
+
+import pytest
+import random
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils.config import Settings
+from prisme.core.arpeggiator import Arpeggiator
+from prisme.core.clock import ClockHandler
+from prisme.core.scheduler import GateScheduler, SUBTICKS_PER_TICK
+
+
+class MockMidiIO:
+    """Mock MidiIO that records sent notes with the clock tick"""
+    def __init__(self, clock):
+        self.clock = clock
+        self.sent = []  # List of ('on'/'off', note, tick)
+
+    def send_note_on(self, note, velocity, channel=0):
+        self.sent.append(('on', note, self.clock.song_ticks))
+
+    def send_note_off(self, note, channel=0):
+        self.sent.append(('off', note, self.clock.song_ticks))
+
+
+def make_rig(gate_length, with_scheduler=True):
+    """Clock + scheduler + arpeggiator stepping every 6 ticks (16ths)"""
+    settings = Settings()
+    settings.gate_length = gate_length
+    clock = ClockHandler(midi_in_port=None)
+    scheduler = GateScheduler() if with_scheduler else None
+    clock.set_scheduler(scheduler)
+    midi_io = MockMidiIO(clock)
+    arp = Arpeggiator(settings, midi_io, scheduler=scheduler)
+    clock.set_step_callback(arp.step)
+    clock.start()
+    for note in (60, 64, 67):
+        arp.add_note(note, 100)
+    return clock, scheduler, arp, midi_io
+
+
+def run_ticks(clock, count):
+    """Emit clock ticks the way the internal clock does"""
+    for _ in range(count):
+        clock.tick_count += 1
+        clock._emit_tick()
+        if clock.tick_count >= clock.ticks_per_step:
+            clock.tick_count = 0
+            clock.on_step_callback()
+
+
+def test_events_fire_in_due_order():
+    """Randomly scheduled events fire sorted by due position"""
+    rng = random.Random(7)
+    scheduler = GateScheduler()
+    fired = []
+    owner = scheduler.register(lambda note, tag: fired.append(note))
+    delays = [rng.randrange(1000) for _ in range(scheduler.capacity)]
+    for i, delay in enumerate(delays):
+        scheduler.schedule(delay, owner, i)
+
+    scheduler.advance(500)
+    assert [delays[n] for n in fired] == sorted(d for d in delays if d <= 500)
+    scheduler.advance(1000)
+    assert [delays[n] for n in fired] == sorted(delays)
+    assert scheduler.next_due() is None
+
+
+def test_full_scheduler_fires_earliest_event_early():
+    """Scheduling into a full heap releases the earliest note instead of dropping"""
+    scheduler = GateScheduler(capacity=2)
+    fired = []
+    owner = scheduler.register(lambda note, tag: fired.append(note))
+    scheduler.schedule(10, owner, 60)
+    scheduler.schedule(20, owner, 61)
+    scheduler.schedule(30, owner, 62)
+
+    assert fired == [60]
+    assert scheduler.count == 2
+    assert scheduler.next_due() == 20
+
+
+def test_gate_length_ends_notes_within_step():
+    """50% gate on 16ths: note-off 3 ticks after each note-on"""
+    clock, scheduler, arp, midi_io = make_rig(0.5)
+    run_ticks(clock, 24)
+
+    assert midi_io.sent == [
+        ('on', 60, 6), ('off', 60, 9),
+        ('on', 64, 12), ('off', 64, 15),
+        ('on', 67, 18), ('off', 67, 21),
+        ('on', 60, 24),
+    ]
+
+
+def test_sub_tick_gate_fires_between_ticks():
+    """Gates that end between ticks fire when the clock position passes them"""
+    clock, scheduler, arp, midi_io = make_rig(0.4)  # 2.4 ticks
+    run_ticks(clock, 6)
+    assert scheduler.next_due() == 6 * SUBTICKS_PER_TICK + int(0.4 * 6 * SUBTICKS_PER_TICK)
+
+    run_ticks(clock, 2)
+    assert midi_io.sent[-1][0] == 'on'
+    scheduler.advance(scheduler.next_due())
+    assert midi_io.sent[-1] == ('off', 60, 8)
+
+
+def test_full_gate_matches_legato_stepping():
+    """gate_length 1.0 sends the same messages as stepping without a scheduler"""
+    legato = make_rig(1.0, with_scheduler=False)
+    gated = make_rig(1.0)
+    run_ticks(legato[0], 48)
+    run_ticks(gated[0], 48)
+
+    assert gated[3].sent == legato[3].sent
+
+
+def test_released_note_ignores_stale_gate():
+    """A note released before its gate ends isn't turned off twice"""
+    clock, scheduler, arp, midi_io = make_rig(0.5)
+    run_ticks(clock, 6)
+    arp.remove_note(60)
+    run_ticks(clock, 3)
+
+    assert [m for m in midi_io.sent if m[0] == 'off'] == [('off', 60, 6)]
+
+
+def test_clock_restart_rebases_pending_gates():
+    """Restarting the clock keeps pending note-offs the same distance away"""
+    clock, scheduler, arp, midi_io = make_rig(0.5)
+    run_ticks(clock, 7)
+    remaining = scheduler.next_due() - scheduler.now
+
+    clock.start()
+    assert scheduler.now == 0
+    assert scheduler.next_due() == remaining
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,262 @@
+"""Unit tests for settings persistence
+
+Tests deferred (write-coalescing) saves, slot rotation with sequence
+counters and CRCs, loading the newest valid slot at boot, and the
+schema-driven bit-packed record with migrations from older versions.
+
+Run with: pytest tests/test_settings_store.py -v
+"""
+
+import pytest
+import struct
+import sys
+import os
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from prisme.utils import config as config_module
+from prisme.utils import nvm_store as nvm_store_module
+from prisme.utils.config import (
+    Settings, NVM_SETTINGS_MAGIC_V3, SETTINGS_STRUCT_FORMAT_V3,
+    NVM_SETTINGS_MAGIC, SETTINGS_STRUCT_FORMAT, SETTINGS_SCHEMA_V2,
+    NVM_SETTINGS_SLOT_MAGIC, NVM_SETTINGS_SLOT_SIZE, NVM_SETTINGS_SLOT_COUNT,
+    NVM_SETTINGS_RECORD_SIZE,
+    SETTINGS_SCHEMA, SETTINGS_SCHEMA_VERSION, SETTINGS_CODEC
+)
+from prisme.utils.nvm_store import crc16, is_newer
+from prisme.utils.schema import SchemaCodec
+
+
+@pytest.fixture
+def nvm(monkeypatch):
+    """Replace the mocked NVM with a real 256-byte buffer"""
+    buffer = bytearray(256)
+    monkeypatch.setattr(nvm_store_module.microcontroller, 'nvm', buffer)
+    return buffer
+
+
+class FakeTime:
+    """Settable clock for Settings.save()"""
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def fake_time(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(config_module, 'time', fake)
+    return fake
+
+
+def test_crc_and_sequence_helpers():
+    """CRC-16/CCITT-FALSE check value and wrapping sequence order"""
+    assert crc16(b"123456789") == 0x29B1
+    assert is_newer(1, 0)
+    assert is_newer(0, 0xFFFF)
+    assert not is_newer(0xFFFF, 0)
+    assert not is_newer(5, 5)
+
+
+def test_saves_coalesce_until_idle(nvm, fake_time):
+    """A burst of save() calls becomes one NVM write after the idle time"""
+    settings = Settings()
+    for pattern in range(5):
+        settings.pattern = pattern
+        settings.save()
+        fake_time.now += 0.5
+    assert settings.dirty
+    assert nvm == bytearray(256)
+
+    settings.flush_if_idle(fake_time.now)  # 0.5 s since the last change
+    assert settings._store.writes == 0
+
+    fake_time.now += Settings.SAVE_IDLE_TIME
+    settings.flush_if_idle(fake_time.now)
+    assert settings._store.writes == 1
+    assert not settings.dirty
+
+    settings.flush_if_idle(fake_time.now + 10)  # Nothing new to write
+    assert settings._store.writes == 1
+
+
+def test_constant_changes_flush_after_max_delay(nvm, fake_time):
+    """Settings that never stop changing are still written"""
+    settings = Settings()
+    start = fake_time.now
+    while fake_time.now - start < Settings.SAVE_MAX_DELAY:
+        settings.save()
+        settings.flush_if_idle(fake_time.now)
+        fake_time.now += 1.0
+    settings.save()
+    settings.flush_if_idle(fake_time.now)
+    assert settings._store.writes == 1
+
+
+def test_writes_rotate_and_newest_loads(nvm, fake_time):
+    """Each write goes to the next slot; boot loads the newest one"""
+    settings = Settings()
+    for bpm in (100, 110, 120, 130, 140, 150):
+        settings.internal_bpm = bpm
+        settings.save()
+        settings.flush()
+    assert settings._store.slot == 5 % NVM_SETTINGS_SLOT_COUNT
+    assert settings._store.sequence == 5
+
+    # Every slot was used, nothing past the slots touched
+    for slot in range(NVM_SETTINGS_SLOT_COUNT):
+        assert nvm[slot * NVM_SETTINGS_SLOT_SIZE:slot * NVM_SETTINGS_SLOT_SIZE + 2] == NVM_SETTINGS_SLOT_MAGIC
+    slots_end = NVM_SETTINGS_SLOT_SIZE * NVM_SETTINGS_SLOT_COUNT
+    assert nvm[slots_end:] == bytearray(256 - slots_end)
+
+    loaded = Settings()
+    assert loaded.load()
+    assert loaded.internal_bpm == 150
+    assert loaded._store.slot == settings._store.slot
+
+    # Writing continues after the newest slot
+    loaded.save()
+    loaded.flush()
+    assert loaded._store.slot == (settings._store.slot + 1) % NVM_SETTINGS_SLOT_COUNT
+    assert loaded._store.sequence == 6
+
+
+def test_corrupt_slot_falls_back_to_previous(nvm, fake_time):
+    """A torn or corrupted newest slot is skipped by its CRC"""
+    settings = Settings()
+    for bpm in (100, 110):
+        settings.internal_bpm = bpm
+        settings.save()
+        settings.flush()
+
+    nvm[NVM_SETTINGS_SLOT_SIZE + 6] ^= 0xFF  # Inside slot 1's payload
+
+    loaded = Settings()
+    assert loaded.load()
+    assert loaded.internal_bpm == 100
+    assert loaded._store.slot == 0
+
+
+def pack_v3(settings):
+    """Settings in the v3 struct (the version 3 schema fields, in table order)"""
+    values = [getattr(settings, field[0]) for field in SETTINGS_SCHEMA if field[3] <= 3]
+    return struct.pack(SETTINGS_STRUCT_FORMAT_V3, *values)
+
+
+def test_legacy_v3_block_loads(nvm, fake_time):
+    """Settings saved before wear levelling (one block at offset 0) still load"""
+    old = Settings()
+    old.internal_bpm = 133
+    old.gate_length = 0.5
+    data = NVM_SETTINGS_MAGIC_V3 + pack_v3(old)
+    nvm[0:len(data)] = data
+
+    loaded = Settings()
+    assert loaded.load()
+    assert loaded.internal_bpm == 133
+    assert loaded.gate_length == 0.5
+    assert loaded.note_priority == Settings.NOTE_PRIORITY_LAST  # Added in v4
+
+    # The first slot write replaces the old block
+    loaded.save()
+    loaded.flush()
+    reloaded = Settings()
+    assert reloaded.load()
+    assert reloaded.internal_bpm == 133
+    assert reloaded._store.sequence == 0
+
+
+def test_legacy_v2_block_migrates(nvm, fake_time):
+    """A v2 block loads through its schema table and converts the clock fields"""
+    values = {'internal_bpm': 98, 'gate_length': 0.5, 'clock_divide': 4, 'swing_percent': 62}
+    v2_values = [values.get(field[0], field[2]) for field in SETTINGS_SCHEMA_V2 if field[3] == 2]
+    data = NVM_SETTINGS_MAGIC + struct.pack(SETTINGS_STRUCT_FORMAT, *v2_values)
+    nvm[0:len(data)] = data
+
+    loaded = Settings()
+    loaded.strum_speed = 4
+    assert loaded.load()
+    assert loaded.internal_bpm == 98
+    assert loaded.gate_length == 0.5
+    assert loaded.clock_rate == Settings.CLOCK_RATE_DIV_4
+    assert loaded.timing_feel == 62
+    assert loaded.strum_speed == 1  # Added in v3: default
+    assert not hasattr(loaded, 'swing_percent')
+
+    # Migrated straight into a slot
+    assert nvm[0:2] == NVM_SETTINGS_SLOT_MAGIC
+    reloaded = Settings()
+    assert reloaded.load()
+    assert reloaded.clock_rate == Settings.CLOCK_RATE_DIV_4
+
+
+def test_schema_defaults_match_settings():
+    """Schema defaults are the Settings() defaults"""
+    settings = Settings()
+    for name, bits, default, version, scale in SETTINGS_SCHEMA:
+        assert getattr(settings, name) == default, name
+        assert type(getattr(settings, name)) is type(default), name
+
+
+def test_record_round_trip_is_compact():
+    """Every field survives the bit-packed record, in far fewer bytes"""
+    settings = Settings()
+    settings.pattern = Settings.ARP_STRUM
+    settings.enabled = False
+    settings.internal_bpm = 300
+    settings.clock_division = 48
+    settings.gate_length = 0.35
+    settings.scale_type = 200  # User scale
+    settings.custom_cc_number = 127
+    settings.likelihood = 0
+    settings.strum_repeat = True
+    settings.display_rotation = Settings.DISPLAY_ROTATION_180
+    settings.note_priority = Settings.NOTE_PRIORITY_FIRST
+
+    record = settings._pack()
+    assert len(record) == NVM_SETTINGS_RECORD_SIZE
+    assert record[0] == SETTINGS_SCHEMA_VERSION
+    assert SETTINGS_CODEC.size() < struct.calcsize(SETTINGS_STRUCT_FORMAT_V3) // 2
+
+    loaded = Settings()
+    loaded._unpack(record)
+    for field in SETTINGS_SCHEMA:
+        assert getattr(loaded, field[0]) == getattr(settings, field[0]), field[0]
+
+
+class Record:
+    pass
+
+
+def test_codec_migrates_and_clamps():
+    """Older records give new fields their defaults; values clamp to the width"""
+    schema = (
+        ('a', 3, 1, 1, 1),
+        ('b', 1, False, 1, 1),
+        ('c', 4, 7, 2, 1),
+    )
+    old = SchemaCodec(schema, 1)
+    new = SchemaCodec(schema, 2)
+    assert (old.bit_count(), new.bit_count(), new.size()) == (4, 8, 1)
+
+    source = Record()
+    source.a, source.b, source.c = 9, True, 3  # a clamps to 7
+    decoded = Record()
+    new.decode(decoded, old.encode(source), 1)
+    assert (decoded.a, decoded.b, decoded.c) == (7, True, 7)
+
+    new.decode(decoded, new.encode(source), 2)
+    assert (decoded.a, decoded.b, decoded.c) == (7, True, 3)
+
+
+def test_empty_nvm_uses_defaults(nvm):
+    settings = Settings()
+    assert not settings.load()
+    assert settings.internal_bpm == Settings().internal_bpm
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])